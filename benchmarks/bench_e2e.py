@@ -0,0 +1,82 @@
+"""
+端到端吞吐量测试：启动本地模拟站点，在无头Chrome中运行完整的 main 流程，输出每秒抓取的卡片数
+
+数据写入临时目录，不影响 data/ 下的数据；详情页抓取关闭（模拟站点没有详情页）。
+
+用法:
+    python benchmarks/bench_e2e.py [--total 1000] [--batch-size 24] [--latency 0.2] [--jitter 0.1]
+                                   [--failure-rate 0.05] [--mode both] [--target 1000] [--no-harvest]
+                                   [--no-blocking]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# 使用独立的数据目录，必须在导入 config 之前设置；
+# 并行解析的子进程（forkserver/spawn）重新导入本模块时沿用父进程的目录
+DATA_DIR = os.environ.get("BENCH_E2E_DATA_DIR") or tempfile.mkdtemp(prefix="bench_e2e_")
+os.environ["BENCH_E2E_DATA_DIR"] = os.environ["SCRAPER_DATA_DIR"] = DATA_DIR
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCH_DIR))
+sys.path.append(BENCH_DIR)
+
+import main as scraper_main
+from config import BROWSER_CONFIG, DETAIL_CONFIG, SCRAPER_CONFIG
+from scraper.metrics import metrics
+from standin_server import add_site_arguments, site_from_args, start_server
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="在本地模拟站点上运行完整抓取流程并测量吞吐量")
+    add_site_arguments(arg_parser)
+    arg_parser.add_argument("--target", type=int, default=None, help="目标工具数量，默认等于卡片总数")
+    arg_parser.add_argument("--no-harvest", action="store_true", help="使用 page_source 解析而不是浏览器内提取")
+    arg_parser.add_argument("--no-blocking", action="store_true", help="关闭资源屏蔽（与默认结果对比节省的流量）")
+    arg_parser.add_argument("--keep-data", action="store_true", help="保留临时数据目录")
+    args = arg_parser.parse_args()
+
+    SCRAPER_CONFIG["target_tools"] = args.target or args.total
+    SCRAPER_CONFIG["harvest_in_browser"] = not args.no_harvest
+    DETAIL_CONFIG["enabled"] = False
+    BROWSER_CONFIG["headless"] = True
+    BROWSER_CONFIG["blocking"]["enabled"] = not args.no_blocking
+
+    site = site_from_args(args)
+    server, url = start_server(site)
+    try:
+        start = time.monotonic()
+        scraper_main.main(["--url", url])
+        elapsed = time.monotonic() - start
+    finally:
+        server.shutdown()
+        if not args.keep_data:
+            shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+    report = metrics.report()
+    counters = report["counters"]
+    cards = counters.get("cards_harvested_total", 0) or site.stats["cards"]
+    saved = counters.get("tools_saved_total", 0)
+    waits = {name: timer for name, timer in report["timers"].items() if name.startswith("browser_wait_seconds")}
+
+    print(f"\n模拟站点: {url}  模式: {args.mode}  总数: {args.total}  每批: {args.batch_size}  "
+          f"延迟: {args.latency}s+{args.jitter}s  失败率: {args.failure_rate}")
+    print(f"站点请求: {site.stats}")
+    print(f"耗时 {elapsed:.1f}s，提取卡片 {cards} 个，保存工具 {saved} 个，{cards / elapsed:.1f} 卡片/秒")
+    print(f"Chrome内存峰值: {report['gauges'].get('chrome_rss_bytes_peak', 0) / 1024 / 1024:.0f} MB，"
+          f"Python内存峰值: {report['gauges'].get('python_rss_bytes_peak', 0) / 1024 / 1024:.0f} MB")
+    blocked = {name: count for name, count in counters.items() if name.startswith("browser_requests_blocked_total")}
+    print(f"站点发送 {site.stats['bytes'] / 1024 / 1024:.1f} MB（图标 {site.stats['images']} 个），"
+          f"浏览器加载 {counters.get('browser_bytes_loaded_total', 0) / 1024 / 1024:.1f} MB，"
+          f"屏蔽请求: {json.dumps(blocked, ensure_ascii=False)}")
+    print("等待耗时: " + json.dumps(waits, ensure_ascii=False))
+    if args.keep_data:
+        print(f"数据目录: {DATA_DIR}")
+
+
+if __name__ == "__main__":
+    main()
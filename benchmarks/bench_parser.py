@@ -0,0 +1,81 @@
+"""
+解析后端对比基准：逐页输出各后端的解析耗时和峰值内存，并校验结果一致
+
+用法:
+    python benchmarks/bench_parser.py page1.html [page2.html ...] [--repeat 5]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loguru import logger
+
+from scraper.backends import BACKENDS
+from scraper.parser import ToolParser
+
+
+def _measure(backend: str, path: str, repeat: int, queue) -> None:
+    """在独立子进程中运行解析，保证峰值内存互不影响"""
+    logger.remove()
+    with open(path, encoding="utf-8") as f:
+        html_content = f.read()
+    # 预热：完成后端模块导入，使基线内存包含库本身的占用
+    ToolParser.parse_tool_cards("<div></div>", backend=backend)
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    tools = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tools = ToolParser.parse_tool_cards(html_content, backend=backend)
+        timings.append(time.perf_counter() - start)
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((statistics.median(timings), peak_kb - baseline_kb, tools))
+
+
+def run(paths, repeat: int) -> bool:
+    """
+    对每个页面依次运行所有后端
+
+    Returns:
+        所有后端结果是否与参考实现一致
+    """
+    ctx = multiprocessing.get_context("spawn")
+    consistent = True
+    print(f"{'page':<32}{'backend':<16}{'cards':>8}{'median(s)':>12}{'peak(MB)':>12}  match")
+    for path in paths:
+        reference = None
+        for backend in BACKENDS:
+            queue = ctx.Queue()
+            process = ctx.Process(target=_measure, args=(backend, path, repeat, queue))
+            process.start()
+            try:
+                elapsed, peak_kb, tools = queue.get()
+            finally:
+                process.join()
+
+            if reference is None:
+                reference = tools
+            match = tools == reference
+            consistent = consistent and match
+            print(f"{os.path.basename(path):<32}{backend:<16}{len(tools):>8}"
+                  f"{elapsed:>12.4f}{peak_kb / 1024:>12.1f}  {'yes' if match else 'NO'}")
+    return consistent
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="对比各HTML解析后端的耗时和内存")
+    arg_parser.add_argument("pages", nargs="+", help="保存的页面HTML文件")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="每个后端的重复次数")
+    args = arg_parser.parse_args()
+    sys.exit(0 if run(args.pages, args.repeat) else 1)
+
+
+if __name__ == "__main__":
+    main()
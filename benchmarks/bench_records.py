@@ -0,0 +1,101 @@
+"""
+工具记录内存和转换基准：比较工具字典与 ToolRecord 的单条内存占用，
+以及逐行构建与按列构建 DataFrame / Arrow 表的耗时
+
+每条工具的字符串都单独创建（与解析器的行为一致），分类和日期从少量取值中选取。
+
+用法:
+    python benchmarks/bench_records.py [--rows 100000] [--categories 200] [--repeat 3]
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pandas as pd
+
+from config import STORAGE_CONFIG
+from scraper.records import ToolRecord, tools_to_arrow, tools_to_dataframe
+
+
+def _fields(rows: int, categories: int):
+    for i in range(rows):
+        # 拼接产生新的字符串对象，模拟解析器为每个卡片生成的文本
+        yield (
+            f"Tool {i}",
+            f"Tool {i} helps people do things faster with AI.",
+            f"https://www.toolify.ai/tool/tool-{i}",
+            "".join(("category ", str(i % categories))),
+            "".join(("2024-", f"{i % 12 + 1:02d}-{i % 28 + 1:02d}")),
+        )
+
+
+def make_dicts(rows: int, categories: int):
+    return [
+        {'tool_name': name, 'description': description, 'url': url, 'category': category, 'added_date': added_date}
+        for name, description, url, category, added_date in _fields(rows, categories)
+    ]
+
+
+def make_records(rows: int, categories: int):
+    return [ToolRecord(*fields) for fields in _fields(rows, categories)]
+
+
+def allocated(factory, rows: int, categories: int) -> int:
+    """返回 factory 构建的工具列表占用的内存（字节）"""
+    gc.collect()
+    tracemalloc.start()
+    tools = factory(rows, categories)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tools
+    return size
+
+
+def measure(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="工具字典与 ToolRecord 的内存和转换耗时对比")
+    arg_parser.add_argument("--rows", type=int, default=100_000, help="工具数量")
+    arg_parser.add_argument("--categories", type=int, default=200, help="不同分类的数量")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="转换测试的运行次数（取中位数）")
+    args = arg_parser.parse_args()
+
+    dict_bytes = allocated(make_dicts, args.rows, args.categories)
+    record_bytes = allocated(make_records, args.rows, args.categories)
+    print(f"{args.rows} 个工具，{args.categories} 个分类")
+    print(f"dict:       {dict_bytes / args.rows:8.1f} 字节/条  共 {dict_bytes / 1024 / 1024:.1f} MB")
+    print(f"ToolRecord: {record_bytes / args.rows:8.1f} 字节/条  共 {record_bytes / 1024 / 1024:.1f} MB"
+          f"（{1 - record_bytes / dict_bytes:.0%} 更小）")
+
+    columns = STORAGE_CONFIG["csv_columns"]
+    dicts = make_dicts(args.rows, args.categories)
+    records = make_records(args.rows, args.categories)
+    cases = {
+        "DataFrame 逐行（原实现）": lambda: pd.DataFrame(dicts).reindex(columns=columns),
+        "DataFrame 按列（ToolRecord）": lambda: tools_to_dataframe(records, columns),
+    }
+    try:
+        import pyarrow as pa
+        schema = pa.schema([(column, pa.string()) for column in columns])
+        cases["Arrow 逐行（原实现）"] = lambda: pa.Table.from_pylist(dicts, schema=schema)
+        cases["Arrow 按列（ToolRecord）"] = lambda: tools_to_arrow(records, schema)
+    except ImportError:
+        print("未安装 pyarrow，跳过 Arrow 转换测试")
+    for name, func in cases.items():
+        print(f"{name:<28}{measure(func, args.repeat):10.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+存储后端对比基准：通过 DataStorage（CSV）和 ParquetStorage 本身按批保存工具，比较写入耗时、
+文件大小和读取耗时；Parquet 另测合并小文件（compact）的耗时及合并前后的读取耗时
+
+读取分为三种场景：全量读取、只读url列（列裁剪）、按分类过滤（谓词下推）。
+使用临时数据目录，不影响 data/ 下的数据。
+
+用法:
+    python benchmarks/bench_storage.py [--rows 10000 100000 1000000] [--batch-size 1000] [--compression zstd]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# 必须在导入 config 之前设置数据目录
+DATA_DIR = tempfile.mkdtemp(prefix="bench_storage_")
+os.environ["SCRAPER_DATA_DIR"] = DATA_DIR
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pandas as pd
+from loguru import logger
+
+from config import STORAGE_CONFIG
+from scraper.storage import DataStorage, ParquetStorage
+
+CATEGORIES = ["writing", "image", "video", "audio", "coding", "marketing", "productivity", "education"]
+
+
+def make_tools(rows: int):
+    """生成与工具数据结构相同的合成数据"""
+    rng = random.Random(rows)
+    return [
+        {
+            "tool_name": f"Tool {i}",
+            "description": f"An AI tool number {i} that helps with {rng.choice(CATEGORIES)} tasks.",
+            "url": f"https://www.toolify.ai/tool/tool-{i}",
+            "category": rng.choice(CATEGORIES),
+            "added_date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        }
+        for i in range(rows)
+    ]
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _dir_size(path) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path) for name in names
+    )
+
+
+def _reset_data_dir():
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+    os.makedirs(DATA_DIR)
+
+
+def _save(storage, tools, batch_size: int):
+    for start in range(0, len(tools), batch_size):
+        storage.save_tools(tools[start:start + batch_size])
+
+
+def bench_csv(tools, batch_size: int):
+    _reset_data_dir()
+    storage = DataStorage()
+    write, _ = _timed(lambda: _save(storage, tools, batch_size))
+    path = storage.csv_path
+    full, _ = _timed(lambda: pd.read_csv(path))
+    project, _ = _timed(lambda: pd.read_csv(path, usecols=["url"]))
+    filtered, _ = _timed(lambda: (lambda df: df[df["category"] == "video"])(pd.read_csv(path)))
+    return {"csv": (write, _dir_size(path), full, project, filtered)}
+
+
+def _read_parquet(storage: ParquetStorage):
+    full, _ = _timed(lambda: storage.read_tools())
+    project, _ = _timed(lambda: storage.read_tools(columns=["url"]))
+    filtered, _ = _timed(lambda: storage.read_tools(filters=[("category", "==", "video")]))
+    return full, project, filtered
+
+
+def bench_parquet(tools, batch_size: int):
+    _reset_data_dir()
+    storage = ParquetStorage()
+    write, _ = _timed(lambda: _save(storage, tools, batch_size))
+    files = len(storage._load_manifest()["files"])
+    results = {f"parquet({files} files)": (write, _dir_size(storage.root), *_read_parquet(storage))}
+
+    compact, _ = _timed(lambda: storage.compact(min_files=2))
+    files = len(storage._load_manifest()["files"])
+    results[f"compacted({files} files)"] = (compact, _dir_size(storage.root), *_read_parquet(storage))
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="对比CSV和Parquet存储后端的写入、读取耗时和文件大小")
+    arg_parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="数据行数")
+    arg_parser.add_argument("--batch-size", type=int, default=1_000, help="每次 save_tools 保存的工具数量")
+    arg_parser.add_argument("--compression", default=STORAGE_CONFIG["parquet_compression"], help="Parquet压缩算法")
+    args = arg_parser.parse_args()
+    STORAGE_CONFIG["parquet_compression"] = args.compression
+    logger.remove()
+
+    print("compacted 行的 write(s) 列为合并耗时")
+    print(f"{'rows':>10}  {'format':<24}{'write(s)':>10}{'size(MB)':>10}{'read(s)':>10}"
+          f"{'url only(s)':>13}{'filter(s)':>11}")
+    try:
+        for rows in args.rows:
+            tools = make_tools(rows)
+            results = {**bench_csv(tools, args.batch_size), **bench_parquet(tools, args.batch_size)}
+            for name, (write, size, full, project, filtered) in results.items():
+                print(f"{rows:>10}  {name:<24}{write:>10.3f}{size / 1024 / 1024:>10.1f}{full:>10.3f}"
+                      f"{project:>13.3f}{filtered:>11.3f}", flush=True)
+    finally:
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+解析和存储基准测试套件：与保存的基线比较，出现性能回退时以非零状态退出
+
+覆盖 ToolParser.parse_tool_cards（各卡片数量、各解析后端，指定 --workers 时另测多进程分片解析）、clean_text / validate_url，
+以及各存储后端的 save_tools、load_existing_tools、contains_many、snapshot、merge_duplicates
+和 export_csv。存储测试使用临时数据目录，不影响 data/ 下的数据。
+
+基线与机器相关，更换机器后先运行一次 --update-baseline。
+同样的比较也作为 pytest 用例运行（tests/test_benchmarks.py，需加 --benchmark 选项）。
+
+用法:
+    python benchmarks/bench_suite.py [--sizes 100 1000 10000 50000] [--backends beautifulsoup lxml]
+                                     [--rows 10000] [--repeat 3] [--tolerance 0.5] [--min-delta 0.005]
+                                     [--max-seconds 10] [--workers 4] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# 存储测试使用独立的数据目录，必须在导入 config 之前设置；
+# 并行解析的子进程（forkserver/spawn）重新导入本模块时沿用父进程的目录，pytest 中沿用测试数据目录
+DATA_DIR = os.environ.get("BENCH_SUITE_DATA_DIR") or tempfile.mkdtemp(prefix="bench_suite_")
+os.environ["BENCH_SUITE_DATA_DIR"] = os.environ["SCRAPER_DATA_DIR"] = DATA_DIR
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(BENCH_DIR))
+sys.path.append(BENCH_DIR)
+from loguru import logger
+
+from config import SCRAPER_CONFIG
+from fixtures import listing_html
+from scraper.backends import BACKENDS
+from scraper.parser import ToolParser
+from scraper.storage import DataStorage, ParquetStorage, SQLiteStorage
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baselines.json")
+STORAGES = {"csv": DataStorage, "sqlite": SQLiteStorage, "parquet": ParquetStorage}
+DEFAULT_TOLERANCE = 0.5
+DEFAULT_MIN_DELTA = 0.005
+
+
+def load_baselines() -> dict:
+    """读取保存的基线，没有基线文件时返回空字典"""
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def is_regression(elapsed: float, baseline, tolerance: float, min_delta: float) -> bool:
+    """
+    判断耗时是否比基线回退
+
+    Args:
+        elapsed: 本次耗时（秒）
+        baseline: 基线耗时（秒），没有基线时为None
+        tolerance: 允许比基线慢的比例
+        min_delta: 比基线慢不超过该秒数时不视为回退（避免毫秒级测试的抖动）
+    """
+    if baseline is None:
+        return False
+    return elapsed > baseline * (1 + tolerance) and elapsed - baseline > min_delta
+
+
+def measure(func, repeat: int, setup=None) -> float:
+    """
+    多次运行并返回耗时中位数（秒）
+
+    Args:
+        func: 被测函数，接收 setup 的返回值
+        repeat: 运行次数
+        setup: 每次运行前调用的准备函数，不计入耗时
+    """
+    timings = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        func(state)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def bench_parser(sizes, backends, repeat: int, max_seconds: float, workers: int = 1):
+    """
+    解析测试；某个后端单次耗时超过 max_seconds 后跳过该后端更大的页面
+
+    workers 大于1时每个后端另测一项多进程分片解析（用例名带 -w<进程数> 后缀）
+    """
+    too_slow = set()
+    for size in sizes:
+        html_content = listing_html(size)
+        for backend in backends:
+            for case_workers in sorted({1, workers}):
+                suffix = f"-w{case_workers}" if case_workers > 1 else ""
+                case = f"parse_tool_cards[{backend}-{size}{suffix}]"
+                if (backend, case_workers) in too_slow:
+                    yield case, None
+                    continue
+                elapsed = measure(
+                    lambda _: ToolParser.parse_tool_cards(html_content, backend=backend, workers=case_workers), repeat
+                )
+                if elapsed > max_seconds:
+                    too_slow.add((backend, case_workers))
+                yield case, elapsed
+
+
+def bench_text(repeat: int, calls: int = 100_000):
+    rng = random.Random(0)
+    texts = [f"  Tool {i}\n\t™ does   things — fast!  {'x' * rng.randint(0, 80)} " for i in range(calls)]
+    urls = [f"/tool/tool-{i}" if i % 2 else f"https://www.toolify.ai/tool/tool-{i}" for i in range(calls)]
+    yield f"clean_text[{calls}]", measure(lambda _: [ToolParser.clean_text(text) for text in texts], repeat)
+    yield f"validate_url[{calls}]", measure(lambda _: [ToolParser.validate_url(url) for url in urls], repeat)
+
+
+def _reset_data_dir():
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+    os.makedirs(DATA_DIR)
+
+
+def _tools(rows: int, offset: int = 0):
+    return [
+        {
+            "tool_name": f"Tool {i}",
+            "description": f"Tool {i} helps people do things faster with AI.",
+            "url": f"https://www.toolify.ai/tool/tool-{i}",
+            "category": f"category-{i % 10}",
+            "added_date": f"2024-01-{i % 28 + 1:02d}",
+        }
+        for i in range(offset, offset + rows)
+    ]
+
+
+def bench_storage(name: str, rows: int, repeat: int):
+    storage_class = STORAGES[name]
+    tools = _tools(rows)
+    batch_size = SCRAPER_CONFIG["batch_size"]
+
+    def fresh():
+        _reset_data_dir()
+        storage = storage_class()
+        storage.load_existing_tools()
+        return storage
+
+    def populated():
+        storage = fresh()
+        for start in range(0, rows, 10_000):
+            storage.save_tools(tools[start:start + 10_000])
+        return storage
+
+    def run(func, setup):
+        # 每次运行后关闭存储，释放数据库连接和URL索引
+        def wrapped(storage):
+            func(storage)
+            storage.close()
+        return measure(wrapped, repeat, setup)
+
+    def save(storage):
+        for start in range(0, rows, batch_size):
+            storage.save_tools(tools[start:start + batch_size])
+
+    def closed():
+        # 关闭存储并删除URL索引，测量从数据文件重建索引的冷启动耗时
+        populated().close()
+        for index_name in ("url_index.sqlite3", "url_index_parquet.sqlite3"):
+            for suffix in ("", "-wal", "-shm", ".bloom"):
+                path = os.path.join(DATA_DIR, f"{index_name}{suffix}")
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def reopen(_):
+        storage = storage_class()
+        storage.load_existing_tools()
+        storage.close()
+
+    lookup = [tool["url"] for tool in _tools(1_000, offset=rows - 500)]
+
+    yield f"{name}.save_tools[{rows}]", run(save, fresh)
+    yield f"{name}.load_existing_tools[{rows}]", measure(reopen, repeat, closed)
+    yield f"{name}.contains_many[{rows}]", run(
+        lambda storage: (storage.url_index if hasattr(storage, "url_index") else storage).contains_many(lookup),
+        populated
+    )
+    yield f"{name}.snapshot[{rows}]", run(lambda storage: storage.snapshot(), populated)
+    yield f"{name}.merge_duplicates[{rows}]", run(lambda storage: storage.merge_duplicates(), populated)
+    if hasattr(storage_class, "export_csv"):
+        yield f"{name}.export_csv[{rows}]", run(lambda storage: storage.export_csv(), populated)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="解析和存储基准测试，与基线比较")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 50_000], help="页面卡片数量")
+    arg_parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    arg_parser.add_argument("--storages", nargs="+", default=list(STORAGES), choices=list(STORAGES))
+    arg_parser.add_argument("--rows", type=int, default=10_000, help="存储测试的工具数量")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="每项测试的运行次数（取中位数）")
+    arg_parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="允许比基线慢的比例")
+    arg_parser.add_argument("--min-delta", type=float, default=DEFAULT_MIN_DELTA, help="比基线慢不超过该秒数时不视为回退（避免毫秒级测试的抖动）")
+    arg_parser.add_argument("--max-seconds", type=float, default=10, help="解析单次超过该秒数时跳过该后端更大的页面")
+    arg_parser.add_argument("--workers", type=int, default=1, help="大于1时另测该进程数的分片解析")
+    arg_parser.add_argument("--update-baseline", action="store_true", help="把本次结果写入基线")
+    args = arg_parser.parse_args()
+    logger.remove()
+
+    baselines = load_baselines()
+
+    benches = [bench_parser(args.sizes, args.backends, args.repeat, args.max_seconds, args.workers), bench_text(args.repeat)]
+    benches += [bench_storage(name, args.rows, args.repeat) for name in args.storages]
+
+    results = {}
+    regressions = []
+    print(f"{'case':<44}{'median(s)':>12}{'baseline(s)':>13}{'ratio':>8}  status")
+    try:
+        for bench in benches:
+            for case, elapsed in bench:
+                if elapsed is None:
+                    print(f"{case:<44}{'-':>12}{'-':>13}{'':>8}  skipped (too slow)", flush=True)
+                    continue
+                results[case] = round(elapsed, 6)
+                baseline = baselines.get(case)
+                if baseline is None:
+                    status, ratio = "new", ""
+                else:
+                    ratio = f"{elapsed / baseline:.2f}" if baseline else ""
+                    regressed = is_regression(elapsed, baseline, args.tolerance, args.min_delta)
+                    status = "REGRESSION" if regressed else "ok"
+                    if regressed:
+                        regressions.append(case)
+                baseline_text = f"{baseline:.4f}" if baseline is not None else "-"
+                print(f"{case:<44}{elapsed:>12.4f}{baseline_text:>13}{ratio:>8}  {status}", flush=True)
+    finally:
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+    if args.update_baseline:
+        baselines.update(results)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=2)
+            f.write("\n")
+        print(f"基线已更新: {BASELINE_PATH}")
+    elif regressions:
+        print(f"{len(regressions)} 项性能回退（超过基线 {args.tolerance:.0%}）: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
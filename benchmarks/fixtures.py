@@ -0,0 +1,107 @@
+"""
+合成测试页面生成器：生成结构接近 toolify.ai 的工具列表页HTML
+
+卡片包含多层包装div、图标、标签、<p> 描述、分类和日期标签以及相对链接；
+页面带有导航栏、广告位和页脚等非卡片内容。少量卡片带有标题或缺少描述，
+用于覆盖解析器的各个分支。
+
+用法:
+    python benchmarks/fixtures.py [--counts 100 1000 10000 50000] [--out-dir benchmarks/fixtures]
+"""
+import argparse
+import os
+import random
+
+CATEGORIES = [
+    "AI Writing Assistant", "Image Generator", "Video Editing", "Text to Speech", "Code Assistant",
+    "Marketing", "Productivity", "Education", "Chatbot", "Design Tools",
+]
+TAGS = ["Free", "Freemium", "Paid", "Free Trial", "Open Source", "API", "Browser Extension", "Mobile App"]
+WORDS = (
+    "ai powered platform that helps teams create edit summarize translate generate analyze automate "
+    "content images videos code documents workflows customers faster smarter with natural language"
+).split()
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(low, high))]
+    return " ".join(words).capitalize() + "."
+
+
+def card_html(index: int, rng: random.Random) -> str:
+    """
+    生成单个工具卡片
+
+    Args:
+        index: 卡片序号，用于生成唯一的名称和链接
+        rng: 随机数生成器
+    """
+    name = f"{rng.choice(WORDS).capitalize()}{rng.choice(WORDS).capitalize()} {index}"
+    slug = f"/tool/{name.lower().replace(' ', '-')}"
+    tags = "".join(f'<span class="tag">{tag}</span>' for tag in rng.sample(TAGS, rng.randint(1, 3)))
+    # 少数卡片带标题（解析器会丢弃这类卡片）或只有短描述
+    heading = f"<h3>{name}</h3>" if rng.random() < 0.05 else ""
+    description = _sentence(rng, 8, 30) if rng.random() < 0.95 else "New"
+    card = (
+        f'<div class="tool-item">'
+        f'<a class="tool-name" href="{slug}"><img src="/logo/{index}.webp" alt="" loading="lazy">{name}</a>'
+        f'{heading}'
+        f'<div class="tool-desc"><p>{description}</p></div>'
+        f'<div class="tool-tags">{tags}</div>'
+        f'<div class="tool-meta"><span>Category: {rng.choice(CATEGORIES)}</span>'
+        f'<span>Added: 2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}</span>'
+        f'<span>{rng.randint(1, 900)}K monthly visits</span></div>'
+        f'</div>'
+    )
+    # 外层包装div层数不固定
+    for _ in range(rng.randint(1, 3)):
+        card = f'<div class="tool-item-wrapper">{card}</div>'
+    return card
+
+
+def cards_html(start: int, count: int, seed: int = 0) -> str:
+    """生成序号从 start 开始的 count 个卡片（结果只取决于 seed 和序号范围）"""
+    return "".join(card_html(index, random.Random(seed * 1_000_003 + index)) for index in range(start, start + count))
+
+
+def listing_html(count: int, seed: int = 0) -> str:
+    """
+    生成包含 count 个工具卡片的完整列表页
+
+    Args:
+        count: 卡片数量
+        seed: 随机种子
+
+    Returns:
+        页面HTML
+    """
+    nav = "".join(f'<a href="/category/{c.lower().replace(" ", "-")}">{c}</a>' for c in CATEGORIES)
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>AI Tools Directory</title></head><body>'
+        f'<header><div class="nav"><a href="/">Home</a>{nav}</div></header>'
+        '<main><div class="container"><div class="banner"><div><a href="/submit">Submit your AI tool</a></div></div>'
+        f'<div class="tool-list">{cards_html(0, count, seed)}</div>'
+        '</div></main>'
+        '<footer><div><a href="/about">About</a><a href="/privacy">Privacy</a></div>'
+        '<div><p>Copyright 2024 AI Tools Directory. All rights reserved.</p></div></footer>'
+        '</body></html>'
+    )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="生成合成的工具列表页HTML")
+    arg_parser.add_argument("--counts", type=int, nargs="+", default=[100, 1_000, 10_000, 50_000], help="卡片数量")
+    arg_parser.add_argument("--out-dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"))
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for count in args.counts:
+        path = os.path.join(args.out_dir, f"listing_{count}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(listing_html(count, args.seed))
+        print(f"{path}  {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+本地模拟站点：模仿 toolify.ai 的无限滚动和"Load More"按钮，用于离线测试浏览器层的抓取吞吐量
+
+页面首屏包含一批卡片，滚动到底部或点击按钮时通过 /api/cards 加载下一批；
+可配置接口延迟、抖动、每批卡片数量和失败率。
+
+用法:
+    python benchmarks/standin_server.py [--port 8765] [--total 1000] [--batch-size 24] [--latency 0.2]
+                                        [--jitter 0.1] [--failure-rate 0.05] [--mode both]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from fixtures import cards_html
+
+# 页面脚本：scroll 模式下滚动接近底部时自动加载，button 模式下点击按钮加载；
+# 请求失败时恢复按钮，下一次滚动或点击会重试同一批
+PAGE_SCRIPT = """
+(function() {
+    var list = document.querySelector('.tool-list');
+    var button = document.getElementById('load-more');
+    var offset = %(initial)d, total = %(total)d, limit = %(batch_size)d;
+    var autoScroll = %(auto_scroll)s, loading = false;
+    function load() {
+        if (loading || offset >= total) return;
+        loading = true;
+        button.textContent = 'Loading...';
+        fetch('/api/cards?offset=' + offset + '&limit=' + limit).then(function(response) {
+            if (!response.ok) throw new Error('HTTP ' + response.status);
+            return response.text();
+        }).then(function(html) {
+            var container = document.createElement('div');
+            container.innerHTML = html;
+            while (container.firstChild) list.appendChild(container.firstChild);
+            offset += limit;
+        }).catch(function(error) {
+            console.warn('load failed', error);
+        }).finally(function() {
+            loading = false;
+            button.textContent = 'Load More';
+            if (offset >= total) button.style.display = 'none';
+        });
+    }
+    button.addEventListener('click', load);
+    if (autoScroll) {
+        window.addEventListener('scroll', function() {
+            if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 600) load();
+        });
+    }
+})();
+"""
+
+# 卡片图标的响应内容（大小接近真实站点的缩略图），用于衡量资源屏蔽节省的流量
+LOGO_BYTES = bytes(range(256)) * 48
+
+
+class StandinSite:
+    """模拟站点的参数和请求统计"""
+
+    def __init__(self, total: int = 1000, batch_size: int = 24, latency: float = 0.2, jitter: float = 0.1,
+                 failure_rate: float = 0.0, mode: str = "both", seed: int = 0):
+        """
+        Args:
+            total: 卡片总数
+            batch_size: 首屏和每次加载的卡片数量
+            latency: /api/cards 的基础延迟（秒）
+            jitter: 在基础延迟上增加的随机延迟上限（秒）
+            failure_rate: /api/cards 返回503的概率
+            mode: scroll（只有无限滚动）、button（只有按钮）或 both
+            seed: 卡片内容的随机种子
+        """
+        self.total = total
+        self.batch_size = batch_size
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.mode = mode
+        self.seed = seed
+        self.stats = {"pages": 0, "batches": 0, "failures": 0, "cards": 0, "images": 0, "bytes": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def page(self) -> str:
+        initial = min(self.batch_size, self.total)
+        script = PAGE_SCRIPT % {
+            "initial": initial,
+            "total": self.total,
+            "batch_size": self.batch_size,
+            "auto_scroll": "true" if self.mode in ("scroll", "both") else "false",
+        }
+        button_style = "" if self.mode in ("button", "both") else ' style="display:none"'
+        with self._lock:
+            self.stats["pages"] += 1
+            self.stats["cards"] += initial
+        return (
+            '<!DOCTYPE html><html><head><meta charset="utf-8"><title>AI Tools Directory</title></head><body>'
+            '<header><div class="nav"><a href="/">Home</a></div></header>'
+            f'<main><div class="tool-list">{cards_html(0, initial, self.seed)}</div>'
+            f'<button id="load-more"{button_style}>Load More</button></main>'
+            f'<script>{script}</script></body></html>'
+        )
+
+    def batch(self, offset: int, limit: int):
+        """
+        返回一批卡片
+
+        Returns:
+            (HTTP状态码, 响应内容)
+        """
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            failed = self._rng.random() < self.failure_rate
+        time.sleep(delay)
+        with self._lock:
+            if failed:
+                self.stats["failures"] += 1
+                return 503, ""
+            count = max(0, min(limit, self.total - offset))
+            self.stats["batches"] += 1
+            self.stats["cards"] += count
+        return 200, cards_html(offset, count, self.seed)
+
+
+def make_handler(site: StandinSite):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == "/":
+                status, body = 200, site.page()
+            elif parts.path == "/api/cards":
+                query = parse_qs(parts.query)
+                offset = int(query.get("offset", ["0"])[0])
+                limit = int(query.get("limit", [str(site.batch_size)])[0])
+                status, body = site.batch(offset, limit)
+            elif parts.path.startswith("/logo/"):
+                status, body = 200, LOGO_BYTES
+            else:
+                status, body = 404, ""
+            payload = body if isinstance(body, bytes) else body.encode("utf-8")
+            content_type = "image/webp" if isinstance(body, bytes) else "text/html; charset=utf-8"
+            with site._lock:
+                site.stats["bytes"] += len(payload)
+                if isinstance(body, bytes):
+                    site.stats["images"] += 1
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def start_server(site: StandinSite, port: int = 0):
+    """
+    在后台线程启动模拟站点
+
+    Args:
+        site: 站点参数
+        port: 监听端口，0表示自动选择
+
+    Returns:
+        (服务器对象, 站点URL)
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(site))
+    threading.Thread(target=server.serve_forever, name="standin-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def add_site_arguments(arg_parser: argparse.ArgumentParser):
+    """添加站点参数（与端到端测试脚本共用）"""
+    arg_parser.add_argument("--total", type=int, default=1000, help="卡片总数")
+    arg_parser.add_argument("--batch-size", type=int, default=24, help="每批卡片数量")
+    arg_parser.add_argument("--latency", type=float, default=0.2, help="加载接口基础延迟（秒）")
+    arg_parser.add_argument("--jitter", type=float, default=0.1, help="随机附加延迟上限（秒）")
+    arg_parser.add_argument("--failure-rate", type=float, default=0.0, help="加载接口返回503的概率")
+    arg_parser.add_argument("--mode", choices=["scroll", "button", "both"], default="both", help="加载方式")
+
+
+def site_from_args(args) -> StandinSite:
+    return StandinSite(args.total, args.batch_size, args.latency, args.jitter, args.failure_rate, args.mode)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="启动模拟 toolify.ai 的本地站点")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    add_site_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    site = site_from_args(args)
+    server, url = start_server(site, args.port)
+    print(f"模拟站点已启动: {url}（Ctrl+C 退出）")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"请求统计: {site.stats}")
+
+
+if __name__ == "__main__":
+    main()
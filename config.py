@@ -2,31 +2,162 @@
 配置文件，存储爬虫程序的基本设置
 """
 from pathlib import Path
+import os
 
 # 基础配置
 BASE_URL = "https://www.toolify.ai/"
-DATA_DIR = Path(__file__).parent / "data"
+# 可通过环境变量 SCRAPER_DATA_DIR 指定数据目录（基准测试等场景使用独立目录）
+DATA_DIR = Path(os.environ.get("SCRAPER_DATA_DIR") or Path(__file__).parent / "data")
 TOOLS_CSV = DATA_DIR / "tools.csv"
+URL_INDEX_PATH = DATA_DIR / "url_index.sqlite3"
+PARQUET_URL_INDEX_PATH = DATA_DIR / "url_index_parquet.sqlite3"  # Parquet后端单独的URL索引，切换后端时互不影响
+TOOLS_DB = DATA_DIR / "tools.sqlite3"
+PARQUET_DIR = DATA_DIR / "tools_parquet"
+SNAPSHOT_DIR = DATA_DIR / "snapshots"
+CHECKPOINT_PATH = DATA_DIR / "checkpoint.json"
+METRICS_REPORT = DATA_DIR / "metrics.json"
+DRIVER_CACHE = DATA_DIR / "chromedriver.json"
+CHROME_DAEMON_STATE = DATA_DIR / "chrome_daemon.json"
+HTTP_CACHE_DIR = DATA_DIR / "http_cache"
+REPLAY_CSV = DATA_DIR / "replay_tools.csv"
+
+# 抓取入口列表，可加入分类页和分页列表页；多于一个或浏览器池大于1时并行抓取
+START_URLS = [BASE_URL]
 
 # 浏览器配置
 BROWSER_CONFIG = {
     "headless": True,  # 无头模式运行
     "page_load_timeout": 60,  # 页面加载超时时间（秒）
     "implicit_wait": 30,  # 隐式等待时间（秒）
+    "pool_size": 1,  # 浏览器池大小（并行运行的Chrome实例数）
+    "driver_path": None,  # 固定的chromedriver路径；为空时首次通过 webdriver_manager 解析并缓存到 data/chromedriver.json
+    "chrome_binary": None,  # Chrome可执行文件路径，为空时在PATH中查找（用于常驻浏览器）
+    "debugger_address": None,  # 连接已运行Chrome的远程调试地址（如 "127.0.0.1:9222"），不再启动新浏览器
+    "daemon_port": 9222,  # 常驻浏览器的远程调试端口
+    "daemon_profile_dir": DATA_DIR / "chrome_profile",  # 常驻浏览器的用户数据目录，保留缓存加快页面加载
+    # 资源屏蔽：解析只需要文本和链接，不加载图片、字体、媒体和统计/广告脚本
+    "blocking": {
+        "enabled": True,
+        "disable_images": True,  # 通过Chrome偏好设置禁止加载图片（连接已运行的浏览器时不生效，由 deny 规则屏蔽）
+        # 按扩展名屏蔽的资源，同时匹配带查询参数的URL（如 "logo.png?v=3"）
+        "deny_extensions": [
+            "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",
+            "woff", "woff2", "ttf", "otf", "eot",
+            "mp4", "webm", "mp3", "m3u8",
+        ],
+        # 其他屏蔽的URL，支持 '*' 通配符
+        "deny": [
+            "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+            "*adservice.google.*", "*connect.facebook.net*", "*hotjar.com*", "*clarity.ms*", "*intercom.io*",
+        ],
+        # 不屏蔽的URL，优先于 deny（URLPattern语法，如 "*://cdn.example.com/*"，需要较新版本的Chrome）
+        "allow": [],
+        "track_network": True,  # 通过性能日志统计加载字节数和被屏蔽的请求
+    },
 }
 
 # 爬虫配置
 SCRAPER_CONFIG = {
-    "scroll_pause_time": 5,  # 滚动等待时间（秒）
+    "scroll_pause_time": 5,  # 滚动失败重试前的等待时间（秒）
     "max_retries": 5,  # 最大重试次数
     "batch_size": 100,  # 每批处理的工具数量
     "target_tools": 500,  # 目标工具数量
-    "load_wait_time": 10,  # 页面初始加载等待时间（秒）
+    "load_wait_time": 10,  # 页面初始加载等待上限（秒）
+    "wait_timeout": 10,  # 滚动后等待新内容的超时上限（秒）
+    "wait_quiet_time": 0.5,  # 新卡片出现后DOM和网络保持静默多久视为加载完成（秒）
+    "wait_idle_time": 2,  # 没有新卡片时网络和DOM空闲多久视为没有更多内容（秒）
+    "wait_settle_time": 1,  # DOM持续变化（轮播、计时器等）时最多再等多久，超过后只要求网络静默（秒）
+    "harvest_in_browser": True,  # 滚动过程中在浏览器内增量提取卡片并实时保存
+    "prune_harvested": False,  # 提取后把卡片替换为等高的占位元素，大量滚动时Chrome内存和每批耗时保持平稳（需要 harvest_in_browser）
+    "prune_keep": 48,  # 裁剪时在页面中保留的最近提取的卡片数量
+    "pipeline_queue_size": 8,  # 流式处理管道中最多缓存的卡片批次数，队列满时抓取线程等待写入
+    "checkpoint_interval": 30,  # 保存抓取检查点的最短间隔（秒），用于 --resume 续抓
+    "incremental": False,  # 增量抓取：列表按时间倒序，连续遇到已保存的工具时停止滚动（需要 harvest_in_browser）
+    "incremental_stop_after": 50,  # 增量抓取时连续多少个已保存的工具后停止
+    # 自适应滚动（AIMD）：新内容按时加载时加性提速，没有新内容或加载明显变慢时乘性降速
+    "adaptive_scroll": {
+        "enabled": True,
+        "step_px": 100,  # 初始滚动步长（关闭自适应时固定使用）
+        "step_min_px": 100,
+        "step_max_px": 5000,
+        "step_increase_px": 200,  # 每次提速增加的步长
+        "interval_ms": 50,  # 初始滚动间隔（关闭自适应时固定使用）
+        "interval_min_ms": 10,
+        "interval_max_ms": 200,
+        "interval_decrease_ms": 5,  # 每次提速缩短的间隔
+        "pause": 0.0,  # 初始批次间停顿（秒）
+        "pause_decrease": 0.25,  # 每次提速缩短的停顿，限流降速时停顿至少为该值（没有新内容时不增加停顿）
+        "pause_max": 5.0,
+        "decrease_factor": 0.5,  # 降速时步长乘以该系数，间隔和停顿除以该系数
+        "slow_factor": 2.0,  # 加载耗时超过平均值的该倍数时视为限流并降速
+        "latency_alpha": 0.3,  # 加载耗时指数移动平均的权重
+        "window": 20,  # 统计失败率的最近批次数
+        "max_failure_rate": 0.2,  # 最近的失败率超过该值时不再提速
+    },
+}
+
+# HTTP抓取配置
+HTTP_CONFIG = {
+    "enabled": True,  # 先尝试纯HTTP抓取，工具数量不足时回退到浏览器渲染
+    "min_cards": None,  # 列表页的HTTP响应至少包含的工具数量，不足时回退到浏览器渲染；为空时使用 SCRAPER_CONFIG["target_tools"]
+    "timeout": 15,  # 请求超时时间（秒）
+    "max_retries": 3,  # 连接错误和429/5xx响应的重试次数
+    "backoff_factor": 0.5,  # 重试退避系数（秒）
+    "pool_maxsize": 10,  # 每个主机的连接池大小
+    "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "json_items_key": "data",  # JSON接口中工具列表所在的键路径（点号分隔），为空表示顶层即为列表
+    "json_fields": {  # 工具字段到JSON字段名的映射
+        "tool_name": "name",
+        "description": "description",
+        "url": "url",
+        "category": "category",
+        "added_date": "added_date",
+    },
+}
+
+# 详情页抓取配置
+DETAIL_CONFIG = {
+    "enabled": False,  # 保存前抓取工具详情页，补全为空的描述、分类和日期（也可用 --details 开启）
+    "concurrency": 8,  # 最大并发请求数
+    "rate_per_host": 4,  # 每个主机每秒的请求数（令牌桶补充速率）
+    "burst": 8,  # 每个主机允许的突发请求数（令牌桶容量）
+    "timeout": 20,  # 单个请求超时时间（秒）
+    "max_retries": 3,  # 连接错误和429/5xx响应的重试次数
+    "backoff_factor": 1,  # 重试指数退避的基础等待时间（秒）
+}
+
+# 页面缓存配置（列表页、JSON接口和详情页）
+CACHE_CONFIG = {
+    "enabled": True,  # 缓存响应内容，再次请求时用 ETag/Last-Modified 发送条件请求
+    "max_bytes": 256 * 1024 * 1024,  # 缓存总大小上限，超过时淘汰最久未访问的页面
+    "fresh_seconds": 0,  # 缓存在该时长内直接使用、不重新验证（调试解析器时可调大）
+    "cache_rendered": False,  # 保存浏览器渲染后的完整页面供回放使用（浏览器内提取模式下会额外读取一次 page_source）
+    "replay": False,  # 回放模式（只读）：只解析缓存中的页面并写入 REPLAY_CSV，不访问网络、不启动浏览器、不写入存储
+}
+
+# 解析配置
+PARSER_CONFIG = {
+    "backend": "lxml",  # HTML解析后端：lxml（默认，1万卡片约1.3秒）/ selectolax（最快）/ beautifulsoup（参考实现，1万卡片约25秒）
+    "workers": 1,  # 并行解析的进程数，1 为单进程解析，0 使用全部CPU核心
+    "parallel_min_bytes": 1024 * 1024,  # 页面小于该大小时不分片（进程间传输开销大于收益）
+    "shards_per_worker": 4,  # 每个进程分到的分片数，分片越多负载越均衡
+    "start_method": "forkserver",  # 进程池启动方式：forkserver / spawn（多线程进程中 fork 不安全）
 }
 
 # 数据存储配置
 STORAGE_CONFIG = {
+    "backend": "sqlite",  # 存储后端：csv（追加后合并去重）/ sqlite（按URL upsert）/ parquet（分区列式存储）
+    "export_csv": False,  # 使用sqlite后端时，每次有新工具的运行结束后全量重写 tools.csv（也可用 --export-csv 按需导出）
     "csv_encoding": "utf-8",
+    "bloom_capacity": 1_000_000,  # URL索引前置布隆过滤器的预期容量，0表示不使用
+    "bloom_error_rate": 0.01,  # 布隆过滤器误判率
+    "read_chunk_size": 50_000,  # 分块读取CSV时每块的行数
+    "parquet_partition_by": ["crawl_date"],  # Parquet分区列，可选 crawl_date、category
+    "parquet_compression": "zstd",  # Parquet压缩算法
+    "parquet_compact_min_files": 8,  # 运行结束后把文件数不少于该值的分区合并为一个文件，0表示不合并
+    "snapshot_keep": 5,  # 保留的快照数量
+    "snapshot_chunk_size": 4 * 1024 * 1024,  # 快照切块大小（字节），相同的块只存储一次
     "csv_columns": [
         "tool_name",
         "description",
@@ -36,6 +167,14 @@ STORAGE_CONFIG = {
     ]
 }
 
+# 指标配置
+METRICS_CONFIG = {
+    "enabled": True,  # 采集进程内存并在运行结束后写入 METRICS_REPORT
+    "sample_interval": 5,  # Python和Chrome进程内存的采样间隔（秒）
+    "prometheus_port": None,  # 设置端口后在 http://localhost:<port>/metrics 提供Prometheus文本格式指标
+    "prometheus_host": "127.0.0.1",  # Prometheus接口监听地址，默认只允许本机访问；需要外部抓取时设为 "0.0.0.0"
+}
+
 # 日志配置
 LOG_CONFIG = {
     "format": "{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
@@ -1,15 +1,28 @@
 """
 主程序入口，整合所有模块实现完整的爬虫功能
 """
+import argparse
 import sys
 import time
 from loguru import logger
 from selenium.common.exceptions import WebDriverException
 
-from config import BASE_URL, SCRAPER_CONFIG
+from config import (
+    BASE_URL, BROWSER_CONFIG, CACHE_CONFIG, DETAIL_CONFIG, HTTP_CONFIG, METRICS_CONFIG, METRICS_REPORT,
+    REPLAY_CSV, SCRAPER_CONFIG, START_URLS, STORAGE_CONFIG
+)
 from scraper.browser import BrowserManager
-from scraper.parser import ToolParser
-from scraper.storage import DataStorage
+from scraper.checkpoint import CrawlCheckpoint
+from scraper.detail import DetailCrawler
+from scraper.driver import start_chrome_daemon, stop_chrome_daemon
+from scraper.fetcher import HttpFetcher
+from scraper.http_cache import close_default_cache
+from scraper.metrics import metrics
+from scraper.pipeline import crawl_listing
+from scraper.pool import BrowserPool, DedupSink
+from scraper.records import tools_to_dataframe
+from scraper.snapshot import SnapshotStore
+from scraper.storage import create_storage
 
 def setup_logger():
     """配置日志记录器"""
@@ -26,66 +39,287 @@ def setup_logger():
         level="DEBUG"
     )
 
-def main():
+def fetch_over_http(http_fetcher, sink, url):
+    """
+    通过纯HTTP抓取入口页，工具数量达到目标时无需启动浏览器
+    
+    Args:
+        http_fetcher: HTTP抓取器
+        sink: 去重保存器
+        url: 入口页URL
+    
+    Returns:
+        HTTP结果是否足够
+    """
+    tools = http_fetcher.fetch_tools(url)
+    if tools is None:
+        return False
+    sink.add(tools)
+    return True
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    arg_parser = argparse.ArgumentParser(description="AI工具爬虫")
+    arg_parser.add_argument("--list-snapshots", action="store_true", help="列出数据快照后退出")
+    arg_parser.add_argument(
+        "--restore", nargs="?", const="latest", metavar="SNAPSHOT_ID",
+        help="恢复指定快照（省略ID时恢复最新快照）并重建URL索引后退出"
+    )
+    arg_parser.add_argument(
+        "--export-csv", action="store_true",
+        help="把SQLite中的全部工具导出到 data/tools.csv 后退出（每次运行后自动导出见 STORAGE_CONFIG['export_csv']）"
+    )
+    arg_parser.add_argument("--resume", action="store_true", help="从上次中断时保存的检查点继续抓取")
+    arg_parser.add_argument(
+        "--url", action="append", dest="urls", metavar="URL",
+        help="抓取指定的入口页（可重复），替代配置中的 BASE_URL 和 START_URLS"
+    )
+    arg_parser.add_argument(
+        "--browser-daemon", action="store_true",
+        help="启动常驻Chrome（远程调试模式）后退出，之后的运行自动连接该浏览器"
+    )
+    arg_parser.add_argument("--stop-browser-daemon", action="store_true", help="关闭常驻Chrome后退出")
+    arg_parser.add_argument(
+        "--incremental", action="store_true",
+        help="增量抓取：连续遇到 SCRAPER_CONFIG['incremental_stop_after'] 个已保存的工具后停止滚动"
+    )
+    arg_parser.add_argument(
+        "--details", action="store_true",
+        help="保存前抓取工具详情页补全描述、分类和日期，替代 DETAIL_CONFIG['enabled']"
+    )
+    arg_parser.add_argument(
+        "--replay", action="store_true",
+        help="回放模式（只读）：解析页面缓存中的入口页并写入 data/replay_tools.csv，"
+             "不访问网络、不启动浏览器，也不写入存储和URL索引"
+    )
+    arg_parser.add_argument(
+        "--attach", metavar="HOST:PORT",
+        help="连接指定远程调试地址上已运行的Chrome，替代 BROWSER_CONFIG['debugger_address']"
+    )
+    return arg_parser.parse_args(argv)
+
+def list_snapshots():
+    """输出所有快照"""
+    snapshots = SnapshotStore().list()
+    if not snapshots:
+        logger.info("没有任何快照")
+    for snapshot in snapshots:
+        size = sum(entry["size"] for entry in snapshot["files"])
+        logger.info(
+            f"{snapshot['id']}  {snapshot['created_at']}  {snapshot.get('backend') or '-'}  "
+            f"{len(snapshot['files'])} 个文件  {size} 字节"
+        )
+
+def restore_snapshot(snapshot_id):
+    """
+    恢复快照，并根据恢复后的数据重建URL索引
+    
+    Returns:
+        是否恢复成功
+    """
+    # 默认恢复当前存储后端最新的快照（其他后端的快照不包含当前后端的数据文件）
+    backend = STORAGE_CONFIG["backend"]
+    if not SnapshotStore().restore(None if snapshot_id == "latest" else snapshot_id, backend=backend):
+        return False
+    
+    storage = create_storage()
+    try:
+        storage.load_existing_tools()
+        rebuild_url_index = getattr(storage, "rebuild_url_index", None)
+        return rebuild_url_index() if rebuild_url_index else True
+    finally:
+        storage.close()
+
+def replay_sources(urls):
+    """
+    回放模式：解析页面缓存中的入口页，结果写入 REPLAY_CSV 供比较解析器改动前后的输出；
+    不写入存储和URL索引，也不创建快照或导出CSV
+    
+    Args:
+        urls: 入口页URL列表
+    
+    Returns:
+        是否解析到工具
+    """
+    fetcher = HttpFetcher()
+    try:
+        tools = []
+        seen = set()
+        for url in urls:
+            for tool in fetcher.replay_tools(url):
+                if tool['url'] not in seen:
+                    seen.add(tool['url'])
+                    tools.append(tool)
+    finally:
+        fetcher.close()
+        close_default_cache()
+    if not tools:
+        logger.error("回放未能解析到任何工具信息")
+        return False
+    REPLAY_CSV.parent.mkdir(parents=True, exist_ok=True)
+    tools_to_dataframe(tools, STORAGE_CONFIG["csv_columns"]).to_csv(
+        REPLAY_CSV, index=False, encoding=STORAGE_CONFIG["csv_encoding"]
+    )
+    logger.info(f"回放解析 {len(tools)} 个工具，已写入 {REPLAY_CSV}（未写入存储）")
+    return True
+
+def export_csv():
+    """
+    按需把当前存储导出为CSV
+    
+    Returns:
+        是否导出成功
+    """
+    storage = create_storage()
+    try:
+        export = getattr(storage, "export_csv", None)
+        if export is None:
+            logger.warning(f"{STORAGE_CONFIG['backend']} 存储后端不需要导出CSV")
+            return False
+        with metrics.timer("storage_export_seconds"):
+            return export()
+    finally:
+        storage.close()
+
+def main(argv=None):
     """主程序入口"""
     setup_logger()
+    args = parse_args(argv)
+    if args.list_snapshots:
+        list_snapshots()
+        return
+    if args.restore:
+        if not restore_snapshot(args.restore):
+            sys.exit(1)
+        return
+    if args.export_csv:
+        if not export_csv():
+            sys.exit(1)
+        return
+    if args.browser_daemon:
+        if start_chrome_daemon() is None:
+            sys.exit(1)
+        return
+    if args.stop_browser_daemon:
+        if not stop_chrome_daemon():
+            sys.exit(1)
+        return
+    if args.attach:
+        BROWSER_CONFIG["debugger_address"] = args.attach
+    if args.incremental:
+        SCRAPER_CONFIG["incremental"] = True
+    if args.replay:
+        CACHE_CONFIG["replay"] = True
+    if args.details:
+        DETAIL_CONFIG["enabled"] = True
+    
+    start_urls = args.urls or START_URLS
+    base_url = args.urls[0] if args.urls else BASE_URL
+    use_pool = len(start_urls) > 1 or BROWSER_CONFIG["pool_size"] > 1
+    sources = start_urls if use_pool else [base_url]
+    if CACHE_CONFIG["replay"]:
+        # 回放模式：直接解析缓存中的页面，不访问网络也不启动浏览器，只输出到单独的文件
+        if not replay_sources(sources):
+            sys.exit(1)
+        return
+    
     logger.info("开始运行工具爬虫程序")
     
+    # 读取或新建检查点
+    checkpoint = CrawlCheckpoint.load() if args.resume else None
+    if args.resume and checkpoint is None:
+        logger.warning("没有找到检查点，重新开始抓取")
+    elif checkpoint is not None:
+        logger.info(f"从 {checkpoint.state['updated_at']} 保存的检查点继续抓取")
+    checkpoint = checkpoint or CrawlCheckpoint()
+    
+    if METRICS_CONFIG["enabled"]:
+        metrics.start(
+            METRICS_CONFIG["sample_interval"], METRICS_CONFIG["prometheus_port"], METRICS_CONFIG["prometheus_host"]
+        )
+    
     # 初始化组件
     browser = None
-    storage = DataStorage()
+    http_fetcher = HttpFetcher() if HTTP_CONFIG["enabled"] else None
+    storage = create_storage()
     existing_tools = storage.load_existing_tools()
     
+    # 过滤已存在的工具，按批补全详情并保存
+    sink = DedupSink(storage, existing_tools, enricher=DetailCrawler() if DETAIL_CONFIG["enabled"] else None)
+    
     try:
-        # 初始化浏览器
-        browser = BrowserManager()
-        
-        # 访问目标网站
-        browser.get_page(BASE_URL)
-        logger.info("成功访问目标网站")
-        
-        # 备份现有数据
-        storage.backup_csv()
+        # 为现有数据创建快照
+        with metrics.timer("storage_snapshot_seconds"):
+            storage.snapshot()
         
-        # 滚动加载直到达到目标工具数量
-        target_reached = browser.scroll_until_count(SCRAPER_CONFIG["target_tools"])
-        if not target_reached:
-            logger.warning(f"未能达到目标工具数量 {SCRAPER_CONFIG['target_tools']}")
+        if use_pool:
+            # 使用浏览器池并行抓取所有入口页
+            BrowserPool(sink, http_fetcher=http_fetcher, checkpoint=checkpoint).run(start_urls)
+        elif checkpoint.is_done(base_url):
+            logger.info("入口页已在检查点中标记完成，跳过抓取")
+        elif http_fetcher and fetch_over_http(http_fetcher, sink, base_url):
+            sink.flush()
+            checkpoint.finish(base_url)
+        else:
+            # 纯HTTP结果不足时启动浏览器
+            browser = BrowserManager()
+            
+            # 访问目标网站
+            browser.get_page(base_url)
+            logger.info("成功访问目标网站")
+            
+            # 滚动加载直到达到目标工具数量，同时解析并保存新工具，定期保存检查点
+            target_reached, _ = crawl_listing(browser, sink, base_url, checkpoint)
+            if not target_reached:
+                logger.warning(f"未能达到目标工具数量 {SCRAPER_CONFIG['target_tools']}，可使用 --resume 继续抓取")
         
-        # 获取页面内容并解析
-        page_source = browser.driver.page_source
-        tools = ToolParser.parse_tool_cards(page_source)
+        sink.flush()
+        if all(checkpoint.is_done(url) for url in sources):
+            checkpoint.clear()
+        total_count, new_count = sink.total_count, sink.saved_count
         
-        if not tools:
+        if not total_count:
             logger.error("未能解析到任何工具信息")
             return
         
-        # 过滤已存在的工具
-        new_tools = [
-            tool for tool in tools
-            if tool['url'] not in existing_tools
-        ]
-        
-        if new_tools:
-            # 保存新工具信息
-            storage.save_tools(new_tools, mode='a')
-            logger.info(f"成功保存 {len(new_tools)} 个新工具")
+        if new_count:
+            logger.info(f"成功保存 {new_count} 个新工具")
             
             # 合并重复记录
             storage.merge_duplicates()
+            # 合并Parquet分区中每批写入的小文件
+            compact = getattr(storage, "compact", None)
+            if compact:
+                compact()
+            
+            # 按配置在每次运行后导出CSV供下游使用（默认关闭，全量重写，可用 --export-csv 按需导出）
+            if STORAGE_CONFIG["backend"] == "sqlite" and STORAGE_CONFIG["export_csv"]:
+                with metrics.timer("storage_export_seconds"):
+                    storage.export_csv()
             
-            logger.info(f"爬虫程序完成，共抓取 {len(tools)} 个工具，新增 {len(new_tools)} 个工具")
+            logger.info(f"爬虫程序完成，共抓取 {total_count} 个工具，新增 {new_count} 个工具")
         else:
             logger.info("没有发现新的工具")
         
     except Exception as e:
         logger.error(f"程序运行出错: {str(e)}")
+        # 保存已经收集到的工具和抓取进度
+        sink.flush()
+        checkpoint.save()
         raise
         
     finally:
         # 清理资源
         if browser:
             browser.quit()
+        if http_fetcher:
+            http_fetcher.close()
+        # 页面缓存命中的访问时间只保存在内存中，关闭时写回索引
+        close_default_cache()
+        storage.close()
+        if METRICS_CONFIG["enabled"]:
+            metrics.stop()
+            metrics.write_report(METRICS_REPORT)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,6 +3,11 @@ Toolify.ai 工具爬虫包
 """
 from scraper.browser import BrowserManager
 from scraper.parser import ToolParser
-from scraper.storage import DataStorage
+from scraper.records import ToolRecord
+from scraper.storage import DataStorage, ParquetStorage, SQLiteStorage, create_storage
+from scraper.pool import BrowserPool, DedupSink
 
-__all__ = ['BrowserManager', 'ToolParser', 'DataStorage']
\ No newline at end of file
+__all__ = [
+    'BrowserManager', 'ToolParser', 'DataStorage', 'SQLiteStorage', 'ParquetStorage', 'create_storage',
+    'BrowserPool', 'DedupSink', 'ToolRecord'
+]
\ No newline at end of file
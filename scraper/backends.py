@@ -0,0 +1,339 @@
+"""
+HTML解析后端模块，为ToolParser提供可替换的文档解析实现
+
+所有后端使用同一套卡片判定规则，并返回相同结构的原始字段字典，
+由 ToolParser.build_tool 统一完成清洗和校验，保证不同后端产出一致的工具信息。
+"""
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# 分类和日期字段的识别关键词
+CATEGORY_KEYWORDS = ('category:', 'type:', '类别:', '分类:')
+DATE_KEYWORDS = ('added:', 'date:', '添加:', '日期:')
+
+# 卡片判定使用的子孙节点特征位
+_HAS_LINK = 1
+_HAS_PARAGRAPH = 2
+_HAS_HEADING = 4
+_HAS_CARD = 8
+
+_TAG_FLAGS = {
+    'a': _HAS_LINK,
+    'p': _HAS_PARAGRAPH,
+    'h2': _HAS_HEADING,
+    'h3': _HAS_HEADING,
+    'h4': _HAS_HEADING,
+}
+
+HEADING_TAGS = ['h2', 'h3', 'h4']
+
+
+def _find_innermost_cards(nodes: List, tag_of: Callable, parent_of: Callable,
+                          key_of: Callable) -> List:
+    """
+    自底向上单次遍历文档树，找出最内层的工具卡片容器
+
+    卡片判定：div 的子孙节点中包含链接，并且包含段落或标题。
+    每个节点只访问一次，子孙特征通过位标记向父节点汇总；已包含卡片的祖先
+    节点不再被视为卡片，从而避免外层包装 div 重复产出记录。
+
+    Args:
+        nodes: 按先序排列的全部元素节点
+        tag_of: 获取节点标签名的函数
+        parent_of: 获取父节点的函数
+        key_of: 获取节点唯一标识的函数
+
+    Returns:
+        按文档顺序排列的卡片节点列表
+    """
+    cards = []
+    flags = {}
+    # 逆先序遍历保证子孙先于祖先被处理
+    for node in reversed(nodes):
+        node_flags = flags.pop(key_of(node), 0)
+        tag = tag_of(node)
+        if (tag == 'div'
+                and not node_flags & _HAS_CARD
+                and node_flags & _HAS_LINK
+                and node_flags & (_HAS_PARAGRAPH | _HAS_HEADING)):
+            cards.append(node)
+            node_flags |= _HAS_CARD
+
+        parent = parent_of(node)
+        if parent is not None:
+            key = key_of(parent)
+            flags[key] = flags.get(key, 0) | node_flags | _TAG_FLAGS.get(tag, 0)
+
+    cards.reverse()
+    return cards
+
+
+def match_labels(texts, shortest: bool = False) -> Tuple[str, str]:
+    """
+    从候选文本中提取分类和日期
+
+    Args:
+        texts: 按文档顺序排列的span/div文本（可为生成器）
+        shortest: 为True时取包含关键词的最短文本（即最内层元素），适用于整页文档；
+            默认取第一个包含关键词的文本
+
+    Returns:
+        (分类, 日期)
+    """
+    category = None
+    added_date = None
+    for text in texts:
+        text = text.lower()
+        if any(keyword in text for keyword in CATEGORY_KEYWORDS):
+            if category is None or (shortest and len(text) < len(category)):
+                category = text
+        if any(keyword in text for keyword in DATE_KEYWORDS):
+            if added_date is None or (shortest and len(text) < len(added_date)):
+                added_date = text
+        if not shortest and category is not None and added_date is not None:
+            break
+    return (
+        category.split(':', 1)[-1].strip() if category is not None else "",
+        added_date.split(':', 1)[-1].strip() if added_date is not None else ""
+    )
+
+
+class ParserBackend:
+    """HTML解析后端基类"""
+
+    name = ""
+
+    def parse(self, html_content: str):
+        """
+        解析HTML并返回文档根节点
+
+        Args:
+            html_content: 页面HTML内容
+
+        Returns:
+            后端对应的根节点对象
+        """
+        raise NotImplementedError
+
+    def find_cards(self, html_content: str) -> List:
+        """
+        解析HTML并返回所有工具卡片节点
+
+        Args:
+            html_content: 页面HTML内容
+
+        Returns:
+            按文档顺序排列的卡片节点列表
+        """
+        raise NotImplementedError
+
+    def label_texts(self, node) -> Iterator[str]:
+        """按文档顺序生成节点内所有span/div子孙元素的文本（不含节点自身）"""
+        raise NotImplementedError
+
+    def paragraph_texts(self, node) -> List[str]:
+        """返回节点内所有段落的文本"""
+        raise NotImplementedError
+
+    def extract_card(self, card) -> Dict[str, Any]:
+        """
+        提取单个卡片的原始字段
+
+        Args:
+            card: find_cards 返回的卡片节点
+
+        Returns:
+            包含 title、link_text、href、paragraphs、category、added_date 的字典
+        """
+        raise NotImplementedError
+
+    def extract_detail(self, html_content: str) -> Dict[str, Any]:
+        """
+        提取工具详情页中的描述段落、分类和日期
+
+        Args:
+            html_content: 详情页HTML内容
+
+        Returns:
+            包含 paragraphs、category、added_date 的字典
+        """
+        root = self.parse(html_content)
+        if root is None:
+            return {}
+        category, added_date = match_labels(self.label_texts(root), shortest=True)
+        return {
+            'paragraphs': self.paragraph_texts(root),
+            'category': category,
+            'added_date': added_date,
+        }
+
+
+class BeautifulSoupBackend(ParserBackend):
+    """基于BeautifulSoup html.parser的参考实现"""
+
+    name = "beautifulsoup"
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._soup_class = BeautifulSoup
+
+    def parse(self, html_content: str):
+        return self._soup_class(html_content, 'html.parser')
+
+    def find_cards(self, html_content: str) -> List:
+        soup = self.parse(html_content)
+        return _find_innermost_cards(
+            soup.find_all(True),
+            tag_of=lambda tag: tag.name,
+            parent_of=lambda tag: tag.parent,
+            key_of=id
+        )
+
+    def label_texts(self, node) -> Iterator[str]:
+        return (element.get_text(strip=True) for element in node.find_all(['span', 'div']))
+
+    def paragraph_texts(self, node) -> List[str]:
+        return [p.get_text(strip=True) for p in node.find_all('p')]
+
+    def extract_card(self, card) -> Dict[str, Any]:
+        title_element = card.find(HEADING_TAGS)
+        link_element = card.find('a')
+        category, added_date = match_labels(self.label_texts(card))
+        return {
+            'title': title_element.get_text(strip=True) if title_element else "",
+            'link_text': link_element.get_text(strip=True) if link_element else "",
+            'href': (link_element.get('href') or "") if link_element else "",
+            'paragraphs': self.paragraph_texts(card),
+            'category': category,
+            'added_date': added_date,
+        }
+
+
+class LxmlBackend(ParserBackend):
+    """基于lxml（libxml2）的解析后端"""
+
+    name = "lxml"
+
+    def __init__(self):
+        try:
+            import lxml.html
+            from lxml import etree
+        except ImportError as e:
+            raise ImportError("lxml 解析后端需要安装 lxml: pip install lxml") from e
+        self._html = lxml.html
+        self._element_type = etree.Element
+
+    @staticmethod
+    def _text(element) -> str:
+        return "".join(text.strip() for text in element.itertext())
+
+    def parse(self, html_content: str):
+        return self._html.fromstring(html_content)
+
+    def find_cards(self, html_content: str) -> List:
+        root = self.parse(html_content)
+        # 只遍历元素节点，跳过注释和处理指令
+        return _find_innermost_cards(
+            list(root.iter(self._element_type)),
+            tag_of=lambda element: element.tag,
+            parent_of=lambda element: element.getparent(),
+            key_of=id
+        )
+
+    def label_texts(self, node) -> Iterator[str]:
+        return (self._text(element) for element in node.iterdescendants('span', 'div'))
+
+    def paragraph_texts(self, node) -> List[str]:
+        return [self._text(p) for p in node.iterdescendants('p')]
+
+    def extract_card(self, card) -> Dict[str, Any]:
+        title_element = next(card.iterdescendants(*HEADING_TAGS), None)
+        link_element = next(card.iterdescendants('a'), None)
+        category, added_date = match_labels(self.label_texts(card))
+        return {
+            'title': self._text(title_element) if title_element is not None else "",
+            'link_text': self._text(link_element) if link_element is not None else "",
+            'href': (link_element.get('href') or "") if link_element is not None else "",
+            'paragraphs': self.paragraph_texts(card),
+            'category': category,
+            'added_date': added_date,
+        }
+
+
+class SelectolaxBackend(ParserBackend):
+    """基于selectolax（lexbor引擎）的解析后端"""
+
+    name = "selectolax"
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser
+        except ImportError as e:
+            raise ImportError("selectolax 解析后端需要安装 selectolax: pip install selectolax") from e
+        self._parser_class = LexborHTMLParser
+
+    @staticmethod
+    def _text(node) -> str:
+        return node.text(deep=True, separator='', strip=True)
+
+    def parse(self, html_content: str):
+        return self._parser_class(html_content).root
+
+    def find_cards(self, html_content: str) -> List:
+        root = self.parse(html_content)
+        if root is None:
+            return []
+        return _find_innermost_cards(
+            list(root.traverse(include_text=False)),
+            tag_of=lambda node: node.tag,
+            parent_of=lambda node: node.parent,
+            key_of=lambda node: node.mem_id
+        )
+
+    def label_texts(self, node) -> Iterator[str]:
+        # lexbor 的 css() 结果包含节点自身，需要排除以与其他后端保持一致
+        return (
+            self._text(element) for element in node.css('span, div')
+            if element.mem_id != node.mem_id
+        )
+
+    def paragraph_texts(self, node) -> List[str]:
+        return [self._text(p) for p in node.css('p')]
+
+    def extract_card(self, card) -> Dict[str, Any]:
+        title_element = card.css_first('h2, h3, h4')
+        link_element = card.css_first('a')
+        category, added_date = match_labels(self.label_texts(card))
+        return {
+            'title': self._text(title_element) if title_element is not None else "",
+            'link_text': self._text(link_element) if link_element is not None else "",
+            'href': (link_element.attributes.get('href') or "") if link_element is not None else "",
+            'paragraphs': self.paragraph_texts(card),
+            'category': category,
+            'added_date': added_date,
+        }
+
+
+BACKENDS = {
+    BeautifulSoupBackend.name: BeautifulSoupBackend,
+    LxmlBackend.name: LxmlBackend,
+    SelectolaxBackend.name: SelectolaxBackend,
+}
+
+_instances: Dict[str, ParserBackend] = {}
+
+
+def get_backend(name: str) -> ParserBackend:
+    """
+    获取指定名称的解析后端实例（按名称缓存）
+
+    Args:
+        name: 后端名称，见 BACKENDS
+
+    Returns:
+        解析后端实例
+    """
+    if name not in _instances:
+        if name not in BACKENDS:
+            raise ValueError(f"未知的解析后端: {name}，可选值: {', '.join(BACKENDS)}")
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
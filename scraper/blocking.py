@@ -0,0 +1,135 @@
+"""
+资源屏蔽模块：解析只需要文本和链接，屏蔽图片、字体、媒体和统计/广告脚本以减少带宽和渲染开销，
+并通过Chrome性能日志统计实际加载的字节数和被屏蔽的请求
+"""
+from loguru import logger
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from typing import Dict, List
+import json
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import BROWSER_CONFIG
+from scraper.metrics import metrics
+
+
+def configure_options(options: Options, launch: bool = True):
+    """
+    按屏蔽配置设置浏览器启动选项
+
+    Args:
+        options: Chrome启动选项
+        launch: 是否启动新浏览器；连接已运行的浏览器时偏好设置不生效，只开启网络日志
+    """
+    blocking = BROWSER_CONFIG["blocking"]
+    if not blocking["enabled"]:
+        return
+    if launch and blocking["disable_images"]:
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if blocking["track_network"]:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def deny_patterns(config: Dict) -> List[str]:
+    """
+    生成屏蔽规则列表
+
+    每个扩展名生成 "*.png" 和 "*.png?*" 两条规则：前者匹配不带查询参数的URL，
+    后者匹配 "logo.png?v=3" 这类带查询参数的URL（不用 "*.png*"，避免 "*.ico*" 误伤 ".icon"）。
+
+    Args:
+        config: 资源屏蔽配置
+
+    Returns:
+        URL屏蔽规则列表（支持 '*' 通配符）
+    """
+    patterns = []
+    for extension in config.get("deny_extensions", []):
+        extension = extension.lstrip(".")
+        patterns += [f"*.{extension}", f"*.{extension}?*"]
+    return patterns + list(config["deny"])
+
+
+class ResourceBlocker:
+    """为当前标签页设置URL屏蔽规则，并从性能日志中统计网络流量"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.config = BROWSER_CONFIG["blocking"]
+        self.loaded_bytes = 0
+        self.loaded_requests = 0
+        self.blocked: Dict[str, int] = {}
+
+    def install(self) -> bool:
+        """
+        在当前标签页启用URL屏蔽（对之后的所有导航生效）
+
+        Returns:
+            是否设置成功
+        """
+        if not self.config["enabled"]:
+            return False
+        params = {"urls": deny_patterns(self.config)}
+        if self.config["allow"]:
+            # urlPatterns 优先于 urls 匹配，block=False 的规则使请求不被屏蔽
+            params["urlPatterns"] = [{"urlPattern": pattern, "block": False} for pattern in self.config["allow"]]
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", params)
+            logger.info(f"已启用资源屏蔽: {len(params['urls'])} 条屏蔽规则，{len(self.config['allow'])} 条放行规则")
+            return True
+        except WebDriverException as e:
+            logger.warning(f"设置资源屏蔽失败: {str(e)}")
+            return False
+
+    def collect(self):
+        """读取并清空性能日志，累计加载字节数和被屏蔽的请求数，并输出本批（上次读取以来）的统计"""
+        if not (self.config["enabled"] and self.config["track_network"]):
+            return
+        try:
+            entries = self.driver.get_log("performance")
+        except WebDriverException as e:
+            logger.debug(f"读取性能日志失败: {str(e)}")
+            return
+
+        loaded_bytes = 0
+        loaded_requests = 0
+        blocked = 0
+        for entry in entries:
+            message = entry["message"]
+            # 只解析请求完成和失败事件，其余事件跳过JSON解析
+            if '"Network.loadingF' not in message:
+                continue
+            event = json.loads(message)["message"]
+            params = event["params"]
+            if event["method"] == "Network.loadingFinished":
+                loaded_bytes += params.get("encodedDataLength", 0)
+                loaded_requests += 1
+            elif params.get("blockedReason"):
+                resource_type = params.get("type", "Other")
+                blocked += 1
+                self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+                metrics.inc("browser_requests_blocked_total", labels={"type": resource_type})
+
+        self.loaded_bytes += loaded_bytes
+        self.loaded_requests += loaded_requests
+        metrics.inc("browser_bytes_loaded_total", loaded_bytes)
+        metrics.inc("browser_requests_loaded_total", loaded_requests)
+        if loaded_requests or blocked:
+            logger.info(
+                f"本批加载 {loaded_requests} 个请求 {loaded_bytes / 1024:.0f} KB，屏蔽 {blocked} 个请求"
+            )
+
+    def log_summary(self):
+        """输出本次会话的网络流量统计"""
+        if not (self.config["enabled"] and self.config["track_network"]):
+            return
+        blocked = ", ".join(f"{kind} {count}" for kind, count in sorted(self.blocked.items())) or "无"
+        logger.info(
+            f"浏览器共加载 {self.loaded_requests} 个请求 {self.loaded_bytes / 1024 / 1024:.1f} MB，"
+            f"屏蔽请求: {blocked}"
+        )
@@ -6,10 +6,10 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException, WebDriverException
 from loguru import logger
+from typing import Callable, Dict, List, Optional
+import json
 import time
 import sys
 import os
@@ -17,32 +17,385 @@ import os
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import BROWSER_CONFIG, SCRAPER_CONFIG
+from scraper.backends import CATEGORY_KEYWORDS, DATE_KEYWORDS
+from scraper.blocking import ResourceBlocker, configure_options
+from scraper.driver import CHROME_ARGUMENTS, resolve_driver_path, running_daemon
+from scraper.scroll_control import ScrollController
+from scraper.metrics import metrics
+
+# 浏览器内卡片登记和提取脚本，判定规则和字段与 scraper.backends 保持一致
+# 卡片由内容监视脚本在节点插入时增量登记，计数和提取都无需重新扫描整个DOM
+# arguments[0]: 分类关键词列表，arguments[1]: 日期关键词列表
+HARVEST_SCRIPT = """
+var categoryKeywords = arguments[0];
+var dateKeywords = arguments[1];
+var HAS_LINK = 1, HAS_PARAGRAPH = 2, HAS_HEADING = 4, HAS_CARD = 8;
+var TAG_FLAGS = {a: HAS_LINK, p: HAS_PARAGRAPH, h2: HAS_HEADING, h3: HAS_HEADING, h4: HAS_HEADING};
+var CARD_MARK = 'data-tool-card';
+var PLACEHOLDER_MARK = 'data-tool-placeholder';
+var cards = [];
+var registered = new WeakSet();
+var cursor = 0;
+var pruned = 0;
+// 计数按不同的链接地址：重新渲染的卡片会以新节点再次登记，按节点计数会虚高；
+// 登记时还没有链接地址的卡片（骨架屏）在计数时重新检查
+var hrefs = new Set();
+var unkeyed = [];
+
+// 与 get_text(strip=True) 一致：逐个文本节点去除首尾空白后直接拼接
+function text(element) {
+    var walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+    var parts = [];
+    while (walker.nextNode()) {
+        var part = walker.currentNode.nodeValue.trim();
+        if (part) {
+            parts.push(part);
+        }
+    }
+    return parts.join('');
+}
+
+function cardHref(card) {
+    var link = card.querySelector('a');
+    return link ? (link.getAttribute('href') || '') : '';
+}
+
+function registerCard(card) {
+    registered.add(card);
+    card.setAttribute(CARD_MARK, '');
+    cards.push(card);
+    var href = cardHref(card);
+    if (href) {
+        hrefs.add(href);
+    } else {
+        unkeyed.push(card);
+    }
+}
+
+// 不同链接地址的卡片数量；已脱离页面且始终没有链接地址的卡片不计入
+function countCards() {
+    if (unkeyed.length) {
+        unkeyed = unkeyed.filter(function(card) {
+            var href = cardHref(card);
+            if (href) {
+                hrefs.add(href);
+                return false;
+            }
+            return card.isConnected;
+        });
+    }
+    return hrefs.size;
+}
+
+// 自底向上单次遍历 root 子树（含 root 自身），登记其中尚未登记的最内层卡片
+function scan(root) {
+    var nodes = root.getElementsByTagName('*');
+    var flags = new Map();
+    var found = [];
+    // 逆先序遍历保证子孙先于祖先被处理，最后处理 root 自身
+    for (var i = nodes.length - 1; i >= -1; i--) {
+        var node = i >= 0 ? nodes[i] : root;
+        var nodeFlags = flags.get(node) || 0;
+        flags.delete(node);
+        if (node.localName === 'div' && !(nodeFlags & HAS_CARD)
+                && (nodeFlags & HAS_LINK) && (nodeFlags & (HAS_PARAGRAPH | HAS_HEADING))) {
+            if (!registered.has(node)) {
+                found.push(node);
+            }
+            nodeFlags |= HAS_CARD;
+        }
+        var parent = node.parentElement;
+        if (parent && node !== root) {
+            flags.set(parent, (flags.get(parent) || 0) | nodeFlags | (TAG_FLAGS[node.localName] || 0));
+        }
+    }
+    found.reverse().forEach(registerCard);
+    return found.length;
+}
+
+// 处理新插入的元素节点
+function register(node) {
+    var parent = node.parentElement;
+    if (node.hasAttribute(PLACEHOLDER_MARK)) {
+        return;
+    }
+    // 已登记卡片内部的局部更新（如延迟加载的描述）不产生新卡片
+    if (!parent || parent.closest('[' + CARD_MARK + ']')) {
+        return;
+    }
+    if (scan(node) > 0) {
+        return;
+    }
+    // 插入的是卡片的局部内容（如骨架卡片在嵌套元素中填充的描述），自内向外检查祖先 div
+    // 是否因此成为卡片；遇到已包含卡片的祖先时停止（它不是最内层卡片）
+    for (var container = parent; container && container !== document.body; container = container.parentElement) {
+        if (container.localName !== 'div') {
+            continue;
+        }
+        if (container.querySelector('[' + CARD_MARK + ']')) {
+            return;
+        }
+        if (container.querySelector('a') && container.querySelector('p, h2, h3, h4')) {
+            registerCard(container);
+            return;
+        }
+    }
+}
+
+// 与 ToolParser.validate_url 的规范化一致，用于和Python侧保存的工具URL比较
+function toolUrl(href) {
+    href = href.trim();
+    if (!href || /^https?:[/][/]/.test(href)) {
+        return href;
+    }
+    return 'https://www.toolify.ai' + href.replace(/^[/]+/, '');
+}
+
+function containsAny(value, keywords) {
+    return keywords.some(function(keyword) { return value.indexOf(keyword) !== -1; });
+}
+
+function extract(card) {
+    var title = card.querySelector('h2, h3, h4');
+    var link = card.querySelector('a');
+    var category = '', addedDate = '';
+    var elements = card.querySelectorAll('span, div');
+    for (var i = 0; i < elements.length && !(category && addedDate); i++) {
+        var value = text(elements[i]).toLowerCase();
+        if (!category && containsAny(value, categoryKeywords)) {
+            category = value.slice(value.indexOf(':') + 1).trim();
+        }
+        if (!addedDate && containsAny(value, dateKeywords)) {
+            addedDate = value.slice(value.indexOf(':') + 1).trim();
+        }
+    }
+    return {
+        title: title ? text(title) : '',
+        link_text: link ? text(link) : '',
+        href: link ? (link.getAttribute('href') || '') : '',
+        paragraphs: Array.prototype.map.call(card.querySelectorAll('p'), text),
+        category: category,
+        added_date: addedDate
+    };
+}
+
+// 卡片连同只包含它的外层包装元素一起替换
+function outermost(card) {
+    var node = card;
+    while (node.parentElement && node.parentElement !== document.body
+            && node.parentElement.childElementCount === 1) {
+        node = node.parentElement;
+    }
+    return node;
+}
+
+// 把位置 end 之前已提取的卡片替换为等高的空占位元素，保持页面滚动高度，网站的加载逻辑照常触发；
+// 同时释放对卡片元素的引用。返回本次替换的数量
+function prune(end) {
+    var nodes = [];
+    for (var i = pruned; i < end; i++) {
+        if (cards[i] && cards[i].isConnected) {
+            nodes.push(outermost(cards[i]));
+        }
+        cards[i] = null;
+    }
+    pruned = Math.max(pruned, end);
+    // 先统一读取高度再统一替换，避免逐个触发重新布局
+    var heights = nodes.map(function(node) { return node.getBoundingClientRect().height; });
+    nodes.forEach(function(node, j) {
+        var placeholder = document.createElement(node.localName === 'li' ? 'li' : 'div');
+        placeholder.className = node.className;
+        placeholder.setAttribute(PLACEHOLDER_MARK, '');
+        placeholder.style.boxSizing = 'border-box';
+        placeholder.style.height = heights[j] + 'px';
+        node.replaceWith(placeholder);
+    });
+    return nodes.length;
+}
+
+scan(document.body);
+
+window.__toolHarvest = {
+    register: register,
+    // 已登记卡片中不同链接地址的数量
+    count: countCards,
+    // 返回上次调用以来新登记卡片的原始字段和新的提取位置（JSON字符串）；
+    // keep >= 0 时提取后把除最近 keep 个以外的已提取卡片替换为占位元素
+    harvest: function(keep) {
+        var batch = cards.slice(cursor).map(extract);
+        cursor = cards.length;
+        var prunedCount = keep >= 0 ? prune(cursor - Math.max(keep, 1)) : 0;
+        return JSON.stringify({
+            cursor: cursor,
+            cards: batch,
+            pruned: prunedCount,
+            nodes: document.body.getElementsByTagName('*').length
+        });
+    },
+    // 在尚未提取的卡片中查找工具URL为 url 的卡片，找到时把提取位置移到它之后（之前的卡片不再提取），
+    // 返回新的提取位置；没有找到时返回null，提取位置不变
+    skipPast: function(url) {
+        for (var i = cards.length - 1; i >= cursor; i--) {
+            if (cards[i] && toolUrl(cardHref(cards[i])) === url) {
+                cursor = i + 1;
+                return cursor;
+            }
+        }
+        return null;
+    }
+};
+"""
+
+# 内容监视脚本：MutationObserver 把新插入的节点交给卡片登记脚本，并跟踪 fetch/XHR 请求是否空闲
+WATCH_SCRIPT = """
+if (!window.__toolWatch) {
+    var watch = window.__toolWatch = {
+        pending: 0,
+        lastMutation: Date.now(),
+        lastNetwork: Date.now()
+    };
+
+    new MutationObserver(function(records) {
+        watch.lastMutation = Date.now();
+        records.forEach(function(record) {
+            record.addedNodes.forEach(function(node) {
+                if (node.nodeType === 1 && node.isConnected) {
+                    window.__toolHarvest.register(node);
+                }
+            });
+        });
+    }).observe(document.body, {childList: true, subtree: true});
+
+    function requestStarted() {
+        watch.pending++;
+        watch.lastNetwork = Date.now();
+    }
+    function requestFinished() {
+        watch.pending = Math.max(0, watch.pending - 1);
+        watch.lastNetwork = Date.now();
+    }
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function() {
+            requestStarted();
+            return originalFetch.apply(this, arguments).finally(requestFinished);
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        requestStarted();
+        this.addEventListener('loadend', requestFinished);
+        return originalSend.apply(this, arguments);
+    };
+}
+"""
+
+# 异步等待脚本：新卡片登记且DOM/网络静默后立即返回，没有新内容时在空闲后返回，最长等待到超时；
+# DOM持续变化时最多再等待 settle 毫秒
+# arguments: [基准计数, 超时毫秒, 静默毫秒, 空闲毫秒, DOM静默上限毫秒, 回调]
+WAIT_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var since = arguments[0], timeout = arguments[1], quiet = arguments[2], idle = arguments[3];
+var settle = arguments[4];
+var watch = window.__toolWatch;
+var harvest = window.__toolHarvest;
+if (!watch || !harvest) {
+    done(null);
+    return;
+}
+var start = Date.now(), addedAt = null;
+(function check() {
+    var now = Date.now();
+    var added = harvest.count() - since;
+    var domQuiet = now - watch.lastMutation;
+    var networkQuiet = watch.pending === 0 ? now - Math.max(watch.lastNetwork, start) : 0;
+    var status = null;
+    if (added > 0 && addedAt === null) {
+        addedAt = now;
+    }
+    // 轮播、计时器等持续修改DOM的页面上DOM不会静默：新卡片出现超过 settle 后只要求网络静默
+    if (added > 0 && networkQuiet >= quiet && (domQuiet >= quiet || now - addedAt >= settle)) {
+        status = 'loaded';
+    } else if (added <= 0 && now - start >= idle && networkQuiet >= idle
+            && (domQuiet >= idle || now - start >= idle + settle)) {
+        status = 'idle';
+    } else if (now - start >= timeout) {
+        status = 'timeout';
+    }
+    if (status) {
+        done({status: status, added: added, elapsed: (now - start) / 1000});
+    } else {
+        setTimeout(check, 50);
+    }
+})();
+"""
+
+# 查找可见的"加载更多"按钮，没有时返回null
+LOAD_MORE_SCRIPT = """
+var result = document.evaluate(
+    "//button[contains(text(), 'Load More') or contains(text(), '加载更多')]",
+    document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+);
+for (var i = 0; i < result.snapshotLength; i++) {
+    var button = result.snapshotItem(i);
+    if (!button.disabled && button.offsetParent !== null) {
+        return button;
+    }
+}
+return null;
+"""
 
 class BrowserManager:
     def __init__(self):
         """初始化浏览器管理器"""
         self.driver = None
         self.wait = None
+        self.blocker = None
+        # 是否连接到已运行的Chrome（常驻浏览器）
+        self.attached = False
+        self._wait_times = []
+        # 根据加载耗时调整滚动步长、间隔和批次间停顿
+        self.scroll_control = ScrollController()
+        # 浏览器内已提取到的卡片位置，用于检查点续抓
+        self.harvest_cursor = 0
         self._setup_browser()
 
     def _setup_browser(self):
-        """设置并初始化Chrome浏览器"""
+        """设置并初始化Chrome浏览器，配置了远程调试地址或常驻浏览器在运行时直接连接"""
         try:
             options = Options()
-            if BROWSER_CONFIG["headless"]:
-                options.add_argument("--headless")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            options.add_argument("--window-size=1920,1080")
-            options.add_argument("--disable-notifications")
-            options.add_argument("--disable-popup-blocking")
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
+            daemon = running_daemon()
+            address = BROWSER_CONFIG["debugger_address"] or (daemon and daemon["address"])
+            if address:
+                # 启动参数由已运行的浏览器决定
+                options.debugger_address = address
+            else:
+                if BROWSER_CONFIG["headless"]:
+                    options.add_argument("--headless")
+                for argument in CHROME_ARGUMENTS:
+                    options.add_argument(argument)
+            configure_options(options, launch=not address)
+            
+            self.driver = self._start_driver(options)
+            # 统计chromedriver及其Chrome子进程的内存
+            metrics.track_process(self.driver.service.process.pid)
+            
+            if address:
+                # 每个管理器使用自己的标签页，多个工作线程可以共享同一个常驻浏览器
+                self.attached = True
+                self.driver.switch_to.new_window("tab")
+                if daemon and daemon["address"] == address:
+                    metrics.track_process(daemon["pid"])
+                logger.info(f"已连接到运行中的浏览器: {address}")
+            
+            # 屏蔽规则作用于当前标签页
+            self.blocker = ResourceBlocker(self.driver)
+            self.blocker.install()
             
             self.driver.set_page_load_timeout(BROWSER_CONFIG["page_load_timeout"])
             self.driver.implicitly_wait(BROWSER_CONFIG["implicit_wait"])
+            self.driver.set_script_timeout(BROWSER_CONFIG["page_load_timeout"])
             self.wait = WebDriverWait(self.driver, BROWSER_CONFIG["implicit_wait"])
             
             logger.info("浏览器初始化成功")
@@ -50,17 +403,29 @@ class BrowserManager:
             logger.error(f"浏览器初始化失败: {str(e)}")
             raise
 
+    @staticmethod
+    def _start_driver(options: Options) -> webdriver.Chrome:
+        """启动chromedriver；缓存的驱动与Chrome版本不匹配时重新解析一次"""
+        try:
+            return webdriver.Chrome(service=Service(resolve_driver_path()), options=options)
+        except SessionNotCreatedException as e:
+            if BROWSER_CONFIG["driver_path"]:
+                raise
+            logger.warning(f"缓存的chromedriver无法创建会话，重新解析驱动: {str(e)}")
+            return webdriver.Chrome(service=Service(resolve_driver_path(refresh=True)), options=options)
+
+    @metrics.timed("browser_get_page_seconds")
     def get_page(self, url):
         """加载指定URL的页面"""
         try:
             self.driver.get(url)
             logger.info(f"成功加载页面: {url}")
             
-            # 注入自动滚动脚本
-            self._inject_auto_scroll_script()
+            # 注入自动滚动、内容监视和卡片提取脚本
+            self._inject_scripts()
             
-            # 等待页面完全加载
-            time.sleep(SCRAPER_CONFIG["load_wait_time"])
+            # 等待页面内容加载完成（网络和DOM空闲后立即返回）
+            self.wait_for_new_content(timeout=SCRAPER_CONFIG["load_wait_time"])
             
             # 尝试查找包含链接的div元素
             self._wait_for_content()
@@ -72,6 +437,12 @@ class BrowserManager:
             logger.error(f"页面加载失败: {str(e)}")
             raise
 
+    def _inject_scripts(self):
+        """注入页面辅助脚本（页面加载或刷新后都需要重新注入）"""
+        self._inject_auto_scroll_script()
+        self._inject_harvest_script()
+        self.driver.execute_script(WATCH_SCRIPT)
+
     def _inject_auto_scroll_script(self):
         """注入自动滚动脚本"""
         script = """
@@ -96,14 +467,121 @@ class BrowserManager:
         """
         self.driver.execute_script(script)
 
+    def _inject_harvest_script(self):
+        """注入浏览器内卡片提取脚本"""
+        self.driver.execute_script(HARVEST_SCRIPT, list(CATEGORY_KEYWORDS), list(DATE_KEYWORDS))
+
+    def harvest_new_cards(self) -> List[Dict]:
+        """
+        在浏览器内提取自上次调用以来新增的工具卡片，并更新 harvest_cursor
+        
+        Returns:
+            卡片原始字段列表，可交给 ToolParser.parse_harvested_cards 解析
+        """
+        script = "return window.__toolHarvest ? window.__toolHarvest.harvest(arguments[0]) : null"
+        # 开启DOM裁剪时保留最近提取的卡片，其余替换为占位元素
+        keep = SCRAPER_CONFIG["prune_keep"] if SCRAPER_CONFIG["prune_harvested"] else -1
+        with metrics.timer("browser_harvest_seconds"):
+            payload = self.driver.execute_script(script, keep)
+            if payload is None:
+                # 页面导航后脚本丢失，重新注入
+                self._inject_scripts()
+                payload = self.driver.execute_script(script, keep)
+        result = json.loads(payload)
+        self.harvest_cursor = result["cursor"]
+        metrics.inc("cards_harvested_total", len(result["cards"]))
+        metrics.inc("harvest_bytes_total", len(payload))
+        metrics.inc("cards_pruned_total", result["pruned"])
+        metrics.set_gauge("dom_nodes", result["nodes"])
+        return result["cards"]
+
+    def count_cards(self) -> int:
+        """
+        读取浏览器内增量维护的卡片计数（单次 execute_script，不扫描DOM）
+        
+        Returns:
+            页面已加载的不同工具数量（按卡片链接地址去重，重新渲染的卡片不重复计数）
+        """
+        script = "return window.__toolHarvest ? window.__toolHarvest.count() : null"
+        count = self.driver.execute_script(script)
+        if count is None:
+            # 页面导航后脚本丢失，重新注入
+            self._inject_scripts()
+            count = self.driver.execute_script(script)
+        return count
+
+    def _harvest(self, on_batch: Optional[Callable[[List[Dict]], None]]):
+        """提取新增卡片并交给回调处理"""
+        if on_batch is None:
+            return
+        try:
+            cards = self.harvest_new_cards()
+        except WebDriverException as e:
+            logger.warning(f"提取新增卡片失败: {str(e)}")
+            return
+        if cards:
+            logger.info(f"提取到 {len(cards)} 个新增卡片")
+            on_batch(cards)
+
+    def _content_marker(self):
+        """
+        获取当前页面高度和卡片计数，作为等待新内容的基准
+        
+        Returns:
+            (页面高度, 卡片数量)
+        """
+        return self.driver.execute_script(
+            "return [document.body.scrollHeight, window.__toolHarvest ? window.__toolHarvest.count() : 0]"
+        )
+
+    def wait_for_new_content(self, since: int = 0, timeout: Optional[float] = None) -> Dict:
+        """
+        事件驱动地等待新内容加载，替代固定时长的 sleep
+        
+        新卡片节点出现且DOM和网络请求静默后立即返回；没有新内容时在网络空闲后返回；
+        DOM持续变化（轮播、计时器等）时最多多等 wait_settle_time 秒；最长等待 timeout 秒。
+        
+        Args:
+            since: 等待开始前的卡片数量，见 _content_marker
+            timeout: 超时上限（秒），默认使用 SCRAPER_CONFIG["wait_timeout"]
+            
+        Returns:
+            包含 status（loaded/idle/timeout/missing）、added、elapsed 的字典
+        """
+        if timeout is None:
+            timeout = SCRAPER_CONFIG["wait_timeout"]
+        start = time.monotonic()
+        result = self.driver.execute_async_script(
+            WAIT_SCRIPT,
+            since,
+            int(timeout * 1000),
+            int(SCRAPER_CONFIG["wait_quiet_time"] * 1000),
+            int(SCRAPER_CONFIG["wait_idle_time"] * 1000),
+            int(SCRAPER_CONFIG["wait_settle_time"] * 1000)
+        )
+        if result is None:
+            # 页面导航后监视脚本丢失，重新注入
+            self._inject_scripts()
+            result = {"status": "missing", "added": 0}
+        
+        elapsed = time.monotonic() - start
+        result["elapsed"] = elapsed
+        self._wait_times.append(elapsed)
+        metrics.observe("browser_wait_seconds", elapsed, {"status": result["status"]})
+        logger.info(
+            f"等待新内容耗时 {elapsed:.2f}s（状态: {result['status']}，新增节点: {result['added']}，"
+            f"上限: {timeout}s）"
+        )
+        return result
+
     def _wait_for_content(self):
         """等待内容加载并返回找到的卡片数量"""
         try:
             # 等待任意工具卡片出现
-            self.wait.until(lambda d: len(d.find_elements(By.XPATH, "//div[.//a and .//p]")) > 0)
-            cards = self.driver.find_elements(By.XPATH, "//div[.//a and .//p]")
-            logger.info(f"找到 {len(cards)} 个可能的工具卡片")
-            return len(cards)
+            self.wait.until(lambda d: self.count_cards() > 0)
+            count = self.count_cards()
+            logger.info(f"找到 {count} 个工具卡片")
+            return count
         except TimeoutException:
             logger.warning("等待内容加载超时")
             return 0
@@ -111,73 +589,158 @@ class BrowserManager:
     def refresh_page(self):
         """刷新当前页面"""
         self.driver.refresh()
-        time.sleep(SCRAPER_CONFIG["scroll_pause_time"])
+        self._inject_scripts()
+        self.wait_for_new_content(timeout=SCRAPER_CONFIG["load_wait_time"])
         logger.info("页面已刷新")
         self._wait_for_content()
 
+    def _click_load_more(self) -> Optional[Dict]:
+        """
+        点击"加载更多"按钮（如果存在）并等待新内容
+
+        用一次脚本查找按钮：页面没有按钮时立即返回，不会像 find_element 那样等待隐式等待时间。
+
+        Returns:
+            wait_for_new_content 的结果；没有可见的按钮或点击失败时返回None
+        """
+        try:
+            load_more = self.driver.execute_script(LOAD_MORE_SCRIPT)
+            if load_more is None:
+                return None
+            _, marker = self._content_marker()
+            load_more.click()
+        except WebDriverException as e:
+            logger.warning(f"点击加载更多按钮失败: {str(e)}")
+            return None
+        logger.info("点击了加载更多按钮")
+        return self.wait_for_new_content(since=marker)
+
+    @metrics.timed("browser_scroll_seconds")
     def scroll_to_bottom(self):
         """
-        使用JavaScript滚动到页面底部并等待新内容加载
+        使用JavaScript滚动到页面底部并等待新内容加载，把结果交给自适应滚动控制器
         返回是否成功加载新内容
         """
+        loaded, elapsed = self._scroll_batch()
+        if elapsed is not None:
+            self.scroll_control.record(loaded, elapsed)
+        return loaded
+
+    def _scroll_batch(self):
+        """
+        滚动到页面底部并等待新内容加载（不记录到控制器）
+        
+        Returns:
+            (是否加载到新内容, 等待耗时（秒）)；滚动出错时耗时为None
+        """
         try:
             # 获取当前工具卡片数量
-            initial_cards = len(self.driver.find_elements(By.XPATH, "//div[.//a and .//p]"))
-            initial_height = self.driver.execute_script("return document.body.scrollHeight")
+            initial_height, initial_cards = self._content_marker()
             
-            # 使用注入的自动滚动脚本
-            self.driver.execute_script("return window.autoScroll(100, 50)")  # 每50ms滚动100px
-            time.sleep(SCRAPER_CONFIG["scroll_pause_time"])
+            # 使用注入的自动滚动脚本，每 interval 毫秒滚动 step 像素
+            control = self.scroll_control
+            self.driver.execute_script("return window.autoScroll(arguments[0], arguments[1])", control.step, control.interval)
             
             # 等待新内容加载
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            new_cards = len(self.driver.find_elements(By.XPATH, "//div[.//a and .//p]"))
+            result = self.wait_for_new_content(since=initial_cards)
+            new_height, new_cards = self._content_marker()
+            self.blocker.collect()
             
             # 检查是否加载了新内容
-            if new_height > initial_height or new_cards > initial_cards:
+            loaded = new_height > initial_height or new_cards > initial_cards
+            if loaded:
                 logger.info(f"成功加载新内容，当前工具数量: {new_cards}")
-                return True
             else:
                 logger.info("没有加载到新内容")
-                return False
+            return loaded, result["elapsed"]
                 
         except Exception as e:
             logger.error(f"页面滚动失败: {str(e)}")
-            return False
+            return False, None
+
+    def _load_round(self) -> bool:
+        """
+        加载一轮新内容：网站限流时先停顿，再点击"加载更多"按钮（如果存在）并滚动到底部
+        
+        Returns:
+            是否加载到新内容
+        """
+        # 网站限流时在批次之间停顿
+        if self.scroll_control.pause:
+            time.sleep(self.scroll_control.pause)
+        
+        # 尝试点击"加载更多"按钮（如果存在），再滚动并检查是否有新内容
+        clicked = self._click_load_more()
+        clicked_loaded = clicked is not None and clicked["status"] == "loaded"
+        scrolled_loaded, scroll_elapsed = self._scroll_batch()
+        
+        # 每轮只记录一次结果：按钮已加载新内容时，紧随其后的滚动没有新内容不算失败；
+        # 耗时取实际加载到新内容的那次等待
+        loaded = clicked_loaded or scrolled_loaded
+        elapsed = clicked["elapsed"] if clicked_loaded else scroll_elapsed
+        if elapsed is not None:
+            self.scroll_control.record(loaded, elapsed)
+        return loaded
+
+    def fast_forward(self, url: str, limit: int) -> bool:
+        """
+        续抓时快速滚动到上次保存的最后一个工具：滚动期间不提取卡片、不经过处理管道，
+        加载到该工具的卡片后把提取位置移到它之后，之前的卡片（上次已保存）不再提取
+        
+        Args:
+            url: 上次保存的最后一个工具URL
+            limit: 页面卡片数量超过该值仍未找到时放弃（该工具可能已下架）
+            
+        Returns:
+            是否找到；未找到时提取位置不变，之后从原位置继续提取，不会漏掉卡片
+        """
+        script = "return window.__toolHarvest ? window.__toolHarvest.skipPast(arguments[0]) : null"
+        no_new_content_count = 0
+        while True:
+            try:
+                cursor = self.driver.execute_script(script, url)
+            except WebDriverException as e:
+                logger.warning(f"快速滚动定位失败: {str(e)}")
+                return False
+            if cursor is not None:
+                self.harvest_cursor = cursor
+                logger.info(f"已快速滚动到上次保存的工具 {url}，跳过 {cursor} 个卡片")
+                return True
+            if no_new_content_count >= 2 or self.count_cards() > limit:
+                logger.warning(f"快速滚动未找到上次保存的工具 {url}，从当前位置继续提取")
+                return False
+            no_new_content_count = 0 if self._load_round() else no_new_content_count + 1
 
-    def scroll_until_count(self, target_count):
+    def scroll_until_count(self, target_count, on_batch: Optional[Callable[[List[Dict]], None]] = None,
+                           stop: Optional[Callable[[], bool]] = None):
         """
         持续滚动直到达到目标工具数量或无法加载更多
         
         Args:
             target_count: 目标工具数量
+            on_batch: 可选回调，每次滚动后接收浏览器内提取的新增卡片原始字段，
+                用于边滚动边解析和保存
+            stop: 可选回调，每批卡片处理后调用，返回True时提前停止滚动（如增量抓取遇到已保存的工具）
             
         Returns:
-            bool: 是否达到目标数量
+            bool: 是否达到目标数量（提前停止时视为已达到）
         """
         retry_count = 0
         no_new_content_count = 0
         
         while retry_count < SCRAPER_CONFIG["max_retries"]:
             try:
-                current_count = len(self.driver.find_elements(By.XPATH, "//div[.//a and .//p]"))
+                self._harvest(on_batch)
+                if stop is not None and stop():
+                    return True
+                current_count = self.count_cards()
                 logger.info(f"当前已加载工具数量: {current_count}")
                 
                 if current_count >= target_count:
                     logger.info(f"已达到目标工具数量: {current_count}")
                     return True
                 
-                # 尝试点击"加载更多"按钮（如果存在）
-                try:
-                    load_more = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Load More') or contains(text(), '加载更多')]")
-                    load_more.click()
-                    time.sleep(SCRAPER_CONFIG["scroll_pause_time"])
-                    logger.info("点击了加载更多按钮")
-                except:
-                    pass
-                
-                # 滚动并检查是否有新内容
-                if self.scroll_to_bottom():
+                if self._load_round():
                     no_new_content_count = 0
                 else:
                     no_new_content_count += 1
@@ -189,8 +752,6 @@ class BrowserManager:
                     no_new_content_count = 0
                     retry_count += 1
                 
-                time.sleep(SCRAPER_CONFIG["scroll_pause_time"])
-                
             except Exception as e:
                 retry_count += 1
                 logger.warning(f"滚动加载失败，重试 ({retry_count}/{SCRAPER_CONFIG['max_retries']}): {str(e)}")
@@ -201,7 +762,8 @@ class BrowserManager:
                     logger.error("达到最大重试次数，停止滚动")
                     break
         
-        final_count = len(self.driver.find_elements(By.XPATH, "//div[.//a and .//p]"))
+        self._harvest(on_batch)
+        final_count = self.count_cards()
         return final_count >= target_count
 
     def wait_for_element(self, by, value, timeout=None):
@@ -218,7 +780,24 @@ class BrowserManager:
 
     def quit(self):
         """关闭浏览器并清理资源"""
+        if self._wait_times:
+            logger.info(
+                f"共等待 {len(self._wait_times)} 次，合计 {sum(self._wait_times):.1f}s，"
+                f"平均 {sum(self._wait_times) / len(self._wait_times):.2f}s"
+            )
         if self.driver:
+            # 关闭前采样一次，记录Chrome内存
+            metrics.sample_resources()
+            metrics.untrack_process(self.driver.service.process.pid)
+            if self.blocker:
+                self.blocker.collect()
+                self.blocker.log_summary()
+            if self.attached:
+                # 只关闭自己的标签页；连接模式下 quit 只结束chromedriver，常驻浏览器继续运行
+                try:
+                    self.driver.close()
+                except WebDriverException as e:
+                    logger.debug(f"关闭标签页失败: {str(e)}")
             self.driver.quit()
             logger.info("浏览器已关闭")
             self.driver = None
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+检查点模块，定期把抓取进度原子地写入本地状态文件，用于崩溃后续抓
+"""
+from datetime import datetime
+from loguru import logger
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import json
+import threading
+import time
+import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CHECKPOINT_PATH, SCRAPER_CONFIG
+
+# 来源的抓取状态
+PENDING, IN_PROGRESS, DONE = "pending", "in_progress", "done"
+
+
+class CrawlCheckpoint:
+    """
+    抓取检查点，按来源（入口URL）记录抓取状态、已提取的卡片位置和最后保存的工具URL（续抓游标）
+
+    每次保存前先把写入器缓冲区写入存储，保证检查点记录的URL对应的工具都已落盘。
+    """
+
+    def __init__(self, path: Optional[Path] = None, interval: Optional[float] = None,
+                 state: Optional[Dict] = None):
+        """
+        初始化检查点
+
+        Args:
+            path: 状态文件路径，默认使用 CHECKPOINT_PATH
+            interval: 两次自动保存的最短间隔（秒），默认使用 SCRAPER_CONFIG["checkpoint_interval"]
+            state: 从状态文件读取的已有状态，为空时开始新的抓取
+        """
+        self.path = Path(path or CHECKPOINT_PATH)
+        self.interval = interval if interval is not None else SCRAPER_CONFIG["checkpoint_interval"]
+        self.state = state or {
+            "version": 1,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "updated_at": None,
+            "sources": {},
+        }
+        self._lock = threading.Lock()
+        self._last_save = time.monotonic()
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> Optional["CrawlCheckpoint"]:
+        """
+        读取状态文件
+
+        Returns:
+            检查点，文件不存在或损坏时返回None
+        """
+        path = Path(path or CHECKPOINT_PATH)
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"检查点文件损坏，忽略: {path}: {str(e)}")
+            return None
+        return cls(path, state=state)
+
+    def _record_locked(self, url: str) -> Dict:
+        record = self.state["sources"].setdefault(url, {})
+        # 旧版本检查点中按页面顺序记录的全部URL不再使用
+        record.pop("urls", None)
+        for key, value in (("status", PENDING), ("cards", 0), ("last_url", "")):
+            record.setdefault(key, value)
+        return record
+
+    def source(self, url: str) -> Dict:
+        """
+        获取来源的进度记录（副本）
+
+        Returns:
+            包含 status、cards（本次会话已提取的卡片位置）和 last_url（按页面顺序最后保存的工具URL，
+            续抓时快速滚动到该工具）的字典
+        """
+        with self._lock:
+            return dict(self._record_locked(url))
+
+    def is_done(self, url: str) -> bool:
+        """来源是否已抓取完成"""
+        return self.source(url)["status"] == DONE
+
+    def update(self, url: str, **fields):
+        """更新来源的进度记录"""
+        with self._lock:
+            self._record_locked(url).update(fields)
+
+    def finish(self, url: str):
+        """标记来源抓取完成并立即保存"""
+        self.update(url, status=DONE)
+        self.save()
+
+    def tracker(self, url: str, sink) -> Callable[[int, List[str]], None]:
+        """
+        创建进度回调，交给 StreamingPipeline 的 on_progress
+
+        Args:
+            url: 来源URL
+            sink: 去重写入器，保存检查点前先写入其缓冲区
+
+        Returns:
+            接收已处理卡片位置和本批工具URL的回调，按 interval 节流保存
+        """
+        def on_progress(cursor: int, urls: List[str]):
+            with self._lock:
+                record = self._record_locked(url)
+                record["status"] = IN_PROGRESS
+                # 续抓时先重新提取列表顶部新发布的工具，它们位于上次的游标之前，不回退游标
+                if cursor >= record["cards"]:
+                    record["cards"] = cursor
+                    if urls:
+                        record["last_url"] = urls[-1]
+            if time.monotonic() - self._last_save >= self.interval:
+                sink.flush()
+                self.save()
+        return on_progress
+
+    def save(self) -> bool:
+        """
+        原子地写入状态文件：先写临时文件并同步到磁盘，再替换原文件
+
+        Returns:
+            保存是否成功
+        """
+        try:
+            with self._lock:
+                self.state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+                payload = json.dumps(self.state, ensure_ascii=False, indent=1)
+                os.makedirs(self.path.parent, exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+                self._last_save = time.monotonic()
+            logger.debug(f"已保存检查点: {self.path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"保存检查点失败: {str(e)}")
+            return False
+
+    def clear(self):
+        """所有来源完成后删除状态文件"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+            logger.info("抓取完成，已删除检查点")
@@ -0,0 +1,195 @@
+"""
+详情页抓取模块，使用asyncio并发获取工具详情页并补全分类、日期等字段
+"""
+import aiohttp
+import asyncio
+from loguru import logger
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+import random
+import threading
+import time
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CACHE_CONFIG, DETAIL_CONFIG, HTTP_CONFIG
+from scraper.http_cache import PageCache, default_cache
+from scraper.metrics import metrics
+from scraper.parser import ToolParser
+
+# 详情页可以补全的字段
+DETAIL_FIELDS = ('description', 'category', 'added_date')
+
+
+class TokenBucket:
+    """令牌桶限速器，控制对单个主机的请求速率"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒补充的令牌数
+            capacity: 桶容量（允许的突发请求数）
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        # 令牌桶可能被多个线程中的事件循环共享
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """
+        尝试取出一个令牌
+
+        Returns:
+            需要等待的秒数，0表示已取得令牌
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        """等待直到取得一个令牌"""
+        while True:
+            delay = self._take()
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+
+class DetailCrawler:
+    """工具详情页并发抓取器"""
+
+    def __init__(self, concurrency: Optional[int] = None, rate_per_host: Optional[float] = None,
+                 cache: Optional[PageCache] = None):
+        """
+        初始化详情页抓取器
+
+        Args:
+            concurrency: 最大并发请求数，默认使用 DETAIL_CONFIG["concurrency"]
+            rate_per_host: 每个主机每秒的请求数，默认使用 DETAIL_CONFIG["rate_per_host"]
+            cache: 可选的页面缓存，默认使用全局共享缓存
+        """
+        self.concurrency = concurrency or DETAIL_CONFIG["concurrency"]
+        self.rate_per_host = rate_per_host or DETAIL_CONFIG["rate_per_host"]
+        self.cache = cache if cache is not None else default_cache()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._buckets_lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate_per_host, DETAIL_CONFIG["burst"])
+            return self._buckets[host]
+
+    def enrich(self, tools: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        抓取详情页并原地补全工具信息中为空的描述、分类和日期
+
+        Args:
+            tools: 工具信息列表
+
+        Returns:
+            补全后的工具信息列表（与传入的列表为同一对象）
+        """
+        pending = [
+            tool for tool in tools
+            if any(not tool.get(field) for field in DETAIL_FIELDS)
+        ]
+        if pending:
+            asyncio.run(self._enrich_all(pending))
+        return tools
+
+    async def _enrich_all(self, tools: List[Dict[str, str]]):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=DETAIL_CONFIG["timeout"])
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        headers = {"User-Agent": HTTP_CONFIG["user_agent"]}
+        start = time.monotonic()
+
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector, headers=headers) as session:
+            results = await asyncio.gather(*(
+                self._enrich_one(session, semaphore, tool) for tool in tools
+            ))
+
+        elapsed = time.monotonic() - start
+        rate = len(tools) / elapsed if elapsed else 0.0
+        logger.info(
+            f"抓取 {len(tools)} 个详情页，补全 {sum(results)} 个工具，"
+            f"耗时 {elapsed:.1f}s（{rate:.2f} 页/秒，并发 {self.concurrency}）"
+        )
+
+    async def _enrich_one(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                          tool: Dict[str, str]) -> bool:
+        """
+        抓取单个详情页并补全字段
+
+        Returns:
+            是否补全了至少一个字段
+        """
+        async with semaphore:
+            html_content = await self._fetch(session, tool['url'])
+        if html_content is None:
+            return False
+
+        details = ToolParser.parse_detail_page(html_content)
+        enriched = False
+        for field in DETAIL_FIELDS:
+            if not tool.get(field) and details.get(field):
+                tool[field] = details[field]
+                enriched = True
+        return enriched
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        """
+        按主机限速获取页面，遇到连接错误、429和5xx时指数退避重试；有缓存时发送条件请求
+        （缓存的磁盘读写放到线程中执行，不阻塞事件循环）
+
+        Returns:
+            页面HTML，失败（或回放模式下没有缓存）返回None
+        """
+        entry = await asyncio.to_thread(self.cache.get, url) if self.cache is not None else None
+        if entry is not None and (CACHE_CONFIG["replay"] or self.cache.is_fresh(entry)):
+            metrics.inc("http_cache_total", labels={"result": "hit"})
+            return PageCache.text(entry)
+        if CACHE_CONFIG["replay"]:
+            return None
+
+        bucket = self._bucket(urlsplit(url).netloc)
+        for attempt in range(DETAIL_CONFIG["max_retries"] + 1):
+            await bucket.acquire()
+            try:
+                async with session.get(url, headers=PageCache.conditional_headers(entry)) as response:
+                    if response.status == 304 and entry is not None:
+                        await asyncio.to_thread(self.cache.touch, url)
+                        metrics.inc("http_cache_total", labels={"result": "revalidated"})
+                        return PageCache.text(entry)
+                    if response.status == 429 or response.status >= 500:
+                        error = f"HTTP {response.status}"
+                    elif response.status >= 400:
+                        logger.debug(f"详情页不可用: {url}: HTTP {response.status}")
+                        return None
+                    else:
+                        html_content = await response.text()
+                        if self.cache is not None:
+                            body = await response.read()
+                            await asyncio.to_thread(self.cache.put, url, body, response.headers)
+                            metrics.inc("http_cache_total", labels={"result": "miss"})
+                        return html_content
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = str(e) or type(e).__name__
+
+            if attempt < DETAIL_CONFIG["max_retries"]:
+                delay = DETAIL_CONFIG["backoff_factor"] * (2 ** attempt)
+                await asyncio.sleep(delay + random.uniform(0, delay))
+        logger.warning(f"详情页抓取失败: {url}: {error}")
+        return None
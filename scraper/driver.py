@@ -0,0 +1,265 @@
+"""
+Chrome驱动解析和常驻浏览器管理模块
+
+chromedriver 路径解析一次后缓存到本地，之后启动无需联网检查版本；
+常驻浏览器以远程调试模式长期运行，BrowserManager 连接后在新标签页中工作，跳过Chrome冷启动。
+"""
+from datetime import datetime
+from loguru import logger
+from pathlib import Path
+from typing import Dict, Optional
+import json
+import shutil
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+import os
+
+try:
+    import psutil
+except ImportError:  # 未安装时无法核对常驻浏览器的进程
+    psutil = None
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import BROWSER_CONFIG, CHROME_DAEMON_STATE, DRIVER_CACHE
+
+# 启动Chrome的通用参数（BrowserManager 和常驻浏览器共用）
+CHROME_ARGUMENTS = (
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--window-size=1920,1080",
+    "--disable-notifications",
+    "--disable-popup-blocking",
+)
+CHROME_NAMES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+
+def _read_json(path) -> Optional[Dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data: Dict):
+    """原子地写入JSON文件"""
+    os.makedirs(Path(path).parent, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def resolve_driver_path(refresh: bool = False) -> str:
+    """
+    解析chromedriver路径
+
+    优先使用 BROWSER_CONFIG["driver_path"]，其次使用本地缓存；都没有时通过 webdriver_manager
+    解析（需要联网）并写入缓存。
+
+    Args:
+        refresh: 忽略缓存重新解析（缓存的驱动与Chrome版本不匹配时使用）
+
+    Returns:
+        chromedriver可执行文件路径
+    """
+    if BROWSER_CONFIG["driver_path"]:
+        return str(BROWSER_CONFIG["driver_path"])
+
+    if not refresh:
+        cached = _read_json(DRIVER_CACHE)
+        if cached and os.access(cached.get("path", ""), os.X_OK):
+            return cached["path"]
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager().install()
+    try:
+        _write_json(DRIVER_CACHE, {"path": path, "resolved_at": datetime.now().isoformat(timespec="seconds")})
+        logger.info(f"已解析并缓存chromedriver路径: {path}")
+    except OSError as e:
+        logger.warning(f"写入chromedriver缓存失败: {str(e)}")
+    return path
+
+
+def find_chrome_binary() -> Optional[str]:
+    """返回配置的Chrome路径，未配置时在PATH中查找"""
+    if BROWSER_CONFIG["chrome_binary"]:
+        return str(BROWSER_CONFIG["chrome_binary"])
+    for name in CHROME_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def _debugger_ready(address: str, timeout: float = 1.0) -> bool:
+    """检查远程调试接口是否可用"""
+    try:
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=timeout) as response:
+            return response.status == 200
+    except (OSError, ValueError):
+        return False
+
+
+def _is_debugger_process(pid: int, port: int) -> bool:
+    """检查进程是否为监听指定远程调试端口的Chrome主进程（渲染等子进程带 --type 参数）"""
+    try:
+        cmdline = psutil.Process(pid).cmdline()
+    except psutil.Error:
+        return False
+    return f"--remote-debugging-port={port}" in cmdline and not any(arg.startswith("--type=") for arg in cmdline)
+
+
+def _find_debugger_pid(port: int) -> Optional[int]:
+    """
+    查找监听指定远程调试端口的Chrome主进程
+
+    Args:
+        port: 远程调试端口
+
+    Returns:
+        进程PID；未安装 psutil 或找不到时返回None
+    """
+    if psutil is None:
+        return None
+    for process in psutil.process_iter(["pid"]):
+        if _is_debugger_process(process.info["pid"], port):
+            return process.info["pid"]
+    return None
+
+
+def _write_state(pid: Optional[int], address: str, profile_dir: Optional[Path]):
+    _write_json(CHROME_DAEMON_STATE, {
+        "pid": pid,
+        "address": address,
+        "profile_dir": str(profile_dir) if profile_dir else None,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+    })
+
+
+def running_daemon() -> Optional[Dict]:
+    """
+    查找正在运行的常驻浏览器
+
+    Returns:
+        常驻浏览器信息（pid、address等）；没有启动或已退出时返回None
+    """
+    state = _read_json(CHROME_DAEMON_STATE)
+    if state and _debugger_ready(state["address"]):
+        return state
+    return None
+
+
+def start_chrome_daemon(port: Optional[int] = None, profile_dir: Optional[Path] = None) -> Optional[str]:
+    """
+    启动常驻Chrome（远程调试模式），进程与当前程序分离，程序退出后继续运行
+
+    Args:
+        port: 远程调试端口，默认使用 BROWSER_CONFIG["daemon_port"]
+        profile_dir: 用户数据目录，默认使用 BROWSER_CONFIG["daemon_profile_dir"]
+
+    Returns:
+        远程调试地址；启动失败返回None
+    """
+    port = port or BROWSER_CONFIG["daemon_port"]
+    address = f"127.0.0.1:{port}"
+    if _debugger_ready(address):
+        # 端口上已有浏览器（如状态文件丢失或由其他方式启动）：记录状态，使 --stop-browser-daemon 能找到它
+        state = _read_json(CHROME_DAEMON_STATE)
+        if not (state and state.get("address") == address):
+            _write_state(_find_debugger_pid(port), address, None)
+        logger.info(f"常驻浏览器已在运行: {address}")
+        return address
+
+    binary = find_chrome_binary()
+    if binary is None:
+        logger.error("未找到Chrome可执行文件，请设置 BROWSER_CONFIG['chrome_binary']")
+        return None
+
+    profile_dir = Path(profile_dir or BROWSER_CONFIG["daemon_profile_dir"])
+    os.makedirs(profile_dir, exist_ok=True)
+    args = [
+        binary,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={profile_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        *CHROME_ARGUMENTS,
+    ]
+    if BROWSER_CONFIG["headless"]:
+        args.append("--headless")
+
+    try:
+        process = subprocess.Popen(
+            args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError as e:
+        logger.error(f"启动常驻浏览器失败: {str(e)}")
+        return None
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if _debugger_ready(address):
+            _write_state(process.pid, address, profile_dir)
+            logger.info(f"常驻浏览器已启动: {address}（PID {process.pid}）")
+            return address
+        if process.poll() is not None:
+            logger.error(f"常驻浏览器启动后立即退出，返回码 {process.returncode}")
+            return None
+        time.sleep(0.2)
+
+    logger.error(f"等待常驻浏览器远程调试接口超时: {address}")
+    process.terminate()
+    return None
+
+
+def stop_chrome_daemon() -> bool:
+    """
+    关闭常驻浏览器
+
+    Returns:
+        是否成功关闭（没有运行中的常驻浏览器时也返回True）
+    """
+    state = _read_json(CHROME_DAEMON_STATE)
+    if not state:
+        logger.info("没有运行中的常驻浏览器")
+        return True
+    if not _debugger_ready(state["address"]):
+        # 浏览器已退出，记录的PID可能已被其他进程复用，不发送信号
+        _remove_state()
+        logger.info("常驻浏览器已不在运行，已清除状态文件")
+        return True
+
+    pid = state.get("pid")
+    if psutil is not None:
+        port = int(state["address"].rsplit(":", 1)[1])
+        if pid is None or not _is_debugger_process(pid, port):
+            pid = _find_debugger_pid(port)
+    if pid is None:
+        logger.error(f"无法确定常驻浏览器的进程（{state['address']}），请手动关闭")
+        return False
+
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+    except OSError as e:
+        logger.error(f"关闭常驻浏览器失败: {str(e)}")
+        return False
+
+    _remove_state()
+    logger.info(f"常驻浏览器已关闭（PID {pid}）")
+    return True
+
+
+def _remove_state():
+    try:
+        os.remove(CHROME_DAEMON_STATE)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,181 @@
+"""
+HTTP抓取模块，优先使用纯HTTP请求获取服务端渲染的页面或JSON接口
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+from loguru import logger
+from typing import Dict, List, Optional
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CACHE_CONFIG, HTTP_CONFIG, SCRAPER_CONFIG
+from scraper.http_cache import RENDERED_SUFFIX, PageCache, default_cache
+from scraper.metrics import metrics
+from scraper.parser import ToolParser
+
+
+class HttpFetcher:
+    """基于连接池Session的HTTP抓取器，支持keep-alive、自动重试、gzip压缩和条件请求缓存"""
+
+    def __init__(self, session: Optional[requests.Session] = None, cache: Optional[PageCache] = None):
+        """
+        初始化HTTP抓取器
+
+        Args:
+            session: 可选的自定义Session，默认按 HTTP_CONFIG 创建
+            cache: 可选的页面缓存，默认使用全局共享缓存（CACHE_CONFIG["enabled"] 为False时不缓存）
+        """
+        self.session = session or self._create_session()
+        self.cache = cache if cache is not None else default_cache()
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """创建带连接池和重试策略的Session"""
+        retry = Retry(
+            total=HTTP_CONFIG["max_retries"],
+            backoff_factor=HTTP_CONFIG["backoff_factor"],
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD"),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_CONFIG["pool_maxsize"],
+            pool_maxsize=HTTP_CONFIG["pool_maxsize"],
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "User-Agent": HTTP_CONFIG["user_agent"],
+            "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
+        })
+        return session
+
+    @staticmethod
+    def _cached_response(entry: Dict) -> requests.Response:
+        """把缓存的页面包装成响应对象"""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = entry["url"]
+        response._content = entry["body"]
+        if entry["content_type"]:
+            response.headers["Content-Type"] = entry["content_type"]
+        response.encoding = get_encoding_from_headers(response.headers)
+        return response
+
+    def fetch(self, url: str) -> Optional[requests.Response]:
+        """
+        获取指定URL的响应；有缓存时发送条件请求，内容未变化（304）时直接使用缓存
+
+        Args:
+            url: 页面或接口地址
+
+        Returns:
+            成功时返回响应对象，失败（或回放模式下没有缓存）返回None
+        """
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None and (CACHE_CONFIG["replay"] or self.cache.is_fresh(entry)):
+            metrics.inc("http_cache_total", labels={"result": "hit"})
+            return self._cached_response(entry)
+        if CACHE_CONFIG["replay"]:
+            logger.warning(f"回放模式下缓存中没有该页面: {url}")
+            return None
+
+        try:
+            with metrics.timer("http_fetch_seconds"):
+                response = self.session.get(
+                    url, headers=PageCache.conditional_headers(entry), timeout=HTTP_CONFIG["timeout"]
+                )
+            if response.status_code == 304 and entry is not None:
+                self.cache.touch(url)
+                metrics.inc("http_requests_total", labels={"result": "not_modified"})
+                metrics.inc("http_cache_total", labels={"result": "revalidated"})
+                return self._cached_response(entry)
+            response.raise_for_status()
+            metrics.inc("http_requests_total", labels={"result": "ok"})
+            metrics.inc("http_bytes_total", len(response.content))
+            if self.cache is not None:
+                self.cache.put(url, response.content, response.headers)
+                metrics.inc("http_cache_total", labels={"result": "miss"})
+            return response
+        except requests.RequestException as e:
+            metrics.inc("http_requests_total", labels={"result": "error"})
+            logger.warning(f"HTTP请求失败: {url}: {str(e)}")
+            return None
+
+    def fetch_tools(self, url: str, min_cards: Optional[int] = None) -> Optional[List[Dict[str, str]]]:
+        """
+        通过HTTP获取并解析工具信息
+
+        Args:
+            url: 列表页或JSON接口地址
+            min_cards: 至少需要解析到的工具数量，默认使用 HTTP_CONFIG["min_cards"]，
+                未配置时使用目标数量 SCRAPER_CONFIG["target_tools"]（首屏只有少量卡片的无限滚动页面回退到浏览器）
+
+        Returns:
+            工具信息列表；请求失败或工具数量不足（需要回退到浏览器渲染）时返回None
+        """
+        if min_cards is None:
+            min_cards = HTTP_CONFIG["min_cards"] or SCRAPER_CONFIG["target_tools"]
+        response = self.fetch(url)
+        if response is None:
+            return None
+
+        tools = self._parse_response(url, response)
+        if tools is None:
+            return None
+
+        if len(tools) < min_cards:
+            logger.info(f"HTTP响应中只有 {len(tools)} 个工具（需要 {min_cards} 个），回退到浏览器渲染: {url}")
+            return None
+
+        logger.info(f"通过HTTP获取 {len(tools)} 个工具（{len(response.content)} 字节）: {url}")
+        return tools
+
+    @staticmethod
+    def _parse_response(url: str, response: requests.Response) -> Optional[List[Dict[str, str]]]:
+        """按 Content-Type 解析JSON接口或HTML页面，JSON无效时返回None"""
+        content_type = response.headers.get("Content-Type", "")
+        if "json" in content_type:
+            try:
+                payload = response.json()
+            except ValueError as e:
+                logger.warning(f"JSON解析失败: {url}: {str(e)}")
+                return None
+            return ToolParser.parse_json_tools(
+                payload,
+                HTTP_CONFIG["json_fields"],
+                HTTP_CONFIG["json_items_key"]
+            )
+        return ToolParser.parse_tool_cards(response.text)
+
+    def replay_tools(self, url: str) -> List[Dict[str, str]]:
+        """
+        从缓存解析工具信息，不访问网络；优先使用浏览器渲染后的页面
+
+        Args:
+            url: 列表页或JSON接口地址
+
+        Returns:
+            工具信息列表，缓存中没有该页面时为空列表
+        """
+        if self.cache is None:
+            logger.warning("页面缓存未启用，无法回放")
+            return []
+        entry = self.cache.get(url + RENDERED_SUFFIX) or self.cache.get(url)
+        if entry is None:
+            logger.warning(f"缓存中没有该页面: {url}")
+            return []
+        tools = self._parse_response(url, self._cached_response(entry)) or []
+        logger.info(f"从缓存解析 {len(tools)} 个工具（{len(entry['body'])} 字节）: {url}")
+        return tools
+
+    def close(self):
+        """关闭Session并释放连接池"""
+        self.session.close()
@@ -0,0 +1,245 @@
+"""
+页面缓存模块：按URL在磁盘上保存响应内容及 ETag/Last-Modified，再次请求时发送条件请求，
+总大小超过上限时按最近访问时间（LRU）淘汰；回放模式下直接读取缓存，不访问网络
+"""
+from loguru import logger
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CACHE_CONFIG, HTTP_CACHE_DIR
+from scraper.metrics import metrics
+
+# 浏览器渲染后的页面与HTTP响应分开缓存；URL片段不会发送给服务器，不会与真实URL冲突
+RENDERED_SUFFIX = "#rendered"
+
+
+class PageCache:
+    """
+    基于SQLite索引和内容文件的页面缓存，线程安全
+
+    内容总大小在内存中维护，写入时不重新统计；读取只在内存中记录访问时间，
+    淘汰前（和关闭时）才批量写回索引，命中缓存不产生数据库写入。
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: Optional[int] = None,
+                 fresh_seconds: Optional[float] = None):
+        """
+        打开（或创建）页面缓存
+
+        Args:
+            root: 缓存目录，默认使用 HTTP_CACHE_DIR
+            max_bytes: 缓存内容总大小上限，默认使用 CACHE_CONFIG["max_bytes"]
+            fresh_seconds: 缓存在该时长内视为新鲜、不再重新验证，默认使用 CACHE_CONFIG["fresh_seconds"]
+        """
+        self.root = Path(root or HTTP_CACHE_DIR)
+        self.max_bytes = max_bytes or CACHE_CONFIG["max_bytes"]
+        self.fresh_seconds = CACHE_CONFIG["fresh_seconds"] if fresh_seconds is None else fresh_seconds
+        os.makedirs(self.root / "bodies", exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.root / "index.sqlite3"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, key TEXT NOT NULL, etag TEXT, last_modified TEXT, content_type TEXT, "
+            "size INTEGER NOT NULL, fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        # 尚未写回索引的最近访问时间
+        self._accessed: Dict[str, float] = {}
+
+    def _body_path(self, key: str) -> Path:
+        return self.root / "bodies" / key[:2] / key
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    @property
+    def size_bytes(self) -> int:
+        """缓存内容的总大小"""
+        with self._lock:
+            return self._total_bytes
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        读取缓存的页面，并记录最近访问时间（淘汰前写回索引）
+
+        Returns:
+            包含 url、body、etag、last_modified、content_type、fetched_at 的字典；未缓存时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, etag, last_modified, content_type, fetched_at, size FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            key, etag, last_modified, content_type, fetched_at, size = row
+            try:
+                with open(self._body_path(key), "rb") as f:
+                    body = f.read()
+            except OSError:
+                # 内容文件丢失，删除索引记录
+                with self._conn:
+                    self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self._total_bytes -= size
+                self._accessed.pop(url, None)
+                return None
+            self._accessed[url] = time.time()
+        return {
+            "url": url,
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": content_type,
+            "fetched_at": fetched_at,
+        }
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """缓存是否仍在新鲜期内（无需重新验证）"""
+        return time.time() - entry["fetched_at"] < self.fresh_seconds
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """根据缓存的 ETag/Last-Modified 生成条件请求头"""
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    @staticmethod
+    def text(entry: Dict) -> str:
+        """按 Content-Type 中的字符集解码缓存内容，默认UTF-8"""
+        match = re.search(r"charset=([\w-]+)", entry["content_type"] or "", re.IGNORECASE)
+        try:
+            return entry["body"].decode(match.group(1) if match else "utf-8", errors="replace")
+        except LookupError:
+            return entry["body"].decode("utf-8", errors="replace")
+
+    def put(self, url: str, body: bytes, headers: Mapping[str, str]) -> bool:
+        """
+        保存页面内容和验证信息，超过大小上限时淘汰最久未访问的页面
+
+        Args:
+            url: 页面URL
+            body: 响应内容
+            headers: 响应头（读取 ETag、Last-Modified、Content-Type）
+
+        Returns:
+            是否保存成功
+        """
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        path = self._body_path(key)
+        now = time.time()
+        try:
+            os.makedirs(path.parent, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            with self._lock:
+                os.replace(tmp_path, path)
+                previous = self._conn.execute("SELECT size FROM pages WHERE url = ?", (url,)).fetchone()
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO pages "
+                        "(url, key, etag, last_modified, content_type, size, fetched_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (url, key, headers.get("ETag"), headers.get("Last-Modified"),
+                         headers.get("Content-Type"), len(body), now, now)
+                    )
+                self._total_bytes += len(body) - (previous[0] if previous else 0)
+                self._accessed.pop(url, None)
+                self._evict_locked()
+            return True
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"写入页面缓存失败: {url}: {str(e)}")
+            return False
+
+    def touch(self, url: str):
+        """服务器确认内容未变化（304）后刷新缓存时间"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._accessed.pop(url, None)
+            self._conn.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+
+    def _flush_accessed_locked(self):
+        """把内存中记录的访问时间批量写回索引"""
+        if not self._accessed:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE pages SET accessed_at = ? WHERE url = ?",
+                [(accessed_at, url) for url, accessed_at in self._accessed.items()]
+            )
+        self._accessed.clear()
+
+    def _evict_locked(self):
+        """按最近访问时间淘汰页面，直到总大小不超过上限"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        self._flush_accessed_locked()
+        total = self._total_bytes
+        evicted = []
+        for url, key, size in self._conn.execute("SELECT url, key, size FROM pages ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._body_path(key))
+            except FileNotFoundError:
+                pass
+            evicted.append((url,))
+            total -= size
+        with self._conn:
+            self._conn.executemany("DELETE FROM pages WHERE url = ?", evicted)
+        self._total_bytes = total
+        metrics.inc("http_cache_evictions_total", len(evicted))
+        logger.debug(f"页面缓存淘汰 {len(evicted)} 个页面，当前 {total} 字节")
+
+    def close(self):
+        """写回访问时间并关闭索引数据库连接"""
+        with self._lock:
+            self._flush_accessed_locked()
+            self._conn.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache() -> Optional[PageCache]:
+    """
+    返回全局共享的页面缓存
+
+    Returns:
+        PageCache 实例；CACHE_CONFIG["enabled"] 为False时返回None
+    """
+    global _default_cache
+    if not CACHE_CONFIG["enabled"]:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = PageCache()
+        return _default_cache
+
+
+def close_default_cache():
+    """写回全局页面缓存的访问时间并关闭它，程序退出前调用；之后再调用 default_cache 会重新打开"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is not None:
+            _default_cache.close()
+            _default_cache = None
@@ -0,0 +1,284 @@
+"""
+指标模块，记录各阶段耗时、计数和进程内存，运行结束后输出JSON报告，可选提供Prometheus文本接口
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from loguru import logger
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Tuple
+import bisect
+import json
+import threading
+import time
+import os
+
+try:
+    import psutil
+except ImportError:  # 未安装时不采集进程内存
+    psutil = None
+
+# 耗时直方图的桶上限（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _key(name: str, labels: Optional[Dict[str, str]]) -> Tuple[str, Tuple]:
+    return name, tuple(sorted((labels or {}).items()))
+
+
+class Histogram:
+    """固定桶直方图，同时记录次数、总和、最小值和最大值"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "min": self.min,
+            "max": self.max,
+        }
+
+
+class MetricsRegistry:
+    """线程安全的指标注册表，支持计数器、仪表和直方图，指标可带标签"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple, float] = {}
+        self._gauges: Dict[Tuple, float] = {}
+        self._histograms: Dict[Tuple, Histogram] = {}
+        self._tracked_pids: Set[int] = set()
+        self._started_at = time.time()
+        self._sampler = None
+        self._stop = threading.Event()
+        self._server = None
+
+    def inc(self, name: str, value: float = 1, labels: Optional[Dict[str, str]] = None):
+        """计数器加上 value"""
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """设置仪表的当前值，同时记录峰值（name_peak）"""
+        key = _key(name, labels)
+        peak_key = _key(f"{name}_peak", labels)
+        with self._lock:
+            self._gauges[key] = value
+            self._gauges[peak_key] = max(self._gauges.get(peak_key, value), value)
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """把一次观测值记入直方图"""
+        key = _key(name, labels)
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = Histogram()
+            self._histograms[key].observe(value)
+
+    @contextmanager
+    def timer(self, name: str, labels: Optional[Dict[str, str]] = None) -> Iterator[None]:
+        """记录代码块耗时（秒）的上下文管理器，异常退出时同样记录"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def timed(self, name: str, labels: Optional[Dict[str, str]] = None):
+        """记录函数耗时的装饰器"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def track_process(self, pid: int):
+        """登记需要采集内存的外部进程（如chromedriver），其子进程会一并统计"""
+        with self._lock:
+            self._tracked_pids.add(pid)
+
+    def untrack_process(self, pid: int):
+        with self._lock:
+            self._tracked_pids.discard(pid)
+
+    def sample_resources(self):
+        """采集Python进程和已登记进程树（Chrome）的常驻内存"""
+        if psutil is None:
+            return
+        self.set_gauge("python_rss_bytes", psutil.Process().memory_info().rss)
+
+        with self._lock:
+            pids = list(self._tracked_pids)
+        chrome_rss = 0
+        chrome_processes = 0
+        for pid in pids:
+            try:
+                root = psutil.Process(pid)
+                processes = [root] + root.children(recursive=True)
+            except psutil.Error:
+                continue
+            for process in processes:
+                try:
+                    chrome_rss += process.memory_info().rss
+                    chrome_processes += 1
+                except psutil.Error:
+                    continue
+        self.set_gauge("chrome_rss_bytes", chrome_rss)
+        self.set_gauge("chrome_processes", chrome_processes)
+
+    def start(self, sample_interval: float = 5.0, prometheus_port: Optional[int] = None,
+              prometheus_host: str = "127.0.0.1"):
+        """
+        启动后台内存采样，可选启动Prometheus文本接口
+
+        Args:
+            sample_interval: 内存采样间隔（秒）
+            prometheus_port: Prometheus接口端口，为空表示不启动
+            prometheus_host: Prometheus接口监听地址，默认只监听本机；需要外部抓取时设为 "0.0.0.0"
+        """
+        if psutil is None:
+            logger.warning("未安装 psutil，不采集进程内存")
+        elif self._sampler is None:
+            self._stop.clear()
+            self._sampler = threading.Thread(
+                target=self._sample_loop, args=(sample_interval,), name="metrics-sampler", daemon=True
+            )
+            self._sampler.start()
+
+        if prometheus_port and self._server is None:
+            registry = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = registry.prometheus_text().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            self._server = ThreadingHTTPServer((prometheus_host, prometheus_port), Handler)
+            threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+            logger.info(f"Prometheus指标接口: http://{prometheus_host}:{prometheus_port}/metrics")
+
+    def _sample_loop(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                self.sample_resources()
+            except Exception as e:
+                logger.debug(f"采集进程内存失败: {str(e)}")
+            self._stop.wait(interval)
+
+    def stop(self):
+        """停止后台采样和Prometheus接口，停止前再采样一次"""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        self.sample_resources()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def report(self) -> Dict:
+        """
+        汇总所有指标
+
+        Returns:
+            可序列化为JSON的指标字典
+        """
+        def name_of(key):
+            name, labels = key
+            return name + "".join(f"[{k}={v}]" for k, v in labels)
+
+        with self._lock:
+            return {
+                "started_at": datetime.fromtimestamp(self._started_at).isoformat(timespec="seconds"),
+                "elapsed_seconds": round(time.time() - self._started_at, 3),
+                "counters": {name_of(key): value for key, value in sorted(self._counters.items())},
+                "gauges": {name_of(key): value for key, value in sorted(self._gauges.items())},
+                "timers": {name_of(key): hist.to_dict() for key, hist in sorted(self._histograms.items())},
+            }
+
+    def write_report(self, path: Path) -> bool:
+        """
+        原子地写入JSON报告
+
+        Returns:
+            写入是否成功
+        """
+        try:
+            os.makedirs(Path(path).parent, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, path)
+            logger.info(f"指标报告已写入 {path}")
+            return True
+        except Exception as e:
+            logger.error(f"写入指标报告失败: {str(e)}")
+            return False
+
+    def prometheus_text(self) -> str:
+        """按Prometheus文本格式输出所有指标，指标名加 toolify_ 前缀"""
+        def fmt(name, labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return name
+            return name + "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        lines = []
+        declared = set()
+
+        def declare(metric, kind):
+            # 同名指标的不同标签组合只声明一次类型
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} {kind}")
+
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                declare(f"toolify_{name}", "counter")
+                lines.append(f"{fmt('toolify_' + name, labels)} {value}")
+            for (name, labels), value in sorted(self._gauges.items()):
+                declare(f"toolify_{name}", "gauge")
+                lines.append(f"{fmt('toolify_' + name, labels)} {value}")
+            for (name, labels), hist in sorted(self._histograms.items()):
+                metric = f"toolify_{name}"
+                declare(metric, "histogram")
+                cumulative = 0
+                for bound, count in zip(list(hist.buckets) + ["+Inf"], hist.counts):
+                    cumulative += count
+                    lines.append(f"{fmt(metric + '_bucket', labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{fmt(metric + '_sum', labels)} {hist.sum}")
+                lines.append(f"{fmt(metric + '_count', labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+# 全局指标注册表
+metrics = MetricsRegistry()
@@ -1,74 +1,139 @@
 """
 页面解析模块，负责从页面中提取工具信息
 """
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from selenium.webdriver.common.by import By
 from loguru import logger
-from typing import List, Dict, Optional
+from typing import Any, Iterator, List, Dict, Optional, Tuple
+import atexit
+import multiprocessing
 import re
 import sys
+import threading
 import os
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import PARSER_CONFIG
+from scraper.backends import get_backend
+from scraper.metrics import metrics
+from scraper.records import ToolRecord
+from scraper.sharding import SHARD_SLOT_HREF, split_shards
+
+# 并行解析使用的进程池，首次使用时创建，进程数变化时重建；浏览器池的多个工作线程可能同时解析
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.RLock()
+
+
+def _mp_context():
+    """
+    进程池的启动方式：默认 forkserver，平台不支持时使用 spawn
+
+    解析发生在多线程进程中（浏览器池、流式处理管道、指标采样），fork 会复制其他线程持有的锁，
+    子进程可能死锁。
+    """
+    method = PARSER_CONFIG["start_method"]
+    if method not in multiprocessing.get_all_start_methods():
+        method = "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            _shutdown_executor()
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context())
+            _executor_workers = workers
+        return _executor
+
+
+@atexit.register
+def _shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _parse_shard(html_content: str, backend: str) -> Tuple[List[ToolRecord], int]:
+    """
+    在子进程中解析一个页面分片
+
+    Returns:
+        (工具信息列表, 占位卡片之前的工具数量)
+    """
+    parser_backend = get_backend(backend)
+    tools = []
+    slot_index = 0
+    for card in parser_backend.find_cards(html_content):
+        try:
+            fields = parser_backend.extract_card(card)
+            if fields.get('href') == SHARD_SLOT_HREF:
+                slot_index = len(tools)
+                continue
+            tool_info = ToolParser.build_tool(fields)
+            if tool_info:
+                tools.append(tool_info)
+        except Exception:
+            continue
+    return tools, slot_index
+
 
 class ToolParser:
     """工具信息解析器"""
     
     @staticmethod
-    def parse_tool_cards(html_content: str) -> List[Dict[str, str]]:
+    def parse_tool_cards(html_content: str, backend: Optional[str] = None,
+                         workers: Optional[int] = None) -> List[ToolRecord]:
         """
         解析页面中的工具卡片信息
         
         Args:
             html_content: 页面HTML内容
+            backend: 解析后端名称，默认使用 PARSER_CONFIG["backend"]
+            workers: 并行解析的进程数，默认使用 PARSER_CONFIG["workers"]（0 表示全部CPU核心）；
+                大于1且页面足够大时按卡片分片并行解析，结果与单进程解析相同
             
         Returns:
-            工具信息列表，每个工具包含名称、描述、链接等信息
+            工具信息列表，每个卡片一条记录，按文档顺序排列；不按URL去重（页面中重复出现的工具
+            由 DedupSink 去重），单进程和并行解析的结果一致
         """
         tools = []
         try:
             if not html_content:
                 logger.warning("HTML内容为空")
                 return []
-                
-            soup = BeautifulSoup(html_content, 'html.parser')
-            if not soup:
-                logger.warning("HTML解析失败")
-                return []
-            
-            # 查找所有可能的工具卡片
-            tool_cards = []
-            
-            # 尝试多种选择器
-            selectors = [
-                lambda tag: tag.name == 'div' and tag.find('a') and tag.find('p'),
-                lambda tag: tag.name == 'div' and tag.find(['h2', 'h3', 'h4']) and tag.find('a'),
-                lambda tag: tag.name == 'div' and tag.find('a', href=True) and len(tag.find_all('p')) > 0
-            ]
-            
-            for selector in selectors:
-                cards = soup.find_all(selector)
-                if cards:
-                    tool_cards.extend(cards)
-                    logger.info(f"使用选择器找到 {len(cards)} 个工具卡片")
-            
-            # 去重
-            tool_cards = list(set(tool_cards))
             
-            if not tool_cards:
-                logger.warning("未找到任何工具卡片")
-                return []
+            parser_backend = get_backend(backend or PARSER_CONFIG["backend"])
+            workers = PARSER_CONFIG["workers"] if workers is None else workers
+            workers = workers or os.cpu_count() or 1
+            if workers > 1 and len(html_content) >= PARSER_CONFIG["parallel_min_bytes"]:
+                parallel_tools = ToolParser.parse_tool_cards_parallel(html_content, parser_backend.name, workers)
+                if parallel_tools is not None:
+                    return parallel_tools
             
-            # 解析每个卡片
-            for card in tool_cards:
-                try:
-                    tool_info = ToolParser._parse_single_card(card)
-                    if tool_info:
-                        tools.append(tool_info)
-                except Exception as e:
-                    logger.warning(f"解析单个卡片失败: {str(e)}")
-                    continue
+            with metrics.timer("parse_seconds", {"backend": parser_backend.name}):
+                # 单次自底向上遍历，只保留最内层的工具卡片
+                tool_cards = parser_backend.find_cards(html_content)
+                
+                if not tool_cards:
+                    logger.warning("未找到任何工具卡片")
+                    return []
+                logger.info(f"使用 {parser_backend.name} 后端找到 {len(tool_cards)} 个工具卡片")
+                
+                # 解析每个卡片
+                for card in tool_cards:
+                    try:
+                        tool_info = ToolParser.build_tool(parser_backend.extract_card(card))
+                        if tool_info:
+                            tools.append(tool_info)
+                    except Exception as e:
+                        logger.warning(f"解析单个卡片失败: {str(e)}")
+                        continue
             
             logger.info(f"成功解析 {len(tools)} 个工具信息")
             return tools
@@ -78,64 +143,181 @@ class ToolParser:
             return []
 
     @staticmethod
-    def _parse_single_card(card) -> Optional[Dict[str, str]]:
+    def parse_tool_cards_parallel(html_content: str, backend: str, workers: int) -> Optional[List[ToolRecord]]:
         """
-        解析单个工具卡片
+        把页面按列表容器的子元素分片，在多个进程中并行解析，按文档顺序合并；与单进程解析一样不按URL去重
         
         Args:
-            card: BeautifulSoup对象，表示单个工具卡片
+            html_content: 页面HTML内容
+            backend: 解析后端名称
+            workers: 进程数
             
         Returns:
-            包含工具信息的字典，解析失败返回None
+            工具信息列表；页面无法分片或进程池异常时返回None，由调用方改为单进程解析
         """
-        try:
-            if not card:
+        with metrics.timer("parse_seconds", {"backend": backend}):
+            shards = split_shards(html_content, workers * PARSER_CONFIG["shards_per_worker"])
+            if shards is None:
+                logger.debug("页面中未找到可分片的列表容器，使用单进程解析")
                 return None
-                
-            # 提取工具名称和链接
-            tool_name = ""
-            url = ""
+            try:
+                results = list(_get_executor(workers).map(_parse_shard, shards, [backend] * len(shards)))
+            except (BrokenProcessPool, OSError, RuntimeError) as e:
+                # RuntimeError: 其他线程以不同的进程数重建了进程池，本次提交时旧进程池已关闭
+                logger.warning(f"并行解析失败，改为单进程解析: {str(e)}")
+                _shutdown_executor()
+                return None
+        metrics.inc("parse_shards_total", len(shards))
+        
+        # 容器之外的卡片按占位卡片位置分为容器之前和之后两部分
+        outside, slot_index = results[0]
+        ordered = [outside[:slot_index]] + [shard_tools for shard_tools, _ in results[1:]] + [outside[slot_index:]]
+        tools = [tool for shard_tools in ordered for tool in shard_tools]
+        logger.info(f"使用 {backend} 后端在 {workers} 个进程中解析 {len(shards)} 个分片，成功解析 {len(tools)} 个工具信息")
+        return tools
+
+    @staticmethod
+    def iter_card_fields(html_content: str, backend: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        逐个生成页面中工具卡片的原始字段，不构建完整的工具列表
+        
+        Args:
+            html_content: 页面HTML内容
+            backend: 解析后端名称，默认使用 PARSER_CONFIG["backend"]
+            
+        Yields:
+            卡片原始字段，可交给 build_tool 或流式处理管道
+        """
+        if not html_content:
+            logger.warning("HTML内容为空")
+            return
+        parser_backend = get_backend(backend or PARSER_CONFIG["backend"])
+        with metrics.timer("parse_seconds", {"backend": parser_backend.name}):
+            cards = parser_backend.find_cards(html_content)
+        for card in cards:
+            try:
+                yield parser_backend.extract_card(card)
+            except Exception as e:
+                logger.warning(f"解析单个卡片失败: {str(e)}")
+
+    @staticmethod
+    def parse_harvested_cards(cards: List[Dict[str, Any]]) -> List[ToolRecord]:
+        """
+        解析浏览器内提取脚本返回的卡片原始字段
+        
+        Args:
+            cards: 原始字段列表，结构与解析后端 extract_card 的返回值相同
+            
+        Returns:
+            工具信息列表
+        """
+        tools = []
+        for fields in cards:
+            tool_info = ToolParser.build_tool(fields)
+            if tool_info:
+                tools.append(tool_info)
+        return tools
+
+    @staticmethod
+    def parse_json_tools(payload: Any, fields: Dict[str, str],
+                         items_key: Optional[str] = None) -> List[ToolRecord]:
+        """
+        解析JSON接口返回的工具列表
+        
+        Args:
+            payload: 已解码的JSON数据
+            fields: 工具字段到JSON字段名的映射
+            items_key: 工具列表所在的键路径，用点号分隔（如 "data.list"），为空表示顶层即为列表
+            
+        Returns:
+            工具信息列表
+        """
+        items = payload
+        for key in items_key.split('.') if items_key else []:
+            items = items.get(key) if isinstance(items, dict) else None
+        if not isinstance(items, list):
+            logger.warning(f"JSON数据中未找到工具列表: {items_key}")
+            return []
+        
+        tools = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            values = {
+                field: str(item.get(json_field) or "")
+                for field, json_field in fields.items()
+            }
+            tool_name = ToolParser.clean_text(values.get('tool_name', ""))
+            url = ToolParser.validate_url(values.get('url', ""))
+            if tool_name and url:
+                tools.append(ToolRecord(
+                    tool_name=tool_name,
+                    description=ToolParser.clean_text(values.get('description', "")),
+                    url=url,
+                    category=values.get('category', "").strip(),
+                    added_date=values.get('added_date', "").strip()
+                ))
+        return tools
+
+    @staticmethod
+    def parse_detail_page(html_content: str, backend: Optional[str] = None) -> Dict[str, str]:
+        """
+        解析工具详情页，提取列表卡片中通常缺失的字段
+        
+        Args:
+            html_content: 详情页HTML内容
+            backend: 解析后端名称，默认使用 PARSER_CONFIG["backend"]
+            
+        Returns:
+            包含 description、category、added_date 的字典，未找到的字段为空字符串
+        """
+        try:
+            if not html_content:
+                return {}
+            fields = get_backend(backend or PARSER_CONFIG["backend"]).extract_detail(html_content)
+            valid_paragraphs = [
+                text for text in fields.get('paragraphs', [])
+                if len(text) > 20  # 假设描述至少20个字符
+            ]
+            return {
+                'description': ToolParser.clean_text(max(valid_paragraphs, key=len)) if valid_paragraphs else "",
+                'category': fields.get('category', ""),
+                'added_date': fields.get('added_date', "")
+            }
+        except Exception as e:
+            logger.warning(f"解析详情页失败: {str(e)}")
+            return {}
+
+    @staticmethod
+    def build_tool(fields: Dict[str, Any]) -> Optional[ToolRecord]:
+        """
+        根据解析后端提取的原始字段构建工具信息
+        
+        Args:
+            fields: 原始字段字典，包含 title、link_text、href、paragraphs、category、added_date
             
-            # 尝试从标题获取名称
-            title_element = card.find(['h2', 'h3', 'h4'])
-            if title_element:
-                tool_name = title_element.get_text(strip=True)
+        Returns:
+            工具记录（ToolRecord），字段无效返回None
+        """
+        try:
+            if not fields:
+                return None
             
-            # 如果没有找到标题，尝试从链接文本获取
+            # 优先使用标题作为名称，没有标题时使用链接文本和链接地址
+            tool_name = fields.get('title', "")
+            url = ""
             if not tool_name:
-                link_element = card.find('a')
-                if link_element:
-                    tool_name = link_element.get_text(strip=True)
-                    url = link_element.get('href', '')
+                tool_name = fields.get('link_text', "")
+                url = fields.get('href', "")
             
-            # 提取工具描述
+            # 过滤掉太短的段落和可能的标签文本，选择最长的段落作为描述
             description = ""
-            paragraphs = card.find_all('p')
-            if paragraphs:
-                # 过滤掉太短的段落和可能的标签文本
-                valid_paragraphs = [
-                    p.get_text(strip=True) for p in paragraphs
-                    if len(p.get_text(strip=True)) > 20  # 假设描述至少20个字符
-                ]
-                if valid_paragraphs:
-                    # 选择最长的段落作为描述
-                    description = max(valid_paragraphs, key=len)
-            
-            # 提取分类
-            category = ""
-            for element in card.find_all(['span', 'div']):
-                text = element.get_text(strip=True).lower()
-                if any(keyword in text for keyword in ['category:', 'type:', '类别:', '分类:']):
-                    category = text.split(':', 1)[-1].strip()
-                    break
-            
-            # 提取日期
-            added_date = ""
-            for element in card.find_all(['span', 'div']):
-                text = element.get_text(strip=True).lower()
-                if any(keyword in text for keyword in ['added:', 'date:', '添加:', '日期:']):
-                    added_date = text.split(':', 1)[-1].strip()
-                    break
+            valid_paragraphs = [
+                text for text in fields.get('paragraphs', [])
+                if len(text) > 20  # 假设描述至少20个字符
+            ]
+            if valid_paragraphs:
+                description = max(valid_paragraphs, key=len)
             
             # 清理和验证数据
             tool_name = ToolParser.clean_text(tool_name)
@@ -144,13 +326,13 @@ class ToolParser:
             
             # 只返回有效的工具信息
             if tool_name and url:  # 描述可能为空
-                return {
-                    'tool_name': tool_name,
-                    'description': description,
-                    'url': url,
-                    'category': category,
-                    'added_date': added_date
-                }
+                return ToolRecord(
+                    tool_name=tool_name,
+                    description=description,
+                    url=url,
+                    category=fields.get('category', ""),
+                    added_date=fields.get('added_date', "")
+                )
             return None
             
         except Exception as e:
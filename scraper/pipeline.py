@@ -0,0 +1,279 @@
+"""
+流式处理管道：抓取 → 提取 → 规范化 → 去重 → 写入
+
+各阶段以生成器串联，抓取线程与处理线程之间通过有界队列传递卡片批次，
+Python侧的内存占用只与队列长度和批大小有关，与目标工具数量无关。
+"""
+from loguru import logger
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import queue
+import threading
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CACHE_CONFIG, SCRAPER_CONFIG
+from scraper.http_cache import RENDERED_SUFFIX, default_cache
+from scraper.metrics import metrics
+from scraper.parser import ToolParser
+
+# 队列结束标记
+_END = object()
+
+
+def normalize(cards: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, str]]:
+    """规范化阶段：把原始字段转换为工具信息，丢弃无效卡片"""
+    for fields in cards:
+        tool = ToolParser.build_tool(fields)
+        if tool:
+            yield tool
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """按固定大小分批，最后一批可能不足 size 个"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class KnownRunTracker:
+    """
+    增量抓取的停止条件：按页面顺序统计连续出现的已保存工具
+
+    列表页按添加时间倒序排列，连续遇到足够多已保存的工具时，之后的工具都已抓取过，可以停止滚动。
+    只统计本次运行开始前已保存的工具：本次运行中见过的URL（刷新页面后重新提取的、其他来源已写入的）
+    和续抓时上次中断前保存的工具既不计入也不打断连续数量。
+    """
+
+    def __init__(self, sink, stop_after: Optional[int] = None, resume_url: str = ""):
+        """
+        Args:
+            sink: 去重写入器（DedupSink），用于查询已保存的URL
+            stop_after: 连续多少个已保存的工具后停止，默认使用 SCRAPER_CONFIG["incremental_stop_after"]
+            resume_url: 续抓时检查点记录的最后保存的工具URL，页面越过它之前不统计已保存的工具
+        """
+        self.sink = sink
+        self.stop_after = stop_after or SCRAPER_CONFIG["incremental_stop_after"]
+        self.resume_url = resume_url
+        self.known_run = 0
+        self.new_count = 0
+        # 本页已检查过的URL；写入器的 seen_urls 由处理线程异步更新，可能还不包含最近几批
+        self._observed = set()
+
+    def resumed(self):
+        """页面已越过续抓位置（例如快速滚动到了 resume_url 之后），开始统计已保存的工具"""
+        self.resume_url = ""
+
+    def observe(self, cards: List[Dict[str, Any]]):
+        """按顺序检查一批卡片，更新连续已保存工具的数量"""
+        urls = [tool["url"] for tool in normalize(cards)]
+        known_urls = self.sink.known_urls(urls)
+        for url in urls:
+            if url in self._observed or url in self.sink.seen_urls:
+                continue
+            self._observed.add(url)
+            if url not in known_urls:
+                self.known_run = 0
+                self.new_count += 1
+            elif not self.resume_url:
+                self.known_run += 1
+            if url == self.resume_url:
+                self.resumed()
+
+    def should_stop(self) -> bool:
+        if self.known_run < self.stop_after:
+            return False
+        logger.info(f"增量抓取：连续 {self.known_run} 个工具已保存过，停止滚动（本次发现新工具 {self.new_count} 个）")
+        return True
+
+
+class StreamingPipeline:
+    """
+    流式处理管道，抓取线程通过 put 提交提取到的卡片批次，后台线程完成规范化，
+    再按 batch_size 分批交给 DedupSink 去重和写入
+
+    队列满时 put 会阻塞，使抓取速度与写入速度相匹配。用法::
+
+        with StreamingPipeline(sink) as pipeline:
+            browser.scroll_until_count(target, on_batch=pipeline.put)
+    """
+
+    def __init__(self, sink, queue_size: Optional[int] = None,
+                 on_progress: Optional[Callable[[int, List[str]], None]] = None):
+        """
+        初始化流式处理管道
+
+        Args:
+            sink: 去重写入器（DedupSink）
+            queue_size: 队列中最多缓存的卡片批次数，默认使用 SCRAPER_CONFIG["pipeline_queue_size"]
+            on_progress: 可选回调，每批卡片交给写入器后在处理线程中调用，参数为 put 时传入的来源位置
+                和本批工具的URL列表
+        """
+        self.sink = sink
+        self.queue = queue.Queue(maxsize=queue_size or SCRAPER_CONFIG["pipeline_queue_size"])
+        self.on_progress = on_progress
+        self.tool_count = 0
+        self._error = None
+        self._consumer = None
+
+    def put(self, cards: List[Dict[str, Any]], cursor: Optional[int] = None):
+        """
+        提交一批卡片原始字段，队列满时阻塞
+
+        Args:
+            cards: 卡片原始字段列表
+            cursor: 本批之后来源中已提取的卡片位置（如 BrowserManager.harvest_cursor），
+                处理完成后传给 on_progress
+        """
+        if cards:
+            self.queue.put((cards, cursor))
+
+    def _batches(self) -> Iterator:
+        while True:
+            item = self.queue.get()
+            if item is _END:
+                return
+            yield item
+
+    def _consume(self):
+        """处理线程：串联各阶段并把工具分批交给写入器"""
+        try:
+            for cards, cursor in self._batches():
+                urls = []
+                with metrics.timer("pipeline_batch_seconds"):
+                    for tools in batched(normalize(cards), self.sink.batch_size):
+                        self.tool_count += len(tools)
+                        urls.extend(tool['url'] for tool in tools)
+                        self.sink.add(tools)
+                if self.on_progress is not None and cursor is not None:
+                    self.on_progress(cursor, urls)
+        except Exception as e:
+            self._error = e
+            logger.error(f"流式处理失败: {str(e)}")
+            # 继续取出剩余批次，避免抓取线程在队列上阻塞
+            for _ in self._batches():
+                pass
+
+    def __enter__(self) -> "StreamingPipeline":
+        self._consumer = threading.Thread(target=self._consume, name="pipeline-consumer", daemon=True)
+        self._consumer.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.queue.put(_END)
+        self._consumer.join()
+        if self._error is not None and exc_type is None:
+            raise self._error
+        return False
+
+
+def _cache_rendered(url: str, page_source: str):
+    """把浏览器渲染后的页面存入页面缓存，供回放模式解析"""
+    cache = default_cache()
+    if cache is not None:
+        cache.put(url + RENDERED_SUFFIX, page_source.encode("utf-8"), {"Content-Type": "text/html; charset=utf-8"})
+
+
+def _skip_saved(browser, sink, last_url: str, limit: int, on_batch: Callable[[List[Dict[str, Any]]], None]):
+    """
+    续抓时跳过上次已保存的卡片
+
+    先照常提取列表顶部已加载的卡片（中断期间新发布的工具在这里）。其中已有保存过的工具时，
+    新旧工具的分界在首屏之内，快速滚动到上次保存的最后一个工具，之间的卡片不再提取；
+    首屏全是新工具时分界可能更靠后，从顶部正常提取，避免漏掉新工具。
+
+    Args:
+        browser: 已打开列表页的 BrowserManager
+        sink: 去重写入器（DedupSink）
+        last_url: 检查点记录的最后保存的工具URL
+        limit: 快速滚动时页面卡片数量的上限
+        on_batch: 提取到卡片后的回调
+
+    Returns:
+        是否已快速滚动到最后保存的工具之后
+    """
+    try:
+        cards = browser.harvest_new_cards()
+    except Exception as e:
+        logger.warning(f"提取列表顶部卡片失败，从头提取: {str(e)}")
+        return False
+    if cards:
+        on_batch(cards)
+    if not sink.known_urls([tool["url"] for tool in normalize(cards)]):
+        logger.info("列表顶部没有已保存的工具，从头提取")
+        return False
+    return browser.fast_forward(last_url, limit)
+
+
+def crawl_listing(browser, sink, url: str, checkpoint=None) -> Tuple[bool, int]:
+    """
+    滚动抓取已打开的列表页，经流式处理管道交给写入器
+
+    提供检查点时，抓取过程中定期保存进度和最后保存的工具URL，达到目标数量后把来源标记为完成。
+    续抓时先提取列表顶部（中断期间新发布的工具出现在已保存部分之前），再快速滚动到最后保存的工具，
+    跳过上次已保存的卡片（见 _skip_saved）；不在浏览器内提取时从头重新提取，已保存的工具由写入器按URL索引丢弃。
+    开启增量抓取时，连续遇到足够多已保存的工具后提前停止。
+
+    Args:
+        browser: 已打开列表页的 BrowserManager
+        sink: 去重写入器（DedupSink）
+        url: 列表页URL，作为检查点中的来源标识
+        checkpoint: 可选的抓取检查点（CrawlCheckpoint）
+
+    Returns:
+        (是否达到目标数量, 解析到的工具数量（去重前）)
+    """
+    target_count = SCRAPER_CONFIG["target_tools"]
+    on_progress = None
+    last_url = ""
+    if checkpoint is not None:
+        progress = checkpoint.source(url)
+        last_url = progress["last_url"]
+        if progress["cards"]:
+            logger.info(f"从检查点续抓 {url}：上次已提取 {progress['cards']} 个卡片（最后保存 {last_url or '-'}）")
+        on_progress = checkpoint.tracker(url, sink)
+
+    with StreamingPipeline(sink, on_progress=on_progress) as pipeline:
+        if SCRAPER_CONFIG["harvest_in_browser"]:
+            tracker = KnownRunTracker(sink, resume_url=last_url) if SCRAPER_CONFIG["incremental"] else None
+
+            def on_batch(cards):
+                if tracker is not None:
+                    tracker.observe(cards)
+                pipeline.put(cards, browser.harvest_cursor)
+
+            if last_url and _skip_saved(browser, sink, last_url, target_count, on_batch) and tracker is not None:
+                tracker.resumed()
+            target_reached = browser.scroll_until_count(
+                target_count, on_batch=on_batch, stop=tracker.should_stop if tracker is not None else None
+            )
+            if CACHE_CONFIG["cache_rendered"]:
+                _cache_rendered(url, browser.driver.page_source)
+        else:
+            if SCRAPER_CONFIG["incremental"]:
+                logger.warning("增量抓取需要 harvest_in_browser，本次按目标数量滚动")
+            target_reached = browser.scroll_until_count(target_count)
+            with metrics.timer("browser_page_source_seconds"):
+                page_source = browser.driver.page_source
+            metrics.inc("page_source_bytes_total", len(page_source))
+            if CACHE_CONFIG["cache_rendered"]:
+                _cache_rendered(url, page_source)
+            # 逐个提取卡片，分批交给处理管道
+            cursor = 0
+            for cards in batched(ToolParser.iter_card_fields(page_source), sink.batch_size):
+                cursor += len(cards)
+                pipeline.put(cards, cursor)
+
+    if checkpoint is not None:
+        sink.flush()
+        if target_reached:
+            checkpoint.finish(url)
+        else:
+            checkpoint.save()
+    return target_reached, pipeline.tool_count
@@ -0,0 +1,282 @@
+"""
+浏览器池模块，使用多个Chrome实例并行抓取多个列表页
+"""
+from selenium.common.exceptions import WebDriverException
+from loguru import logger
+from typing import Callable, Container, Dict, Iterable, List, Optional, Set
+import queue
+import threading
+import time
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import BROWSER_CONFIG, SCRAPER_CONFIG
+from scraper.browser import BrowserManager
+from scraper.checkpoint import CrawlCheckpoint
+from scraper.fetcher import HttpFetcher
+from scraper.metrics import metrics
+from scraper.pipeline import crawl_listing
+
+
+class DedupSink:
+    """
+    线程安全的去重写入器，汇总多个来源的工具并按批写入 DataStorage
+
+    去重在锁内完成；详情页补全和写入存储在锁外进行（按批次顺序串行），
+    一批工具补全期间其他线程仍可继续加入新工具。
+    """
+
+    def __init__(self, storage, existing_urls: Optional[Container[str]] = None, batch_size: Optional[int] = None,
+                 enricher=None):
+        """
+        初始化去重写入器
+
+        Args:
+            storage: DataStorage 实例
+            existing_urls: 已保存工具的URL集合或URL索引（UrlIndex）
+            batch_size: 每批写入的工具数量，默认使用 SCRAPER_CONFIG["batch_size"]
+            enricher: 可选的详情页抓取器（DetailCrawler），每批写入前补全工具信息
+        """
+        self.storage = storage
+        self.enricher = enricher
+        self.existing_urls = existing_urls if existing_urls is not None else set()
+        self.batch_size = batch_size or SCRAPER_CONFIG["batch_size"]
+        self.seen_urls = set()
+        self.saved_count = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        # 串行化补全和写入，保证批次按取出顺序落盘
+        self._write_lock = threading.Lock()
+        # 已从缓冲区取出但尚未写入完成的批次数，flush 等待其归零
+        self._writing = 0
+        self._written = threading.Condition(self._lock)
+
+    @property
+    def total_count(self) -> int:
+        """本次运行抓取到的不重复工具数量"""
+        return len(self.seen_urls)
+
+    def add(self, tools: List[Dict[str, str]]) -> int:
+        """
+        加入一批工具，过滤本次已见和历史已保存的URL，缓冲区满时写入存储
+
+        Args:
+            tools: 工具信息列表
+
+        Returns:
+            本批中新工具的数量
+        """
+        with self._lock:
+            candidates = []
+            for tool in tools:
+                if tool['url'] in self.seen_urls:
+                    continue
+                self.seen_urls.add(tool['url'])
+                candidates.append(tool)
+            
+            known_urls = self.known_urls([tool['url'] for tool in candidates])
+            new_tools = [tool for tool in candidates if tool['url'] not in known_urls]
+            self._buffer.extend(new_tools)
+            batch = self._take_locked() if len(self._buffer) >= self.batch_size else None
+        if batch:
+            self._write(batch)
+        return len(new_tools)
+
+    def known_urls(self, urls: List[str]) -> Set[str]:
+        """批量查询已保存的URL，URL索引支持时使用一次批量查询（URL索引线程安全，无需持有写入锁）"""
+        contains_many = getattr(self.existing_urls, 'contains_many', None)
+        if contains_many is not None:
+            return contains_many(urls)
+        return {url for url in urls if url in self.existing_urls}
+
+    def flush(self):
+        """写入缓冲区中剩余的工具，并等待其他线程已取出的批次写入完成"""
+        with self._lock:
+            batch = self._take_locked()
+        if batch:
+            self._write(batch)
+        with self._written:
+            self._written.wait_for(lambda: self._writing == 0)
+
+    def _take_locked(self) -> List[Dict[str, str]]:
+        """取出缓冲区中的全部工具（调用方持有 _lock）"""
+        batch, self._buffer = self._buffer, []
+        if batch:
+            self._writing += 1
+        return batch
+
+    def _write(self, batch: List[Dict[str, str]]):
+        """在锁外补全详情并写入存储"""
+        saved = False
+        try:
+            with self._write_lock:
+                if self.enricher is not None:
+                    with metrics.timer("detail_enrich_seconds"):
+                        self.enricher.enrich(batch)
+                with metrics.timer("storage_save_seconds", {"backend": type(self.storage).__name__}):
+                    saved = self.storage.save_tools(batch, mode='a')
+        finally:
+            with self._written:
+                if saved:
+                    self.saved_count += len(batch)
+                    metrics.inc("tools_saved_total", len(batch))
+                self._writing -= 1
+                self._written.notify_all()
+
+
+class BrowserPool:
+    """浏览器池，多个工作线程各自驱动一个Chrome实例，从共享队列中领取URL"""
+
+    def __init__(self, sink: DedupSink, size: Optional[int] = None,
+                 browser_factory: Callable[[], BrowserManager] = BrowserManager,
+                 http_fetcher: Optional[HttpFetcher] = None, checkpoint: Optional[CrawlCheckpoint] = None):
+        """
+        初始化浏览器池
+
+        Args:
+            sink: 接收解析结果的去重写入器
+            size: 浏览器数量，默认使用 BROWSER_CONFIG["pool_size"]
+            browser_factory: 创建浏览器管理器的工厂函数
+            http_fetcher: 可选的HTTP抓取器，设置后每个页面先尝试纯HTTP抓取，
+                工具不足时才使用浏览器
+            checkpoint: 可选的抓取检查点，跳过已完成的页面，未完成的页面重新提取并丢弃已保存的工具
+        """
+        self.sink = sink
+        self.size = size or BROWSER_CONFIG["pool_size"]
+        self.browser_factory = browser_factory
+        self.http_fetcher = http_fetcher
+        self.checkpoint = checkpoint
+        # 驱动下载和Chrome冷启动不适合并发进行
+        self._launch_lock = threading.Lock()
+
+    def run(self, urls: Iterable[str]) -> List[Dict]:
+        """
+        并行抓取所有URL，直到队列清空
+
+        Args:
+            urls: 待抓取的列表页URL
+
+        Returns:
+            每个工作线程的统计信息
+        """
+        tasks = queue.Queue()
+        for url in urls:
+            if self.checkpoint is not None and self.checkpoint.is_done(url):
+                logger.info(f"页面已在检查点中标记完成，跳过: {url}")
+                continue
+            tasks.put((url, 0))
+
+        worker_count = min(self.size, tasks.qsize()) or 1
+        stats = [
+            {"worker": i, "pages": 0, "http_pages": 0, "tools": 0, "failures": 0, "recycles": 0, "elapsed": 0.0}
+            for i in range(worker_count)
+        ]
+        threads = [
+            threading.Thread(target=self._worker, args=(tasks, stats[i]), name=f"browser-worker-{i}")
+            for i in range(worker_count)
+        ]
+        logger.info(f"启动 {worker_count} 个浏览器工作线程，待抓取页面 {tasks.qsize()} 个")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.sink.flush()
+        self._report(stats)
+        return stats
+
+    def _launch(self) -> BrowserManager:
+        with self._launch_lock:
+            return self.browser_factory()
+
+    def _worker(self, tasks: queue.Queue, stats: Dict):
+        """
+        工作线程：领取URL并抓取，浏览器崩溃时回收并重新启动
+
+        单个页面的任何异常都只影响该页面：记录失败并重新放回队列（不超过最大重试次数），
+        工作线程继续处理后续页面。
+        """
+        browser = None
+        start = time.monotonic()
+        try:
+            while True:
+                try:
+                    url, attempts = tasks.get_nowait()
+                except queue.Empty:
+                    break
+
+                try:
+                    if self.http_fetcher is not None:
+                        tools = self.http_fetcher.fetch_tools(url)
+                        if tools is not None:
+                            self.sink.add(tools)
+                            if self.checkpoint is not None:
+                                self.sink.flush()
+                                self.checkpoint.finish(url)
+                            stats["tools"] += len(tools)
+                            stats["pages"] += 1
+                            stats["http_pages"] += 1
+                            continue
+
+                    if browser is None:
+                        browser = self._launch()
+                    stats["tools"] += self._crawl(browser, url)
+                    stats["pages"] += 1
+                except WebDriverException as e:
+                    logger.warning(f"工作线程 {stats['worker']} 抓取 {url} 失败，回收浏览器: {str(e)}")
+                    self._discard(browser)
+                    browser = None
+                    stats["recycles"] += 1
+                    self._retry(tasks, url, attempts, stats)
+                except Exception as e:
+                    logger.error(f"工作线程 {stats['worker']} 抓取 {url} 出错: {type(e).__name__}: {str(e)}")
+                    self._retry(tasks, url, attempts, stats)
+        finally:
+            self._discard(browser)
+            stats["elapsed"] = time.monotonic() - start
+
+    @staticmethod
+    def _retry(tasks: queue.Queue, url: str, attempts: int, stats: Dict):
+        """记录一次失败，未超过最大重试次数时把页面放回队列"""
+        stats["failures"] += 1
+        if attempts + 1 < SCRAPER_CONFIG["max_retries"]:
+            tasks.put((url, attempts + 1))
+        else:
+            logger.error(f"页面 {url} 达到最大重试次数，放弃抓取")
+
+    def _crawl(self, browser: BrowserManager, url: str) -> int:
+        """
+        抓取单个列表页
+
+        Returns:
+            解析到的工具数量（去重前）
+        """
+        browser.get_page(url)
+        target_reached, tool_count = crawl_listing(browser, self.sink, url, self.checkpoint)
+
+        if not target_reached:
+            logger.warning(f"页面 {url} 未能达到目标工具数量 {SCRAPER_CONFIG['target_tools']}")
+        return tool_count
+
+    @staticmethod
+    def _discard(browser: Optional[BrowserManager]):
+        """关闭浏览器，忽略已崩溃驱动的清理错误"""
+        if browser is None:
+            return
+        try:
+            browser.quit()
+        except Exception as e:
+            logger.debug(f"关闭浏览器失败: {str(e)}")
+
+    @staticmethod
+    def _report(stats: List[Dict]):
+        """输出每个工作线程的吞吐量"""
+        for item in stats:
+            rate = item["tools"] / item["elapsed"] if item["elapsed"] else 0.0
+            logger.info(
+                f"工作线程 {item['worker']}: 页面 {item['pages']} 个（HTTP {item['http_pages']} 个），"
+                f"工具 {item['tools']} 个，"
+                f"{rate:.2f} 个/秒，失败 {item['failures']} 次，重启浏览器 {item['recycles']} 次"
+            )
@@ -0,0 +1,130 @@
+"""
+工具记录模块：用 __slots__ 记录代替每个工具一个字典，并驻留（intern）分类、日期等重复取值，
+降低大批量工具驻留内存时的单条开销；按列转换为 DataFrame / Arrow 表供存储使用
+"""
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import sys
+
+TOOL_FIELDS = ('tool_name', 'description', 'url', 'category', 'added_date')
+# 取值高度重复的字段，驻留后所有记录共享同一个字符串对象
+INTERNED_FIELDS = frozenset(('category', 'added_date'))
+
+
+class ToolRecord(Mapping):
+    """
+    单个工具的信息，字段与原先的工具字典相同
+
+    实现只读映射接口并支持 record[field] = value，现有按字典访问工具信息的代码
+    （tool['url']、tool.get(field)、详情页补全写回字段）无需修改；与同内容的字典比较相等。
+    """
+
+    __slots__ = TOOL_FIELDS
+
+    def __init__(self, tool_name: str = "", description: str = "", url: str = "",
+                 category: str = "", added_date: str = ""):
+        self.tool_name = tool_name
+        self.description = description
+        self.url = url
+        self.category = sys.intern(category or "")
+        self.added_date = sys.intern(added_date or "")
+
+    @classmethod
+    def from_dict(cls, tool: Mapping) -> 'ToolRecord':
+        """由工具字典创建记录，缺失的字段为空字符串"""
+        return cls(*(str(tool.get(field) or "") for field in TOOL_FIELDS))
+
+    def __getitem__(self, field: str) -> str:
+        if field not in TOOL_FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field: str, value: str):
+        if field not in TOOL_FIELDS:
+            raise KeyError(field)
+        setattr(self, field, sys.intern(value or "") if field in INTERNED_FIELDS else value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(TOOL_FIELDS)
+
+    def __len__(self) -> int:
+        return len(TOOL_FIELDS)
+
+    def __reduce__(self):
+        # 跨进程传输后重新驻留字段（默认的 __slots__ 序列化会得到各自独立的字符串）
+        return (ToolRecord, tuple(getattr(self, field) for field in TOOL_FIELDS))
+
+    def __repr__(self) -> str:
+        return f"ToolRecord({', '.join(f'{field}={getattr(self, field)!r}' for field in TOOL_FIELDS)})"
+
+    def to_dict(self) -> Dict[str, str]:
+        """转换为普通字典"""
+        return {field: getattr(self, field) for field in TOOL_FIELDS}
+
+
+def tool_columns(tools: Iterable[Mapping], columns: Optional[List[str]] = None) -> Dict[str, List[str]]:
+    """
+    把工具列表按列展开，缺失或为空的字段取空字符串
+
+    列表中直接引用记录中的字符串对象（不复制），驻留的分类和日期在整列中只有一份。
+
+    Args:
+        tools: ToolRecord 或工具字典列表
+        columns: 列名列表，默认为全部工具字段
+
+    Returns:
+        列名到取值列表的字典
+    """
+    tools = tools if isinstance(tools, list) else list(tools)
+    columns = columns or TOOL_FIELDS
+    if all(type(tool) is ToolRecord for tool in tools):
+        # 记录的字段总是存在，直接按属性读取
+        return {column: list(map(attrgetter(column), tools)) for column in columns}
+    return {column: [tool.get(column) or "" for tool in tools] for column in columns}
+
+
+def tools_to_dataframe(tools: Iterable[Mapping], columns: Optional[List[str]] = None):
+    """
+    按列构建 DataFrame，不为每行创建中间字典
+
+    Args:
+        tools: ToolRecord 或工具字典列表
+        columns: 列名列表，默认为全部工具字段
+
+    Returns:
+        pandas.DataFrame
+    """
+    import pandas as pd
+    columns = list(columns or TOOL_FIELDS)
+    return pd.DataFrame(tool_columns(tools, columns), columns=columns)
+
+
+def tools_to_arrow(tools: Iterable[Mapping], schema, extra: Optional[Dict[str, Any]] = None,
+                   null_empty: Iterable[str] = ()):
+    """
+    按列构建 Arrow 表，不为每行创建中间字典
+
+    Args:
+        tools: ToolRecord 或工具字典列表
+        schema: 目标 pyarrow.Schema，工具字段之外的列由 extra 提供
+        extra: 额外列名到常量值的字典（如抓取日期），每行取相同的值
+        null_empty: 空字符串写为null的列（如分区列）
+
+    Returns:
+        pyarrow.Table
+    """
+    import pyarrow as pa
+    extra = extra or {}
+    null_empty = set(null_empty)
+    columns = tool_columns(tools, [name for name in schema.names if name not in extra])
+    rows = len(next(iter(columns.values()))) if columns else 0
+    arrays = []
+    for field in schema:
+        if field.name in extra:
+            arrays.append(pa.repeat(pa.scalar(extra[field.name], field.type), rows))
+        elif field.name in null_empty:
+            arrays.append(pa.array([value or None for value in columns[field.name]], field.type))
+        else:
+            arrays.append(pa.array(columns[field.name], field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
@@ -0,0 +1,104 @@
+"""
+自适应滚动控制模块，根据新内容的加载耗时和失败率调整滚动步长、间隔和批次间停顿（AIMD）
+"""
+from collections import deque
+from loguru import logger
+from typing import Dict, Optional
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import SCRAPER_CONFIG
+from scraper.metrics import metrics
+
+
+class ScrollController:
+    """
+    AIMD 滚动参数控制器
+
+    每批新内容按时加载时加性地提高滚动速度（增大步长、缩短间隔和停顿）；没有加载到新内容，
+    或加载耗时明显高于近期平均值（网站开始限流）时乘性地降低速度；最近的失败率超过上限时
+    暂停提速。批次间停顿只在限流时增加：没有新内容通常是列表到底或滚动过快，停顿无助于加载。
+    参数始终限制在配置的上下限内。
+
+    每一轮滚动（包括其中的"加载更多"点击）只应记录一次结果。
+    """
+
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Args:
+            config: 控制参数，默认使用 SCRAPER_CONFIG["adaptive_scroll"]
+        """
+        self.config = config or SCRAPER_CONFIG["adaptive_scroll"]
+        self.enabled = self.config["enabled"]
+        self.step = self.config["step_px"]
+        self.interval = self.config["interval_ms"]
+        self.pause = self.config["pause"]
+        # 新内容加载耗时的指数移动平均（秒）
+        self.latency = None
+        self.outcomes = deque(maxlen=self.config["window"])
+
+    @property
+    def failure_rate(self) -> float:
+        """最近若干批中没有加载到新内容的比例"""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def record(self, loaded: bool, elapsed: float):
+        """
+        记录一批滚动的结果并调整参数
+
+        Args:
+            loaded: 是否加载到新内容
+            elapsed: 等待新内容的耗时（秒）
+        """
+        if not self.enabled:
+            return
+        self.outcomes.append(loaded)
+        if not loaded:
+            result = "empty"
+            self._decrease(throttled=False)
+        else:
+            slow = self.latency is not None and elapsed > self.latency * self.config["slow_factor"]
+            alpha = self.config["latency_alpha"]
+            self.latency = elapsed if self.latency is None else alpha * elapsed + (1 - alpha) * self.latency
+            if slow:
+                result = "slow"
+                self._decrease(throttled=True)
+            elif self.failure_rate > self.config["max_failure_rate"]:
+                result = "hold"
+            else:
+                result = "loaded"
+                self._increase()
+
+        metrics.inc("scroll_batches_total", labels={"result": result})
+        metrics.set_gauge("scroll_step_px", self.step)
+        metrics.set_gauge("scroll_interval_ms", self.interval)
+        metrics.set_gauge("scroll_pause_seconds", self.pause)
+        logger.debug(
+            f"滚动参数（{result}）：步长 {self.step}px，间隔 {self.interval}ms，停顿 {self.pause:.2f}s，"
+            f"失败率 {self.failure_rate:.0%}"
+        )
+
+    def _increase(self):
+        """加性提速"""
+        config = self.config
+        self.step = min(self.step + config["step_increase_px"], config["step_max_px"])
+        self.interval = max(self.interval - config["interval_decrease_ms"], config["interval_min_ms"])
+        self.pause = max(self.pause - config["pause_decrease"], 0.0)
+
+    def _decrease(self, throttled: bool):
+        """
+        乘性降速
+
+        Args:
+            throttled: 是否为限流（加载明显变慢），是时停顿从 pause_decrease 开始翻倍
+        """
+        config = self.config
+        factor = config["decrease_factor"]
+        self.step = max(int(self.step * factor), config["step_min_px"])
+        self.interval = min(int(self.interval / factor), config["interval_max_ms"])
+        if throttled:
+            self.pause = min(max(self.pause / factor, config["pause_decrease"]), config["pause_max"])
@@ -0,0 +1,104 @@
+"""
+页面分片模块：不构建文档树，只扫描标签找出直接子元素最多的列表容器，
+按子元素边界把页面切成可独立解析的HTML片段，供多进程并行解析
+
+卡片判定只取决于节点的子孙（见 backends._find_innermost_cards），因此容器的子元素
+分到不同片段后解析出的卡片不变。每个片段开头放一个占位卡片，使容器及其祖先在
+各片段中与整页一样"已包含卡片"、不会被误判为卡片；容器之外的页面内容单独作为一个
+片段，其中占位卡片的位置标记容器卡片在文档顺序中的插入点。
+"""
+from typing import List, Optional, Tuple
+import re
+
+# 占位卡片的链接地址，解析时据此识别并跳过
+SHARD_SLOT_HREF = "#__shard_slot__"
+SHARD_SLOT = f'<div><a href="{SHARD_SLOT_HREF}"></a><p></p></div>'
+
+# 注释、脚本和样式整体跳过（内容中可能包含 "<"）；属性值中可能包含 ">"
+_TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->'
+    r'|<(script|style)\b(?:"[^"]*"|\'[^\']*\'|[^\'">])*>.*?</\1\s*>'
+    r'|<(/?)([a-zA-Z][^\s/>]*)((?:"[^"]*"|\'[^\']*\'|[^\'">])*)>',
+    re.DOTALL | re.IGNORECASE
+)
+
+VOID_TAGS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr'
+))
+
+
+def find_list_container(html_content: str) -> Optional[Tuple[str, int, int, List[int]]]:
+    """
+    找出直接子元素最多的元素（列表容器）
+
+    假设页面结构完整（浏览器序列化的 page_source 满足）；遇到不匹配的结束标签时
+    关闭到最近的同名元素，找不到同名元素则忽略。
+
+    Args:
+        html_content: 页面HTML内容
+
+    Returns:
+        (开始标签文本, 内容起始位置, 内容结束位置, 各直接子元素的起始位置)；页面中没有元素时返回None
+    """
+    # 栈元素: [标签名, 开始标签起始位置, 内容起始位置, 直接子元素起始位置列表]
+    stack = []
+    best = None
+    best_children = 0
+    for match in _TOKEN_PATTERN.finditer(html_content):
+        tag = match.group(3)
+        if tag is None:
+            # 注释、脚本或样式：脚本和样式算作父元素的子元素
+            if match.group(1) and stack:
+                stack[-1][3].append(match.start())
+            continue
+        tag = tag.lower()
+        if not match.group(2):
+            if stack:
+                stack[-1][3].append(match.start())
+            if tag not in VOID_TAGS and not match.group(4).endswith('/'):
+                stack.append([tag, match.start(), match.end(), []])
+            continue
+
+        # 结束标签：关闭到最近的同名元素
+        for depth in range(len(stack) - 1, -1, -1):
+            if stack[depth][0] == tag:
+                break
+        else:
+            continue
+        while len(stack) > depth:
+            _, open_start, content_start, children = stack.pop()
+            if len(children) > best_children:
+                best_children = len(children)
+                best = (html_content[open_start:content_start], content_start, match.start(), children)
+
+    return best
+
+
+def split_shards(html_content: str, count: int) -> Optional[List[str]]:
+    """
+    按列表容器的子元素把页面切成若干片段
+
+    Args:
+        html_content: 页面HTML内容
+        count: 容器内分片数量
+
+    Returns:
+        片段列表：第一个为容器之外的页面内容，其后为按文档顺序排列的容器分片；
+        容器的子元素少于 count 时返回None（不值得分片）
+    """
+    container = find_list_container(html_content)
+    if container is None:
+        return None
+    open_tag, content_start, content_end, children = container
+    if len(children) < count:
+        return None
+
+    tag = re.match(r'<([^\s/>]+)', open_tag).group(1)
+    close_tag = f'</{tag}>'
+    shards = [html_content[:content_start] + SHARD_SLOT + html_content[content_end:]]
+    bounds = [content_start] + [children[len(children) * i // count] for i in range(1, count)] + [content_end]
+    for start, end in zip(bounds, bounds[1:]):
+        shards.append(
+            f'<html><body>{open_tag}{SHARD_SLOT}{html_content[start:end]}{close_tag}</body></html>'
+        )
+    return shards
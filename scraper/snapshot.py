@@ -0,0 +1,386 @@
+"""
+快照模块，为数据文件保存多个版本，未变化的数据不重复存储
+"""
+from datetime import datetime
+from loguru import logger
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+import hashlib
+import json
+import shutil
+import os
+import sys
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import SNAPSHOT_DIR, STORAGE_CONFIG
+
+# Linux FICLONE ioctl，btrfs/xfs等文件系统上以写时复制方式克隆文件
+FICLONE = 0x40049409
+# 判断文件自上次快照以来是否变化的状态字段
+STATE_KEYS = ("size", "mtime_ns", "inode")
+
+
+def file_state(path) -> Dict[str, int]:
+    """返回文件的大小、修改时间和inode"""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "inode": stat.st_ino}
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """
+    尝试以写时复制方式克隆文件，耗时与文件大小无关
+
+    Returns:
+        是否克隆成功（文件系统不支持时返回False）
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as source, open(dst, "wb") as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        return True
+    except OSError:
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+
+
+class ChangeLog:
+    """
+    记录存储后端自上次快照以来写入数据文件的块，供快照只读取这些块
+
+    记录在关闭和快照时保存到数据文件旁的 .changes.json；每次写入前核对文件状态与上次写入后一致，
+    文件被其他程序修改、重写或进程异常退出时记录失效，下次快照完整读取文件后重新开始记录。
+    """
+
+    def __init__(self, path: Path, chunk_size: Optional[int] = None):
+        """
+        初始化变化记录
+
+        Args:
+            path: 数据文件路径
+            chunk_size: 切块大小（字节），默认使用 STORAGE_CONFIG["snapshot_chunk_size"]
+        """
+        self.path = Path(path)
+        self.chunk_size = chunk_size or STORAGE_CONFIG["snapshot_chunk_size"]
+        self.log_path = Path(f"{self.path}.changes.json")
+        self.state = self._load()
+
+    def _load(self) -> Optional[Dict]:
+        try:
+            with open(self.log_path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state["chunk_size"] != self.chunk_size or state["synced"] != file_state(self.path):
+                return None
+            return {**state, "chunks": set(state["chunks"])}
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self):
+        """保存记录；记录已失效时删除记录文件"""
+        if self.state is None:
+            if os.path.exists(self.log_path):
+                os.remove(self.log_path)
+            return
+        tmp_path = f"{self.log_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({**self.state, "chunks": sorted(self.state["chunks"])}, f)
+        os.replace(tmp_path, self.log_path)
+
+    def begin(self) -> bool:
+        """
+        写入前调用：文件状态与上次写入后不一致时（被其他程序修改）使记录失效
+
+        Returns:
+            记录是否有效
+        """
+        if self.state is not None and (not os.path.exists(self.path) or file_state(self.path) != self.state["synced"]):
+            self.state = None
+        return self.state is not None
+
+    def mark(self, start: int, end: int):
+        """记录写入的字节范围 [start, end)"""
+        if self.state is not None and end > start:
+            self.state["chunks"].update(range(start // self.chunk_size, (end - 1) // self.chunk_size + 1))
+
+    def commit(self):
+        """写入后调用，记录文件的新状态"""
+        if self.state is not None:
+            self.state["synced"] = file_state(self.path)
+
+    def invalidate(self):
+        """文件被整体重写，下次快照完整读取"""
+        self.state = None
+
+    def changes(self) -> Optional[Dict]:
+        """返回供 SnapshotStore.create 使用的变化记录，记录失效时返回None"""
+        if self.state is None:
+            return None
+        return {**self.state, "chunks": set(self.state["chunks"])}
+
+    def reset(self):
+        """快照成功后调用，从当前文件状态重新开始记录并保存"""
+        state = file_state(self.path)
+        self.state = {"since": state, "synced": state, "chunk_size": self.chunk_size, "chunks": set()}
+        self.save()
+
+
+class SnapshotStore:
+    """
+    数据文件快照仓库
+
+    每个快照是一个清单文件，记录各数据文件的内容。文件系统支持reflink时直接克隆文件，
+    否则把文件按固定大小切块、以sha256为名存入对象目录，各快照共享相同的块；
+    大小、修改时间和inode都未变化的文件直接沿用上一个快照的记录，无需读取。
+    变化的文件默认完整读取；写入文件的存储后端通过 ChangeLog 记录了自上次快照以来写入的块时，
+    只读取这些块（如CSV追加的尾部、SQLite WAL日志中的页）。
+    """
+
+    def __init__(self, root: Optional[Path] = None, keep: Optional[int] = None, chunk_size: Optional[int] = None):
+        """
+        初始化快照仓库
+
+        Args:
+            root: 快照目录，默认使用 SNAPSHOT_DIR
+            keep: 保留的快照数量，默认使用 STORAGE_CONFIG["snapshot_keep"]
+            chunk_size: 切块大小（字节），默认使用 STORAGE_CONFIG["snapshot_chunk_size"]
+        """
+        self.root = Path(root or SNAPSHOT_DIR)
+        self.keep = keep or STORAGE_CONFIG["snapshot_keep"]
+        self.chunk_size = chunk_size or STORAGE_CONFIG["snapshot_chunk_size"]
+        self.objects_dir = self.root / "objects"
+        self.clones_dir = self.root / "clones"
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def list(self) -> List[Dict]:
+        """
+        列出所有快照
+
+        Returns:
+            快照清单列表，按创建时间从旧到新排列
+        """
+        snapshots = []
+        for path in sorted(self.root.glob("*.json")):
+            with open(path, encoding="utf-8") as f:
+                snapshots.append(json.load(f))
+        return snapshots
+
+    def _load(self, snapshot_id: Optional[str], backend: Optional[str] = None) -> Optional[Dict]:
+        snapshots = self.list()
+        if snapshot_id is None:
+            # 最新的快照；指定存储后端时只在该后端创建的快照中查找
+            candidates = [snapshot for snapshot in snapshots if backend is None or snapshot.get("backend") == backend]
+            return candidates[-1] if candidates else None
+        return next((snapshot for snapshot in snapshots if snapshot["id"] == snapshot_id), None)
+
+    def create(self, paths: Iterable[Path], backend: Optional[str] = None,
+               changes: Optional[Dict[Path, Dict]] = None) -> Optional[str]:
+        """
+        为指定文件创建快照，并按保留策略清理旧快照
+
+        Args:
+            paths: 需要快照的文件，不存在的文件会被忽略
+            backend: 创建快照的存储后端，记录在清单中，恢复最新快照时按后端筛选
+            changes: 文件路径到 ChangeLog.changes() 的字典，记录与上次快照和当前文件状态都一致时只读取变化的块
+
+        Returns:
+            快照ID，没有可快照的文件或失败时返回None
+        """
+        try:
+            paths = [Path(path).resolve() for path in paths if os.path.exists(path)]
+            if not paths:
+                return None
+            changes = {str(Path(path).resolve()): change for path, change in (changes or {}).items()}
+
+            snapshot_id = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            previous_files = {}
+            for snapshot in self.list():
+                previous_files.update((entry["path"], entry) for entry in snapshot["files"])
+
+            files = []
+            stored_bytes = 0
+            for index, path in enumerate(paths):
+                entry, written = self._snapshot_file(
+                    snapshot_id, index, path, previous_files.get(str(path)), changes.get(str(path))
+                )
+                files.append(entry)
+                stored_bytes += written
+
+            manifest = {
+                "id": snapshot_id,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "backend": backend,
+                "files": files,
+            }
+            manifest_path = self.root / f"{snapshot_id}.json"
+            tmp_path = f"{manifest_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            os.replace(tmp_path, manifest_path)
+
+            total_bytes = sum(entry["size"] for entry in files)
+            logger.info(
+                f"成功创建快照 {snapshot_id}：{len(files)} 个文件，共 {total_bytes} 字节，"
+                f"新写入 {stored_bytes} 字节"
+            )
+            self.prune()
+            return snapshot_id
+
+        except Exception as e:
+            logger.error(f"创建快照失败: {str(e)}")
+            return None
+
+    def _snapshot_file(self, snapshot_id: str, index: int, path: Path, previous: Optional[Dict],
+                       change: Optional[Dict] = None):
+        """
+        快照单个文件
+
+        Returns:
+            (文件记录, 新写入的字节数)
+        """
+        entry = {"path": str(path), **file_state(path)}
+        unchanged = previous is not None and all(previous[key] == entry[key] for key in STATE_KEYS)
+
+        if unchanged and "chunks" in previous:
+            return {**entry, "chunks": previous["chunks"]}, 0
+
+        clone_path = self.clones_dir / snapshot_id / f"{index}-{path.name}"
+        os.makedirs(clone_path.parent, exist_ok=True)
+        if unchanged and "clone" in previous:
+            # 克隆文件只读不改，可以在快照间硬链接共享
+            os.link(self.root / previous["clone"], clone_path)
+            return {**entry, "clone": str(clone_path.relative_to(self.root))}, 0
+        if _reflink(path, clone_path):
+            return {**entry, "clone": str(clone_path.relative_to(self.root))}, 0
+        if not os.listdir(clone_path.parent):
+            os.rmdir(clone_path.parent)
+
+        chunks = []
+        written = 0
+        count = -(-entry["size"] // self.chunk_size)
+        with open(path, "rb") as f:
+            reusable = self._reusable_chunks(entry, previous, change)
+            for chunk_index in range(count):
+                if chunk_index in reusable:
+                    chunks.append(previous["chunks"][chunk_index])
+                    continue
+                f.seek(chunk_index * self.chunk_size)
+                data = f.read(self.chunk_size)
+                digest = hashlib.sha256(data).hexdigest()
+                object_path = self._object_path(digest)
+                if not os.path.exists(object_path):
+                    os.makedirs(object_path.parent, exist_ok=True)
+                    tmp_path = f"{object_path}.tmp"
+                    with open(tmp_path, "wb") as out:
+                        out.write(data)
+                    os.replace(tmp_path, object_path)
+                    written += len(data)
+                chunks.append(digest)
+        if reusable:
+            logger.debug(f"{path.name}: 沿用 {len(reusable)} 个未变化的块，读取 {count - len(reusable)} 个块")
+        return {**entry, "chunks": chunks}, written
+
+    def _reusable_chunks(self, entry: Dict, previous: Optional[Dict], change: Optional[Dict]) -> Set[int]:
+        """
+        找出内容与上次快照相同、无需重新读取的块
+
+        只信任写入方记录的变化（ChangeLog）：记录的起点与上次快照的文件状态一致、终点与当前状态一致，
+        且切块大小相同时，沿用上次快照中未被写入的完整块；否则返回空集合，完整读取文件。
+
+        Args:
+            entry: 文件当前的记录
+            previous: 上次快照中该文件的记录
+            change: 写入方记录的变化，见 ChangeLog.changes
+
+        Returns:
+            可沿用的块序号集合
+        """
+        if previous is None or "chunks" not in previous or change is None:
+            return set()
+        if (change["chunk_size"] != self.chunk_size
+                or any(change["since"][key] != previous[key] for key in STATE_KEYS)
+                or any(change["synced"][key] != entry[key] for key in STATE_KEYS)):
+            return set()
+        full_chunks = min(previous["size"], entry["size"]) // self.chunk_size
+        return set(range(full_chunks)) - set(change["chunks"])
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def restore(self, snapshot_id: Optional[str] = None, backend: Optional[str] = None) -> Optional[str]:
+        """
+        把快照中的文件恢复到原路径，每个文件先写入临时文件再原子替换
+
+        Args:
+            snapshot_id: 快照ID，默认恢复最新的快照
+            backend: 未指定快照ID时，只在该存储后端创建的快照中选择最新的一个
+
+        Returns:
+            恢复的快照ID，快照不存在或恢复失败时返回None
+        """
+        try:
+            snapshot = self._load(snapshot_id, backend)
+            if snapshot is None:
+                if snapshot_id:
+                    logger.error(f"快照不存在: {snapshot_id}")
+                else:
+                    logger.error(f"没有{f' {backend} 存储后端的' if backend else '任何'}快照")
+                return None
+            if backend and snapshot.get("backend") not in (None, backend):
+                logger.warning(f"快照 {snapshot['id']} 由 {snapshot['backend']} 存储后端创建，当前后端为 {backend}")
+
+            for entry in snapshot["files"]:
+                path = Path(entry["path"])
+                os.makedirs(path.parent, exist_ok=True)
+                tmp_path = Path(f"{path}.restore")
+                if "clone" in entry:
+                    if not _reflink(self.root / entry["clone"], tmp_path):
+                        shutil.copyfile(self.root / entry["clone"], tmp_path)
+                else:
+                    with open(tmp_path, "wb") as out:
+                        for digest in entry["chunks"]:
+                            with open(self._object_path(digest), "rb") as f:
+                                data = f.read()
+                            if hashlib.sha256(data).hexdigest() != digest:
+                                raise ValueError(f"快照数据块已损坏: {digest}")
+                            out.write(data)
+                if os.path.getsize(tmp_path) != entry["size"]:
+                    raise ValueError(f"恢复的文件大小不一致: {path}")
+                os.replace(tmp_path, path)
+                # 旧的SQLite日志文件属于被替换的数据库，必须一并删除
+                for suffix in ("-wal", "-shm"):
+                    if os.path.exists(f"{path}{suffix}"):
+                        os.remove(f"{path}{suffix}")
+
+            logger.info(f"成功恢复快照 {snapshot['id']}（{len(snapshot['files'])} 个文件）")
+            return snapshot["id"]
+
+        except Exception as e:
+            logger.error(f"恢复快照失败: {str(e)}")
+            return None
+
+    def prune(self):
+        """删除超出保留数量的旧快照，并清理不再被引用的数据块"""
+        snapshots = self.list()
+        expired = snapshots[:-self.keep] if len(snapshots) > self.keep else []
+        for snapshot in expired:
+            os.remove(self.root / f"{snapshot['id']}.json")
+            shutil.rmtree(self.clones_dir / snapshot["id"], ignore_errors=True)
+        if not expired:
+            return
+
+        referenced = {
+            digest
+            for snapshot in snapshots[len(expired):]
+            for entry in snapshot["files"]
+            for digest in entry.get("chunks", ())
+        }
+        removed = 0
+        for object_path in self.objects_dir.glob("*/*"):
+            if object_path.name not in referenced:
+                os.remove(object_path)
+                removed += 1
+        logger.info(f"清理 {len(expired)} 个旧快照，删除 {removed} 个数据块")
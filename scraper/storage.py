@@ -1,16 +1,67 @@
 """
-数据存储模块，负责将工具信息保存到CSV文件
+数据存储模块，负责将工具信息保存到CSV文件、SQLite数据库或Parquet数据集
 """
 import pandas as pd
+from datetime import date, datetime
 from pathlib import Path
 from loguru import logger
-from typing import List, Dict
+from typing import Any, Iterable, List, Dict, Optional, Set, Tuple
+import json
+import sqlite3
+import struct
+import threading
+import uuid
 import os
 import sys
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import STORAGE_CONFIG, TOOLS_CSV
+from config import (
+    PARQUET_DIR, PARQUET_URL_INDEX_PATH, SCRAPER_CONFIG, STORAGE_CONFIG, TOOLS_CSV, TOOLS_DB, URL_INDEX_PATH
+)
+from scraper.records import tool_columns, tools_to_arrow, tools_to_dataframe
+from scraper.snapshot import ChangeLog, SnapshotStore
+from scraper.url_index import UrlIndex
+
+# WAL日志文件头和帧头的长度（字节）
+WAL_HEADER_SIZE = 32
+WAL_FRAME_HEADER_SIZE = 24
+# WAL日志超过该大小时合并进数据库文件（与SQLite默认的1000页自动检查点相当）
+WAL_CHECKPOINT_BYTES = 4 * 1024 * 1024
+
+
+def _wal_pages(wal_path) -> Tuple[Set[int], int]:
+    """
+    读取WAL日志中写入过的页号
+
+    只读取帧头，不校验帧的校验和：未提交的帧也会被计入，多报的页只会让快照多读取数据块。
+
+    Args:
+        wal_path: WAL日志路径
+
+    Returns:
+        (页号集合, 页大小)；没有WAL日志时返回空集合和0
+    """
+    pages = set()
+    try:
+        with open(wal_path, "rb") as f:
+            header = f.read(WAL_HEADER_SIZE)
+            if len(header) < WAL_HEADER_SIZE:
+                return pages, 0
+            page_size = struct.unpack(">I", header[8:12])[0]
+            page_size = 65536 if page_size == 1 else page_size
+            salts = header[16:24]
+            while True:
+                frame = f.read(WAL_FRAME_HEADER_SIZE)
+                # 有效的帧是日志开头的一段，与文件头盐值不同的帧属于已合并的旧日志
+                if len(frame) < WAL_FRAME_HEADER_SIZE or frame[8:16] != salts:
+                    break
+                pages.add(struct.unpack(">I", frame[:4])[0])
+                f.seek(page_size, os.SEEK_CUR)
+    except FileNotFoundError:
+        return pages, 0
+    return pages, page_size
+
 
 class DataStorage:
     """数据存储管理器"""
@@ -19,6 +70,9 @@ class DataStorage:
         """初始化数据存储管理器"""
         self.csv_path = TOOLS_CSV
         self._ensure_data_dir()
+        self.url_index = None
+        # 自上次快照以来追加的块，快照时只读取这些块
+        self._changes = ChangeLog(self.csv_path)
         
     def _ensure_data_dir(self):
         """确保数据目录存在"""
@@ -40,14 +94,17 @@ class DataStorage:
                 logger.warning("没有工具信息需要保存")
                 return False
                 
-            df = pd.DataFrame(tools)
-            
-            # 确保列的顺序符合配置
-            df = df.reindex(columns=STORAGE_CONFIG["csv_columns"])
+            # 按配置的列顺序逐列构建，工具记录和字典均可
+            df = tools_to_dataframe(tools, STORAGE_CONFIG["csv_columns"])
             
             # 如果文件不存在且模式为追加，则写入表头
             header = True if mode == 'w' or not os.path.exists(self.csv_path) else False
             
+            # 追加时记录写入的字节范围，覆盖时下次快照完整读取
+            offset = 0 if header else os.path.getsize(self.csv_path)
+            if mode == 'w' or not self._changes.begin():
+                self._changes.invalidate()
+            
             # 保存到CSV文件
             df.to_csv(
                 self.csv_path,
@@ -56,6 +113,12 @@ class DataStorage:
                 index=False,
                 encoding=STORAGE_CONFIG["csv_encoding"]
             )
+            self._changes.mark(offset, os.path.getsize(self.csv_path))
+            self._changes.commit()
+            
+            # 增量更新URL索引
+            if self.url_index is not None:
+                self.url_index.add_many(df['url'].dropna())
             
             logger.info(f"成功保存 {len(tools)} 个工具信息到 {self.csv_path}")
             return True
@@ -64,54 +127,80 @@ class DataStorage:
             logger.error(f"保存工具信息失败: {str(e)}")
             return False
             
-    def load_existing_tools(self) -> set:
+    def load_existing_tools(self):
         """
-        加载已存在的工具URL，用于去重
+        打开已存在工具的URL索引，用于去重
+        
+        索引保存在磁盘上并在每次保存时增量更新，启动时无需读取CSV；
+        仅在索引为空而CSV已有数据时（首次使用或索引被删除）从CSV构建一次。
         
         Returns:
-            已存在工具URL的集合
+            支持 in 和 contains_many 查询的URL索引，打开失败时返回空集合
         """
         try:
-            if not os.path.exists(self.csv_path):
-                return set()
-                
-            df = pd.read_csv(
-                self.csv_path,
-                encoding=STORAGE_CONFIG["csv_encoding"]
-            )
-            return set(df['url'].unique())
+            if self.url_index is None:
+                self.url_index = UrlIndex(
+                    URL_INDEX_PATH,
+                    bloom_capacity=STORAGE_CONFIG["bloom_capacity"],
+                    bloom_error_rate=STORAGE_CONFIG["bloom_error_rate"]
+                )
+                if not len(self.url_index) and os.path.exists(self.csv_path):
+                    self.rebuild_url_index()
+            
+            logger.info(f"URL索引中已有 {len(self.url_index)} 个工具")
+            return self.url_index
             
         except Exception as e:
             logger.error(f"加载已存在工具信息失败: {str(e)}")
             return set()
-            
-    def backup_csv(self) -> bool:
+    
+    def rebuild_url_index(self) -> bool:
         """
-        备份CSV文件
+        根据CSV文件重建URL索引（CSV被手动修改或从备份恢复后使用）
         
         Returns:
-            备份是否成功
+            重建是否成功
         """
         try:
-            if not os.path.exists(self.csv_path):
+            if self.url_index is None:
                 return False
-                
-            backup_path = str(self.csv_path) + '.bak'
-            pd.read_csv(
-                self.csv_path,
-                encoding=STORAGE_CONFIG["csv_encoding"]
-            ).to_csv(
-                backup_path,
-                index=False,
-                encoding=STORAGE_CONFIG["csv_encoding"]
-            )
             
-            logger.info(f"成功备份CSV文件到 {backup_path}")
+            self.url_index.clear()
+            if os.path.exists(self.csv_path):
+                for chunk in pd.read_csv(
+                    self.csv_path,
+                    encoding=STORAGE_CONFIG["csv_encoding"],
+                    usecols=['url'],
+                    chunksize=STORAGE_CONFIG["read_chunk_size"]
+                ):
+                    self.url_index.add_many(chunk['url'].dropna())
+            
+            logger.info(f"成功从CSV重建URL索引，共 {len(self.url_index)} 个工具")
             return True
             
         except Exception as e:
-            logger.error(f"备份CSV文件失败: {str(e)}")
+            logger.error(f"重建URL索引失败: {str(e)}")
             return False
+    
+    def close(self):
+        """关闭URL索引并保存自上次快照以来追加的块"""
+        if self.url_index is not None:
+            self.url_index.close()
+            self.url_index = None
+        self._changes.save()
+            
+    def snapshot(self) -> bool:
+        """
+        为CSV文件创建快照（替代原先整文件读写的备份），按保留策略保留多个版本
+        
+        Returns:
+            快照是否创建成功
+        """
+        changes = {self.csv_path: self._changes.changes()}
+        if SnapshotStore().create([self.csv_path], backend="csv", changes=changes) is None:
+            return False
+        self._changes.reset()
+        return True
             
     def merge_duplicates(self) -> bool:
         """
@@ -138,12 +227,15 @@ class DataStorage:
                 keep='last'
             )
             
-            # 保存清理后的数据
+            # 保存清理后的数据：写入新文件后替换，文件被整体重写，下次快照完整读取
+            tmp_path = f"{self.csv_path}.tmp"
             df_cleaned.to_csv(
-                self.csv_path,
+                tmp_path,
                 index=False,
                 encoding=STORAGE_CONFIG["csv_encoding"]
             )
+            os.replace(tmp_path, self.csv_path)
+            self._changes.invalidate()
             
             removed_count = len(df) - len(df_cleaned)
             logger.info(f"成功移除 {removed_count} 条重复记录")
@@ -151,4 +243,536 @@ class DataStorage:
             
         except Exception as e:
             logger.error(f"合并重复记录失败: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+
+class SQLiteStorage:
+    """SQLite数据存储管理器，以URL为主键upsert，接口与 DataStorage 一致"""
+    
+    def __init__(self):
+        """初始化SQLite数据存储管理器"""
+        self.db_path = TOOLS_DB
+        self.csv_path = TOOLS_CSV
+        self.columns = STORAGE_CONFIG["csv_columns"]
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        
+        self._lock = threading.RLock()
+        # 自上次快照以来变化的块，快照时只读取这些块
+        self._changes = ChangeLog(self.db_path)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # 关闭自动检查点，由 _checkpoint 先记录WAL日志中变化的页再合并
+        self._conn.execute("PRAGMA wal_autocheckpoint=0")
+        column_defs = ", ".join(
+            f"{column} TEXT PRIMARY KEY" if column == 'url' else f"{column} TEXT NOT NULL DEFAULT ''"
+            for column in self.columns
+        )
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS tools ({column_defs})")
+        self._conn.commit()
+        
+        # 非空的新值覆盖旧值，空值不覆盖已有数据（如详情页补全的字段）
+        updates = ", ".join(
+            f"{column} = COALESCE(NULLIF(excluded.{column}, ''), tools.{column})"
+            for column in self.columns if column != 'url'
+        )
+        self._upsert_sql = (
+            f"INSERT INTO tools ({', '.join(self.columns)}) "
+            f"VALUES ({', '.join('?' * len(self.columns))}) "
+            f"ON CONFLICT(url) DO UPDATE SET {updates}"
+        )
+    
+    def _checkpoint(self):
+        """记录WAL日志中变化的页所在的块，再把日志合并进数据库文件（调用方持有锁）"""
+        if self._changes.begin():
+            pages, page_size = _wal_pages(f"{self.db_path}-wal")
+            for page in pages:
+                self._changes.mark((page - 1) * page_size, page * page_size)
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._changes.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tools").fetchone()[0]
+    
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM tools WHERE url = ?", (url,)).fetchone() is not None
+    
+    def contains_many(self, urls: Iterable[str]) -> Set[str]:
+        """
+        批量查询URL是否已存在
+        
+        Returns:
+            已存在的URL集合
+        """
+        candidates = list(dict.fromkeys(urls))
+        found = set()
+        with self._lock:
+            for start in range(0, len(candidates), 500):
+                chunk = candidates[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(
+                    url for (url,) in
+                    self._conn.execute(f"SELECT url FROM tools WHERE url IN ({placeholders})", chunk)
+                )
+        return found
+    
+    def save_tools(self, tools: List[Dict[str, str]], mode: str = 'a') -> bool:
+        """
+        保存工具信息到数据库，按 batch_size 分批在事务中upsert
+        
+        Args:
+            tools: 工具信息列表
+            mode: 写入模式，'a'为追加（按URL upsert），'w'为覆盖
+            
+        Returns:
+            保存是否成功
+        """
+        try:
+            if not tools:
+                logger.warning("没有工具信息需要保存")
+                return False
+            
+            columns = tool_columns(tools, self.columns)
+            url_position = self.columns.index('url')
+            rows = [
+                row for row in zip(*(map(str, columns[column]) for column in self.columns))
+                if row[url_position]
+            ]
+            batch_size = SCRAPER_CONFIG["batch_size"]
+            with self._lock:
+                if mode == 'w':
+                    with self._conn:
+                        self._conn.execute("DELETE FROM tools")
+                for start in range(0, len(rows), batch_size):
+                    with self._conn:
+                        self._conn.executemany(self._upsert_sql, rows[start:start + batch_size])
+                wal_path = f"{self.db_path}-wal"
+                if os.path.exists(wal_path) and os.path.getsize(wal_path) > WAL_CHECKPOINT_BYTES:
+                    self._checkpoint()
+            
+            logger.info(f"成功保存 {len(rows)} 个工具信息到 {self.db_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"保存工具信息失败: {str(e)}")
+            return False
+    
+    def load_existing_tools(self):
+        """
+        返回已存在工具的URL查询接口，用于去重
+        
+        数据库为空而CSV已有数据时（从CSV存储迁移），先把CSV导入数据库。
+        
+        Returns:
+            支持 in 和 contains_many 查询的存储对象本身
+        """
+        try:
+            if not len(self) and os.path.exists(self.csv_path):
+                self.import_csv(self.csv_path)
+            logger.info(f"数据库中已有 {len(self)} 个工具")
+            return self
+            
+        except Exception as e:
+            logger.error(f"加载已存在工具信息失败: {str(e)}")
+            return set()
+    
+    def import_csv(self, csv_path: Path) -> bool:
+        """
+        分块导入CSV文件中的工具信息
+        
+        Returns:
+            导入是否成功
+        """
+        try:
+            for chunk in pd.read_csv(
+                csv_path,
+                encoding=STORAGE_CONFIG["csv_encoding"],
+                dtype=str,
+                keep_default_na=False,
+                chunksize=STORAGE_CONFIG["read_chunk_size"]
+            ):
+                self.save_tools(chunk.reindex(columns=self.columns, fill_value="").to_dict('records'))
+            logger.info(f"成功从 {csv_path} 导入工具信息")
+            return True
+            
+        except Exception as e:
+            logger.error(f"导入CSV文件失败: {str(e)}")
+            return False
+    
+    def export_csv(self, csv_path: Path = None) -> bool:
+        """
+        分块导出数据库内容为CSV文件
+        
+        Args:
+            csv_path: 导出路径，默认为 TOOLS_CSV
+            
+        Returns:
+            导出是否成功
+        """
+        csv_path = csv_path or self.csv_path
+        try:
+            tmp_path = f"{csv_path}.tmp"
+            header = True
+            with self._lock:
+                for chunk in pd.read_sql_query(
+                    f"SELECT {', '.join(self.columns)} FROM tools ORDER BY added_date, url",
+                    self._conn,
+                    chunksize=STORAGE_CONFIG["read_chunk_size"]
+                ):
+                    chunk.to_csv(
+                        tmp_path,
+                        mode='w' if header else 'a',
+                        header=header,
+                        index=False,
+                        encoding=STORAGE_CONFIG["csv_encoding"]
+                    )
+                    header = False
+            if header:
+                pd.DataFrame(columns=self.columns).to_csv(tmp_path, index=False, encoding=STORAGE_CONFIG["csv_encoding"])
+            os.replace(tmp_path, csv_path)
+            
+            logger.info(f"成功导出CSV文件到 {csv_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"导出CSV文件失败: {str(e)}")
+            return False
+    
+    def snapshot(self) -> bool:
+        """
+        把WAL日志合并进数据库文件后为数据库创建快照
+        
+        Returns:
+            快照是否创建成功
+        """
+        try:
+            with self._lock:
+                self._checkpoint()
+                changes = {self.db_path: self._changes.changes()}
+                if SnapshotStore().create([self.db_path], backend="sqlite", changes=changes) is None:
+                    return False
+                self._changes.reset()
+                return True
+            
+        except Exception as e:
+            logger.error(f"创建数据库快照失败: {str(e)}")
+            return False
+    
+    def merge_duplicates(self) -> bool:
+        """
+        URL为主键，写入时已按URL合并，无需重写数据
+        
+        Returns:
+            始终返回True
+        """
+        logger.debug("SQLite存储按URL upsert，无需合并重复记录")
+        return True
+    
+    def close(self):
+        """合并WAL日志并记录变化的块后关闭数据库连接"""
+        with self._lock:
+            try:
+                self._checkpoint()
+            except sqlite3.Error as e:
+                logger.warning(f"合并WAL日志失败: {str(e)}")
+                self._changes.invalidate()
+            self._conn.close()
+            self._changes.commit()
+            self._changes.save()
+
+
+class ParquetStorage:
+    """
+    Parquet数据存储管理器，按抓取日期和/或分类分区，只追加写入新文件并维护清单
+    
+    清单文件记录所有数据文件，读取时只打开清单中的文件，支持列裁剪和谓词下推。
+    """
+    
+    MANIFEST_NAME = "_manifest.json"
+    
+    def __init__(self):
+        """初始化Parquet数据存储管理器"""
+        try:
+            import pyarrow as pa
+            import pyarrow.dataset as ds
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet存储需要安装 pyarrow: pip install pyarrow") from e
+        self._pa, self._ds, self._pq = pa, ds, pq
+        
+        self.root = PARQUET_DIR
+        self.manifest_path = self.root / self.MANIFEST_NAME
+        self.columns = STORAGE_CONFIG["csv_columns"]
+        self.partition_cols = STORAGE_CONFIG["parquet_partition_by"]
+        os.makedirs(self.root, exist_ok=True)
+        
+        self.schema = pa.schema([(column, pa.string()) for column in self.columns + ['crawl_date']])
+        self.partitioning = ds.partitioning(
+            pa.schema([self.schema.field(column) for column in self.partition_cols]),
+            flavor='hive'
+        )
+        self._lock = threading.Lock()
+        self.url_index = None
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        if not os.path.exists(self.manifest_path):
+            return {"version": 1, "rows": 0, "files": []}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+    
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        """原子地写入清单文件"""
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def save_tools(self, tools: List[Dict[str, str]], mode: str = 'a') -> bool:
+        """
+        把工具信息写入新的Parquet文件（每个分区一个文件）并更新清单
+        
+        Args:
+            tools: 工具信息列表
+            mode: 写入模式，'a'为追加，'w'为覆盖
+            
+        Returns:
+            保存是否成功
+        """
+        try:
+            if not tools:
+                logger.warning("没有工具信息需要保存")
+                return False
+            
+            # 空的分区值写为null，读取时再还原为空字符串
+            table = tools_to_arrow(
+                tools, self.schema, extra={'crawl_date': date.today().isoformat()}, null_empty=self.partition_cols
+            )
+            
+            with self._lock:
+                manifest = self._load_manifest()
+                if mode == 'w':
+                    for entry in manifest["files"]:
+                        path = self.root / entry["path"]
+                        if os.path.exists(path):
+                            os.remove(path)
+                    manifest = {"version": 1, "rows": 0, "files": []}
+                
+                written = []
+                self._ds.write_dataset(
+                    table,
+                    str(self.root),
+                    format='parquet',
+                    partitioning=self.partitioning,
+                    basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                    existing_data_behavior='overwrite_or_ignore',
+                    file_options=self._ds.ParquetFileFormat().make_write_options(
+                        compression=STORAGE_CONFIG["parquet_compression"]
+                    ),
+                    file_visitor=written.append
+                )
+                
+                created_at = datetime.now().isoformat(timespec='seconds')
+                for written_file in written:
+                    manifest["files"].append({
+                        "path": os.path.relpath(written_file.path, self.root),
+                        "rows": written_file.metadata.num_rows,
+                        "created_at": created_at
+                    })
+                    manifest["rows"] += written_file.metadata.num_rows
+                self._write_manifest(manifest)
+            
+            if self.url_index is not None:
+                self.url_index.add_many(table.column('url').to_pylist())
+            
+            logger.info(f"成功保存 {len(tools)} 个工具信息到 {self.root}（{len(written)} 个文件）")
+            return True
+            
+        except Exception as e:
+            logger.error(f"保存工具信息失败: {str(e)}")
+            return False
+    
+    def read_tools(self, columns: Optional[List[str]] = None,
+                   filters: Optional[List[Tuple[str, str, Any]]] = None) -> pd.DataFrame:
+        """
+        读取工具信息，只扫描清单中的文件
+        
+        Args:
+            columns: 需要读取的列（列裁剪），默认读取全部列
+            filters: 过滤条件（谓词下推），如 [('crawl_date', '>=', '2024-01-01'), ('category', '==', 'writing')]；
+                分区列上的条件直接跳过不相关的文件
+            
+        Returns:
+            工具信息DataFrame
+        """
+        manifest = self._load_manifest()
+        if not manifest["files"]:
+            return pd.DataFrame(columns=columns or self.schema.names)
+        
+        dataset = self._ds.dataset(
+            [str(self.root / entry["path"]) for entry in manifest["files"]],
+            schema=self.schema,
+            format='parquet',
+            partitioning=self.partitioning,
+            partition_base_dir=str(self.root)
+        )
+        table = dataset.to_table(
+            columns=columns,
+            filter=self._pq.filters_to_expression(filters) if filters else None
+        )
+        return table.to_pandas().fillna("")
+    
+    def load_existing_tools(self):
+        """
+        打开已存在工具的URL索引，用于去重
+        
+        Returns:
+            支持 in 和 contains_many 查询的URL索引，打开失败时返回空集合
+        """
+        try:
+            if self.url_index is None:
+                self.url_index = UrlIndex(
+                    PARQUET_URL_INDEX_PATH,
+                    bloom_capacity=STORAGE_CONFIG["bloom_capacity"],
+                    bloom_error_rate=STORAGE_CONFIG["bloom_error_rate"]
+                )
+                if not len(self.url_index) and self._load_manifest()["rows"]:
+                    self.rebuild_url_index()
+            
+            logger.info(f"URL索引中已有 {len(self.url_index)} 个工具")
+            return self.url_index
+            
+        except Exception as e:
+            logger.error(f"加载已存在工具信息失败: {str(e)}")
+            return set()
+    
+    def rebuild_url_index(self) -> bool:
+        """
+        根据Parquet数据集重建URL索引（从快照恢复后使用）
+        
+        Returns:
+            重建是否成功
+        """
+        try:
+            if self.url_index is None:
+                return False
+            
+            self.url_index.clear()
+            if self._load_manifest()["rows"]:
+                self.url_index.add_many(self.read_tools(columns=['url'])['url'])
+            
+            logger.info(f"成功从Parquet数据集重建URL索引，共 {len(self.url_index)} 个工具")
+            return True
+            
+        except Exception as e:
+            logger.error(f"重建URL索引失败: {str(e)}")
+            return False
+    
+    def snapshot(self) -> bool:
+        """
+        为清单和数据文件创建快照；数据文件只追加不修改，已快照过的文件不会被重新读取
+        
+        Returns:
+            快照是否创建成功
+        """
+        with self._lock:
+            manifest = self._load_manifest()
+            paths = [self.manifest_path] + [self.root / entry["path"] for entry in manifest["files"]]
+            return SnapshotStore().create(paths, backend="parquet") is not None
+    
+    def merge_duplicates(self) -> bool:
+        """
+        写入前已按URL索引去重，数据文件只追加，无需重写
+        
+        Returns:
+            始终返回True
+        """
+        logger.debug("Parquet存储只追加新工具，无需合并重复记录")
+        return True
+    
+    def compact(self, min_files: Optional[int] = None) -> bool:
+        """
+        把文件数不少于 min_files 的分区合并为一个文件
+
+        每次保存在每个分区写入一个新文件，长期运行后小文件增多会拖慢读取。先写入合并后的文件，
+        再原子地更新清单，最后删除旧文件；中途失败时清单仍指向旧文件，多出的文件不会被读取。
+
+        Args:
+            min_files: 分区文件数阈值，默认使用 STORAGE_CONFIG["parquet_compact_min_files"]
+
+        Returns:
+            合并是否成功（没有需要合并的分区时也返回True）
+        """
+        min_files = STORAGE_CONFIG["parquet_compact_min_files"] if min_files is None else min_files
+        if min_files < 2:
+            return True
+        try:
+            with self._lock:
+                manifest = self._load_manifest()
+                partitions: Dict[str, List[Dict[str, Any]]] = {}
+                for entry in manifest["files"]:
+                    partitions.setdefault(os.path.dirname(entry["path"]), []).append(entry)
+
+                removed = []
+                compacted = 0
+                for partition, entries in partitions.items():
+                    if len(entries) < min_files:
+                        continue
+                    # 分区列的值在目录名中，文件内只保存其余列
+                    paths = [str(self.root / entry["path"]) for entry in entries]
+                    table = self._ds.dataset(paths, format='parquet').to_table(
+                        columns=[name for name in self.schema.names if name not in self.partition_cols]
+                    )
+                    relpath = os.path.join(partition, f"part-{uuid.uuid4().hex}-compacted.parquet")
+                    self._pq.write_table(
+                        table, str(self.root / relpath), compression=STORAGE_CONFIG["parquet_compression"]
+                    )
+                    paths_set = {entry["path"] for entry in entries}
+                    manifest["files"] = [entry for entry in manifest["files"] if entry["path"] not in paths_set]
+                    manifest["files"].append({
+                        "path": relpath,
+                        "rows": table.num_rows,
+                        "created_at": datetime.now().isoformat(timespec='seconds')
+                    })
+                    removed += paths
+                    compacted += 1
+
+                if not compacted:
+                    return True
+                self._write_manifest(manifest)
+                for path in removed:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+
+            logger.info(f"已合并 {compacted} 个分区的 {len(removed)} 个Parquet文件")
+            return True
+
+        except Exception as e:
+            logger.error(f"合并Parquet文件失败: {str(e)}")
+            return False
+    
+    def close(self):
+        """关闭URL索引"""
+        if self.url_index is not None:
+            self.url_index.close()
+            self.url_index = None
+
+
+def create_storage():
+    """
+    根据 STORAGE_CONFIG["backend"] 创建数据存储管理器
+    
+    Returns:
+        DataStorage（csv）、SQLiteStorage（sqlite）或 ParquetStorage（parquet）
+    """
+    backend = STORAGE_CONFIG["backend"]
+    if backend == "csv":
+        return DataStorage()
+    if backend == "sqlite":
+        return SQLiteStorage()
+    if backend == "parquet":
+        return ParquetStorage()
+    raise ValueError(f"未知的存储后端: {backend}，可选值: csv, sqlite, parquet")
@@ -0,0 +1,180 @@
+"""
+URL索引模块，持久化记录已保存工具的URL，用于快速去重
+"""
+from loguru import logger
+from pathlib import Path
+from typing import Iterable, Optional, Set
+import hashlib
+import math
+import sqlite3
+import struct
+import threading
+import os
+
+
+class BloomFilter:
+    """布隆过滤器，用于在查询索引前快速排除一定不存在的URL"""
+
+    _HEADER = struct.Struct("<QQQ")  # 位数、哈希函数个数、已包含的元素数
+
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        初始化布隆过滤器
+
+        Args:
+            capacity: 预期元素数量
+            error_rate: 预期误判率
+        """
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def save(self, path: Path):
+        """原子地写入磁盘"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self._HEADER.pack(self.size, self.hash_count, self.count))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["BloomFilter"]:
+        """从磁盘读取，文件不存在或损坏时返回None"""
+        try:
+            with open(path, "rb") as f:
+                size, hash_count, count = cls._HEADER.unpack(f.read(cls._HEADER.size))
+                bits = bytearray(f.read())
+        except (OSError, struct.error):
+            return None
+        if len(bits) != (size + 7) // 8:
+            return None
+        bloom = cls.__new__(cls)
+        bloom.size, bloom.hash_count, bloom.count, bloom.bits = size, hash_count, count, bits
+        return bloom
+
+
+class UrlIndex:
+    """基于SQLite的持久化URL索引，保存时增量更新，启动耗时与历史记录数无关"""
+
+    def __init__(self, path: Path, bloom_capacity: int = 0, bloom_error_rate: float = 0.01):
+        """
+        打开（或创建）URL索引
+
+        Args:
+            path: SQLite索引文件路径
+            bloom_capacity: 布隆过滤器预期容量，0表示不使用布隆过滤器
+            bloom_error_rate: 布隆过滤器误判率
+        """
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY) WITHOUT ROWID")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('count', 0)")
+        self._conn.commit()
+
+        self.bloom_path = Path(f"{self.path}.bloom")
+        self._bloom_capacity = bloom_capacity
+        self._bloom_error_rate = bloom_error_rate
+        self.bloom = self._load_bloom() if bloom_capacity else None
+
+    def _load_bloom(self) -> BloomFilter:
+        """加载布隆过滤器；与索引记录数不一致（如上次异常退出）时从索引重建"""
+        bloom = BloomFilter.load(self.bloom_path)
+        if bloom is not None and bloom.count == len(self):
+            return bloom
+
+        logger.info("布隆过滤器与URL索引不一致，从索引重建")
+        bloom = BloomFilter(max(self._bloom_capacity, len(self)), self._bloom_error_rate)
+        for (url,) in self._conn.execute("SELECT url FROM urls"):
+            bloom.add(url)
+        return bloom
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT value FROM meta WHERE key = 'count'").fetchone()[0]
+
+    def __contains__(self, url: str) -> bool:
+        if self.bloom is not None and url not in self.bloom:
+            return False
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM urls WHERE url = ?", (url,)).fetchone() is not None
+
+    def contains_many(self, urls: Iterable[str]) -> Set[str]:
+        """
+        批量查询URL是否已存在
+
+        Args:
+            urls: 待查询的URL
+
+        Returns:
+            已存在于索引中的URL集合
+        """
+        candidates = list(dict.fromkeys(urls))
+        if self.bloom is not None:
+            candidates = [url for url in candidates if url in self.bloom]
+
+        found = set()
+        with self._lock:
+            # 分块查询，避免超出SQLite参数数量限制
+            for start in range(0, len(candidates), 500):
+                chunk = candidates[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(
+                    url for (url,) in
+                    self._conn.execute(f"SELECT url FROM urls WHERE url IN ({placeholders})", chunk)
+                )
+        return found
+
+    def add_many(self, urls: Iterable[str]) -> int:
+        """
+        把URL加入索引
+
+        Returns:
+            新加入的URL数量
+        """
+        urls = [url for url in dict.fromkeys(urls) if url]
+        with self._lock:
+            before = self._conn.total_changes
+            with self._conn:
+                self._conn.executemany("INSERT OR IGNORE INTO urls (url) VALUES (?)", ((url,) for url in urls))
+                inserted = self._conn.total_changes - before
+                self._conn.execute("UPDATE meta SET value = value + ? WHERE key = 'count'", (inserted,))
+            if self.bloom is not None and inserted:
+                for url in urls:
+                    self.bloom.add(url)
+                # 重复URL也被计入了布隆过滤器，以索引记录数为准
+                self.bloom.count = len(self)
+        return inserted
+
+    def clear(self):
+        """清空索引"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM urls")
+            self._conn.execute("UPDATE meta SET value = 0 WHERE key = 'count'")
+        if self.bloom is not None:
+            self.bloom = BloomFilter(self._bloom_capacity, self._bloom_error_rate)
+
+    def close(self):
+        """保存布隆过滤器并关闭数据库连接"""
+        with self._lock:
+            if self.bloom is not None:
+                self.bloom.save(self.bloom_path)
+            self._conn.close()
@@ -0,0 +1,89 @@
+"""
+测试公共配置：把项目根目录加入Python路径，并在导入 config 之前把数据目录指向临时目录，
+避免测试读写 data/ 下的真实数据
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+sys.path.append(os.path.join(ROOT_DIR, "benchmarks"))
+
+TEST_DATA_DIR = tempfile.mkdtemp(prefix="scraper_tests_")
+os.environ["SCRAPER_DATA_DIR"] = TEST_DATA_DIR
+# 基准测试套件的存储测试与其余测试共用同一个数据目录（config 只读取一次数据目录）
+os.environ["BENCH_SUITE_DATA_DIR"] = TEST_DATA_DIR
+
+import pytest
+
+
+def make_tools(start, count, description="d", category="writing"):
+    """
+    生成URL互不相同的工具信息
+
+    Args:
+        start: 起始序号
+        count: 工具数量
+        description: 描述文本
+        category: 分类，或按序号返回分类的函数
+
+    Returns:
+        工具字典列表
+    """
+    return [
+        {"tool_name": f"Tool {i}", "description": description, "url": f"https://www.toolify.ai/tool/tool-{i}",
+         "category": category(i) if callable(category) else category, "added_date": "2024-01-01"}
+        for i in range(start, start + count)
+    ]
+
+
+class MemoryStorage:
+    """在内存中记录已保存工具URL的存储"""
+
+    def __init__(self):
+        self.saved = []
+
+    def save_tools(self, tools, mode='a'):
+        self.saved.extend(tool['url'] for tool in tools)
+        return True
+
+
+class RecordingSink:
+    """记录收到的工具并按已保存URL去重的写入器，接口与 DedupSink 相同"""
+
+    def __init__(self, saved_urls=()):
+        self.batch_size = 10
+        self.saved_urls = set(saved_urls)
+        self.seen_urls = set()
+        self.added = []
+        self.flushes = 0
+
+    def add(self, tools):
+        self.added.extend(tool['url'] for tool in tools)
+        self.seen_urls.update(tool['url'] for tool in tools)
+        return len([tool for tool in tools if tool['url'] not in self.saved_urls])
+
+    def known_urls(self, urls):
+        return {url for url in urls if url in self.saved_urls}
+
+    def flush(self):
+        self.flushes += 1
+
+
+def pytest_addoption(parser):
+    parser.addoption("--benchmark", action="store_true", help="运行与基线比较的性能基准测试")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="性能基准测试需加 --benchmark 选项运行")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(TEST_DATA_DIR, ignore_errors=True)
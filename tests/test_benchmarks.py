@@ -0,0 +1,47 @@
+"""
+性能基准测试：运行 benchmarks/bench_suite.py 的各项测试并与 baselines.json 比较，
+超过基线 DEFAULT_TOLERANCE 的用例判为失败
+
+默认跳过，运行: python -m pytest -q --benchmark
+"""
+import pytest
+
+import bench_suite
+from scraper.backends import BACKENDS
+
+pytestmark = pytest.mark.benchmark
+
+SIZES = (100, 1_000, 10_000)
+ROWS = 10_000
+REPEAT = 3
+MAX_SECONDS = 10
+
+
+@pytest.fixture(scope="module")
+def baselines():
+    return bench_suite.load_baselines()
+
+
+def _assert_no_regression(results, baselines):
+    regressions = [
+        f"{case}: {elapsed:.4f}s（基线 {baselines[case]:.4f}s）"
+        for case, elapsed in results
+        if elapsed is not None and bench_suite.is_regression(
+            elapsed, baselines.get(case), bench_suite.DEFAULT_TOLERANCE, bench_suite.DEFAULT_MIN_DELTA
+        )
+    ]
+    assert not regressions, "性能回退: " + "; ".join(regressions)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_parse_tool_cards(backend, baselines):
+    _assert_no_regression(bench_suite.bench_parser(SIZES, [backend], REPEAT, MAX_SECONDS), baselines)
+
+
+def test_text_helpers(baselines):
+    _assert_no_regression(bench_suite.bench_text(REPEAT), baselines)
+
+
+@pytest.mark.parametrize("storage", bench_suite.STORAGES)
+def test_storage(storage, baselines):
+    _assert_no_regression(bench_suite.bench_storage(storage, ROWS, REPEAT), baselines)
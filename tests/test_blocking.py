@@ -0,0 +1,49 @@
+"""资源屏蔽规则与性能日志统计测试"""
+import json
+import re
+
+from scraper.blocking import ResourceBlocker, deny_patterns
+
+
+def _matches(pattern: str, url: str) -> bool:
+    """按 Network.setBlockedURLs 的语义匹配：只有 '*' 是通配符"""
+    regex = ".*".join(re.escape(part) for part in pattern.split("*"))
+    return re.fullmatch(regex, url) is not None
+
+
+def _blocked(url: str, patterns) -> bool:
+    return any(_matches(pattern, url) for pattern in patterns)
+
+
+def test_extension_patterns_match_query_strings():
+    patterns = deny_patterns({"deny_extensions": ["png", ".ico"], "deny": ["*hotjar.com*"]})
+    assert _blocked("https://cdn.example.com/logo.png", patterns)
+    assert _blocked("https://cdn.example.com/logo.png?v=3", patterns)
+    assert _blocked("https://example.com/favicon.ico?x=1", patterns)
+    assert _blocked("https://static.hotjar.com/c/hotjar.js", patterns)
+    assert not _blocked("https://example.com/icons/tool.icon", patterns)
+    assert not _blocked("https://www.toolify.ai/tool/png-maker", patterns)
+
+
+class FakeDriver:
+    def __init__(self, events):
+        self.entries = [{"message": json.dumps({"message": event})} for event in events]
+
+    def get_log(self, kind):
+        entries, self.entries = self.entries, []
+        return entries
+
+
+def test_collect_counts_per_batch():
+    driver = FakeDriver([
+        {"method": "Network.loadingFinished", "params": {"encodedDataLength": 2048}},
+        {"method": "Network.loadingFailed", "params": {"type": "Image", "blockedReason": "inspector"}},
+        {"method": "Network.loadingFailed", "params": {"type": "Font", "blockedReason": "inspector"}},
+        {"method": "Network.loadingFailed", "params": {"type": "XHR"}},
+    ])
+    blocker = ResourceBlocker(driver)
+    blocker.collect()
+    blocker.collect()
+    assert blocker.loaded_requests == 1
+    assert blocker.loaded_bytes == 2048
+    assert blocker.blocked == {"Image": 1, "Font": 1}
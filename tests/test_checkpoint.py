@@ -0,0 +1,152 @@
+"""
+检查点和续抓测试
+"""
+from types import SimpleNamespace
+
+from conftest import RecordingSink
+from config import SCRAPER_CONFIG
+from scraper.checkpoint import DONE, IN_PROGRESS, CrawlCheckpoint
+from scraper.pipeline import crawl_listing
+
+
+def _page(slugs):
+    cards = "".join(
+        f'<div class="tool-item"><a href="/tool/{slug}">{slug}</a>'
+        f'<p>{slug} is a tool with a long enough description.</p></div>' for slug in slugs
+    )
+    return f'<html><body><div class="tool-list">{cards}</div></body></html>'
+
+
+def test_tracker_records_cursor_and_last_url(tmp_path):
+    checkpoint = CrawlCheckpoint(tmp_path / "checkpoint.json", interval=0)
+    sink = RecordingSink()
+    on_progress = checkpoint.tracker("https://example.com/", sink)
+    on_progress(2, ["https://example.com/tool/a", "https://example.com/tool/b"])
+    on_progress(3, ["https://example.com/tool/c"])
+
+    loaded = CrawlCheckpoint.load(tmp_path / "checkpoint.json")
+    source = loaded.source("https://example.com/")
+    assert source["status"] == IN_PROGRESS
+    assert source["cards"] == 3
+    assert source["last_url"] == "https://example.com/tool/c"
+    assert "urls" not in source
+    # 保存前先写入缓冲区
+    assert sink.flushes == 2
+
+
+def test_tracker_does_not_move_cursor_back(tmp_path):
+    # 续抓时先重新提取列表顶部的新工具，游标不能回退到这些位置
+    checkpoint = CrawlCheckpoint(tmp_path / "checkpoint.json", interval=0)
+    checkpoint.update("https://example.com/", status=IN_PROGRESS, cards=20, last_url="https://example.com/tool/old-19")
+    on_progress = checkpoint.tracker("https://example.com/", RecordingSink())
+    on_progress(2, ["https://example.com/tool/new-1"])
+
+    source = checkpoint.source("https://example.com/")
+    assert source["cards"] == 20
+    assert source["last_url"] == "https://example.com/tool/old-19"
+
+
+def test_old_checkpoint_with_urls_is_readable(tmp_path):
+    checkpoint = CrawlCheckpoint(tmp_path / "checkpoint.json", state={
+        "version": 1, "started_at": None, "updated_at": None,
+        "sources": {
+            "https://example.com/": {"status": IN_PROGRESS, "cards": 40, "urls": ["https://example.com/tool/a"]},
+            "https://example.com/new": {"status": IN_PROGRESS, "cards": 10},
+        },
+    })
+    source = checkpoint.source("https://example.com/")
+    assert source["cards"] == 40 and "urls" not in source
+    assert checkpoint.source("https://example.com/new")["last_url"] == ""
+
+
+def test_resume_reharvests_tools_published_after_crash(tmp_path, monkeypatch):
+    # 上次中断前保存了 old-0..old-19；之后列表顶部又发布了两个新工具
+    monkeypatch.setitem(SCRAPER_CONFIG, "harvest_in_browser", False)
+    monkeypatch.setitem(SCRAPER_CONFIG, "target_tools", 22)
+    old = [f"old-{i}" for i in range(20)]
+    checkpoint = CrawlCheckpoint(tmp_path / "checkpoint.json", interval=0)
+    checkpoint.update("https://example.com/", status=IN_PROGRESS, cards=20)
+    browser = SimpleNamespace(
+        scroll_until_count=lambda target, **kwargs: True,
+        driver=SimpleNamespace(page_source=_page(["new-0", "new-1"] + old)),
+    )
+    sink = RecordingSink(saved_urls={f"https://www.toolify.aitool/{slug}" for slug in old})
+
+    target_reached, tool_count = crawl_listing(browser, sink, "https://example.com/", checkpoint)
+
+    assert target_reached and tool_count == 22
+    assert sink.added[:2] == ["https://www.toolify.aitool/new-0", "https://www.toolify.aitool/new-1"]
+    source = checkpoint.source("https://example.com/")
+    assert source["status"] == DONE
+
+
+class FakeBrowser:
+    """模拟在浏览器内提取的列表页：cards 为页面上的卡片，fast_forward 跳过已保存的卡片"""
+
+    def __init__(self, slugs):
+        self.slugs = slugs
+        self.harvest_cursor = 0
+        self.skipped = None
+
+    def _cards(self, end):
+        cards = [
+            {"link_text": slug, "href": f"/tool/{slug}",
+             "paragraphs": [f"{slug} is a tool with a long enough description."]}
+            for slug in self.slugs[self.harvest_cursor:end]
+        ]
+        self.harvest_cursor = end
+        return cards
+
+    def harvest_new_cards(self):
+        return self._cards(min(len(self.slugs), 4))
+
+    def fast_forward(self, url, limit):
+        self.skipped = url
+        self.harvest_cursor = self.slugs.index(url.rsplit("/", 1)[-1]) + 1
+        return True
+
+    def scroll_until_count(self, target, on_batch=None, stop=None):
+        on_batch(self._cards(len(self.slugs)))
+        return True
+
+
+def test_resume_fast_forwards_past_saved_cards(tmp_path, monkeypatch):
+    # 上次保存到 old-9；列表顶部新发布了两个工具，之后 old-10.. 尚未保存
+    monkeypatch.setitem(SCRAPER_CONFIG, "harvest_in_browser", True)
+    monkeypatch.setitem(SCRAPER_CONFIG, "incremental", False)
+    monkeypatch.setitem(SCRAPER_CONFIG, "target_tools", 17)
+    old = [f"old-{i}" for i in range(15)]
+    saved = {f"https://www.toolify.aitool/{slug}" for slug in old[:10]}
+    checkpoint = CrawlCheckpoint(tmp_path / "checkpoint.json", interval=0)
+    checkpoint.update("https://example.com/", status=IN_PROGRESS, cards=10,
+                      last_url="https://www.toolify.aitool/old-9")
+    browser = FakeBrowser(["new-0", "new-1"] + old)
+    sink = RecordingSink(saved_urls=saved)
+
+    target_reached, _ = crawl_listing(browser, sink, "https://example.com/", checkpoint)
+
+    assert target_reached
+    assert browser.skipped == "https://www.toolify.aitool/old-9"
+    # 只提取了首屏和上次游标之后的卡片
+    assert sink.added == [f"https://www.toolify.aitool/{slug}"
+                          for slug in ["new-0", "new-1", "old-0", "old-1"] + old[10:]]
+    source = checkpoint.source("https://example.com/")
+    assert source["status"] == DONE
+    assert source["cards"] == 17 and source["last_url"] == "https://www.toolify.aitool/old-14"
+
+
+def test_resume_scrolls_from_top_when_first_page_is_all_new(tmp_path, monkeypatch):
+    monkeypatch.setitem(SCRAPER_CONFIG, "harvest_in_browser", True)
+    monkeypatch.setitem(SCRAPER_CONFIG, "incremental", False)
+    monkeypatch.setitem(SCRAPER_CONFIG, "target_tools", 8)
+    old = [f"old-{i}" for i in range(4)]
+    checkpoint = CrawlCheckpoint(tmp_path / "checkpoint.json", interval=0)
+    checkpoint.update("https://example.com/", status=IN_PROGRESS, cards=4,
+                      last_url="https://www.toolify.aitool/old-3")
+    browser = FakeBrowser([f"new-{i}" for i in range(4)] + old)
+    sink = RecordingSink(saved_urls={f"https://www.toolify.aitool/{slug}" for slug in old})
+
+    crawl_listing(browser, sink, "https://example.com/", checkpoint)
+
+    assert browser.skipped is None
+    assert len(sink.added) == 8
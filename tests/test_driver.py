@@ -0,0 +1,66 @@
+"""常驻浏览器状态管理测试：用带 --remote-debugging-port 参数的子进程代替Chrome"""
+import json
+import subprocess
+import sys
+
+import pytest
+
+from scraper import driver
+
+PORT = 9333
+ADDRESS = f"127.0.0.1:{PORT}"
+
+
+def _sleeper(*args):
+    return subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)", *args])
+
+
+@pytest.fixture
+def state_path(tmp_path, monkeypatch):
+    path = tmp_path / "chrome_daemon.json"
+    monkeypatch.setattr(driver, "CHROME_DAEMON_STATE", path)
+    return path
+
+
+@pytest.fixture
+def processes():
+    started = []
+    yield started
+    for process in started:
+        process.kill()
+        process.wait()
+
+
+def test_stop_does_not_signal_stale_pid(state_path, processes, monkeypatch):
+    unrelated = _sleeper()
+    processes.append(unrelated)
+    state_path.write_text(json.dumps({"pid": unrelated.pid, "address": ADDRESS}))
+    monkeypatch.setattr(driver, "_debugger_ready", lambda address, timeout=1.0: False)
+
+    assert driver.stop_chrome_daemon()
+    assert unrelated.poll() is None
+    assert not state_path.exists()
+
+
+def test_stop_signals_the_process_owning_the_port(state_path, processes, monkeypatch):
+    unrelated = _sleeper()
+    daemon = _sleeper(f"--remote-debugging-port={PORT}")
+    processes += [unrelated, daemon]
+    # 记录的PID已被复用，按端口找到真正的浏览器进程
+    state_path.write_text(json.dumps({"pid": unrelated.pid, "address": ADDRESS}))
+    monkeypatch.setattr(driver, "_debugger_ready", lambda address, timeout=1.0: True)
+
+    assert driver.stop_chrome_daemon()
+    assert daemon.wait(timeout=5) is not None
+    assert unrelated.poll() is None
+
+
+def test_start_records_state_for_running_browser(state_path, processes, monkeypatch):
+    daemon = _sleeper(f"--remote-debugging-port={PORT}")
+    processes.append(daemon)
+    monkeypatch.setattr(driver, "_debugger_ready", lambda address, timeout=1.0: True)
+
+    assert driver.start_chrome_daemon(port=PORT) == ADDRESS
+    state = json.loads(state_path.read_text())
+    assert state["address"] == ADDRESS
+    assert state["pid"] == daemon.pid
@@ -0,0 +1,70 @@
+"""
+HTTP抓取测试：在本地模拟站点（benchmarks/standin_server.py）上验证首屏工具数量不足时回退到浏览器
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import MemoryStorage
+from config import HTTP_CONFIG, SCRAPER_CONFIG
+from scraper.fetcher import HttpFetcher
+from scraper.http_cache import PageCache
+from scraper.pool import BrowserPool, DedupSink
+from standin_server import StandinSite, start_server
+
+
+@pytest.fixture
+def site_url():
+    # 首屏24个卡片，其余通过无限滚动加载（纯HTTP拿不到）
+    site = StandinSite(total=200, batch_size=24, latency=0, jitter=0)
+    server, url = start_server(site)
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fetcher(tmp_path):
+    http_fetcher = HttpFetcher(cache=PageCache(tmp_path / "http_cache"))
+    yield http_fetcher
+    http_fetcher.close()
+    http_fetcher.cache.close()
+
+
+def test_first_screen_below_target_falls_back(site_url, fetcher, monkeypatch):
+    monkeypatch.setitem(HTTP_CONFIG, "min_cards", None)
+    monkeypatch.setitem(SCRAPER_CONFIG, "target_tools", 100)
+    assert fetcher.fetch_tools(site_url) is None
+
+
+def test_first_screen_reaching_min_cards_is_used(site_url, fetcher, monkeypatch):
+    monkeypatch.setitem(HTTP_CONFIG, "min_cards", None)
+    monkeypatch.setitem(SCRAPER_CONFIG, "target_tools", 20)
+    tools = fetcher.fetch_tools(site_url)
+    # 模拟站点中约5%的卡片带标题，解析器会丢弃这类卡片
+    assert tools is not None and 20 <= len(tools) <= 24
+    # 配置的 min_cards 优先于目标数量
+    monkeypatch.setitem(HTTP_CONFIG, "min_cards", 30)
+    assert fetcher.fetch_tools(site_url) is None
+
+
+def test_pool_renders_page_when_first_screen_is_short(site_url, fetcher, monkeypatch):
+    monkeypatch.setitem(HTTP_CONFIG, "min_cards", None)
+    monkeypatch.setitem(SCRAPER_CONFIG, "target_tools", 100)
+    monkeypatch.setitem(SCRAPER_CONFIG, "harvest_in_browser", False)
+    rendered = []
+
+    def browser_factory():
+        # 代替Chrome：记录打开的页面，渲染结果为首屏HTML
+        def get_page(url):
+            rendered.append(url)
+            browser.driver.page_source = fetcher.fetch(url).text
+        browser = SimpleNamespace(get_page=get_page, scroll_until_count=lambda target, **kwargs: False,
+                                  driver=SimpleNamespace(page_source=""), quit=lambda: None)
+        return browser
+
+    sink = DedupSink(MemoryStorage(), batch_size=10)
+    stats = BrowserPool(sink, size=1, browser_factory=browser_factory, http_fetcher=fetcher).run([site_url])
+    assert rendered == [site_url]
+    assert stats[0]["http_pages"] == 0 and stats[0]["pages"] == 1
+    assert sink.saved_count > 0
@@ -0,0 +1,94 @@
+"""
+页面缓存和回放模式测试
+"""
+import os
+import time
+
+import main as scraper_main
+from config import CACHE_CONFIG, REPLAY_CSV, TOOLS_DB
+from scraper.http_cache import PageCache, close_default_cache, default_cache
+
+
+def test_running_total_tracks_put_replace_and_evict(tmp_path):
+    cache = PageCache(tmp_path, max_bytes=250)
+    cache.put("https://example.com/a", b"a" * 100, {})
+    cache.put("https://example.com/b", b"b" * 100, {})
+    # 覆盖同一URL只计算新内容的大小
+    cache.put("https://example.com/a", b"a" * 50, {})
+    assert cache.size_bytes == 150
+    cache.close()
+    # 重新打开时从索引统计
+    cache = PageCache(tmp_path, max_bytes=250)
+    assert cache.size_bytes == 150
+    # 超过上限时淘汰最久未访问的 b
+    cache.put("https://example.com/c", b"c" * 120, {})
+    assert cache.size_bytes == 170 and len(cache) == 2
+    assert cache.get("https://example.com/b") is None
+    cache.close()
+
+
+def test_reads_do_not_write_but_still_drive_lru(tmp_path):
+    cache = PageCache(tmp_path, max_bytes=250)
+    cache.put("https://example.com/a", b"a" * 100, {})
+    cache.put("https://example.com/b", b"b" * 100, {})
+    changes = cache._conn.total_changes
+    for _ in range(10):
+        assert cache.get("https://example.com/a")["body"] == b"a" * 100
+    assert cache._conn.total_changes == changes
+
+    # a 最近被读取过，淘汰时先淘汰 b
+    cache.put("https://example.com/c", b"c" * 100, {})
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/a") is not None
+    assert cache.size_bytes == 200
+    cache.close()
+
+
+def test_hit_access_times_survive_reopen(monkeypatch):
+    monkeypatch.setitem(CACHE_CONFIG, "enabled", True)
+    cache = default_cache()
+    cache.put("https://recent.example.com/", b"a" * 100, {})
+    stored_at = cache._conn.execute(
+        "SELECT accessed_at FROM pages WHERE url = ?", ("https://recent.example.com/",)
+    ).fetchone()[0]
+    time.sleep(0.01)
+    assert cache.get("https://recent.example.com/") is not None
+    close_default_cache()
+
+    # 关闭全局缓存时写回命中的访问时间，重新打开后LRU顺序不丢失
+    cache = default_cache()
+    accessed_at = cache._conn.execute(
+        "SELECT accessed_at FROM pages WHERE url = ?", ("https://recent.example.com/",)
+    ).fetchone()[0]
+    assert accessed_at > stored_at
+    close_default_cache()
+
+
+def test_missing_body_is_dropped_from_total(tmp_path):
+    cache = PageCache(tmp_path)
+    cache.put("https://example.com/a", b"a" * 100, {})
+    entry_key = cache._conn.execute("SELECT key FROM pages").fetchone()[0]
+    os.remove(cache._body_path(entry_key))
+    assert cache.get("https://example.com/a") is None
+    assert cache.size_bytes == 0 and len(cache) == 0
+    cache.close()
+
+
+def test_replay_is_a_dry_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(CACHE_CONFIG, "enabled", True)
+    url = "https://cached.example.com/"
+    html = ('<html><body><div class="tool-item"><a href="/tool/replayed">Replayed</a>'
+            '<p>A cached tool with a long enough description.</p></div></body></html>')
+    default_cache().put(url, html.encode("utf-8"), {"Content-Type": "text/html; charset=utf-8"})
+
+    try:
+        scraper_main.main(["--replay", "--url", url])
+    finally:
+        monkeypatch.setitem(CACHE_CONFIG, "replay", False)
+
+    with open(REPLAY_CSV, encoding="utf-8") as f:
+        assert "https://www.toolify.aitool/replayed" in f.read()
+    # 不写入存储，也不创建快照
+    assert not os.path.exists(TOOLS_DB)
+    assert not os.path.exists(os.path.join(os.path.dirname(REPLAY_CSV), "snapshots"))
@@ -0,0 +1,26 @@
+"""
+指标模块测试
+"""
+import socket
+import urllib.request
+
+from scraper.metrics import MetricsRegistry
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_prometheus_endpoint_binds_loopback_by_default():
+    registry = MetricsRegistry()
+    registry.inc("tools_saved_total", 3)
+    port = _free_port()
+    registry.start(sample_interval=60, prometheus_port=port)
+    try:
+        assert registry._server.server_address[0] == "127.0.0.1"
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert "tools_saved_total 3" in response.read().decode("utf-8")
+    finally:
+        registry.stop()
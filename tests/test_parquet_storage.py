@@ -0,0 +1,52 @@
+"""Parquet存储测试：独立的URL索引和分区小文件合并"""
+import os
+
+import pytest
+
+from conftest import make_tools
+from scraper import storage as storage_module
+from scraper.storage import ParquetStorage
+
+pytest.importorskip("pyarrow")
+
+
+def _category(i):
+    # 一半工具没有分类，分区列写为null
+    return "writing" if i % 2 else ""
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage_module, "PARQUET_DIR", tmp_path / "tools_parquet")
+    monkeypatch.setattr(storage_module, "PARQUET_URL_INDEX_PATH", tmp_path / "url_index_parquet.sqlite3")
+    monkeypatch.setattr(storage_module, "URL_INDEX_PATH", tmp_path / "url_index.sqlite3")
+    parquet = ParquetStorage()
+    parquet.load_existing_tools()
+    yield parquet
+    parquet.close()
+
+
+def test_uses_its_own_url_index(storage, tmp_path):
+    storage.save_tools(make_tools(0, 3, category=_category))
+    assert os.path.exists(tmp_path / "url_index_parquet.sqlite3")
+    assert not os.path.exists(tmp_path / "url_index.sqlite3")
+    assert "https://www.toolify.ai/tool/tool-1" in storage.url_index
+
+
+def test_compact_merges_partition_files(storage):
+    for batch in range(5):
+        storage.save_tools(make_tools(batch * 10, 10, category=_category))
+    before = storage._load_manifest()["files"]
+    expected = storage.read_tools().sort_values("url").reset_index(drop=True)
+
+    assert storage.compact(min_files=6)
+    assert storage._load_manifest()["files"] == before
+
+    assert storage.compact(min_files=5)
+    manifest = storage._load_manifest()
+    assert len(manifest["files"]) == 1
+    assert manifest["rows"] == 50
+    assert all(not os.path.exists(storage.root / entry["path"]) for entry in before)
+    actual = storage.read_tools().sort_values("url").reset_index(drop=True)
+    assert actual.equals(expected)
+    assert len(storage.read_tools(filters=[("category", "==", "writing")])) == 25
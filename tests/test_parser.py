@@ -0,0 +1,89 @@
+"""
+解析器回归测试：固定保存页面 tests/data/listing_page.html 的解析结果，各解析后端的输出必须与
+tests/data/listing_page.json 完全一致（包括字段内容和卡片顺序）
+"""
+import json
+import os
+
+import pytest
+
+from config import PARSER_CONFIG
+from scraper.parser import ToolParser
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+BACKENDS = ["beautifulsoup", "lxml", "selectolax"]
+
+
+def _read(name: str) -> str:
+    with open(os.path.join(DATA_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def listing_page():
+    return _read("listing_page.html")
+
+
+@pytest.fixture(scope="module")
+def expected_tools():
+    return json.loads(_read("listing_page.json"))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_saved_page_output_is_pinned(listing_page, expected_tools, backend):
+    tools = ToolParser.parse_tool_cards(listing_page, backend=backend, workers=1)
+    assert [tool.to_dict() for tool in tools] == expected_tools
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_iter_card_fields_matches_parse(listing_page, expected_tools, backend):
+    tools = [ToolParser.build_tool(fields) for fields in ToolParser.iter_card_fields(listing_page, backend)]
+    assert [tool.to_dict() for tool in tools if tool] == expected_tools
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_parallel_parse_matches_serial(listing_page, expected_tools, backend, monkeypatch):
+    monkeypatch.setitem(PARSER_CONFIG, "parallel_min_bytes", 0)
+    tools = ToolParser.parse_tool_cards(listing_page, backend=backend, workers=2)
+    assert [tool.to_dict() for tool in tools] == expected_tools
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_serial_and_parallel_parse_keep_repeated_urls(backend):
+    # 两种解析方式都不按URL去重，页面中重复出现的工具由写入器去重
+    slugs = ["a", "b", "a", "c", "b"] * 4
+    cards = "".join(
+        f'<div class="tool-item"><a href="/tool/{slug}">{slug}</a>'
+        f'<p>{slug} is a tool with a long enough description.</p></div>' for slug in slugs
+    )
+    html = f'<html><body><div class="tool-list">{cards}</div></body></html>'
+    serial = ToolParser.parse_tool_cards(html, backend=backend, workers=1)
+    parallel = ToolParser.parse_tool_cards_parallel(html, backend, 2)
+    assert parallel is not None
+    assert [tool['url'] for tool in serial] == [tool['url'] for tool in parallel] == [
+        f"https://www.toolify.aitool/{slug}" for slug in slugs
+    ]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_wrapper_divs_do_not_produce_records(backend):
+    # 原实现对包含链接和段落的每一层div都生成一条记录（这里会得到3条重复记录），
+    # 现在只保留最内层的卡片
+    html = (
+        '<html><body><div class="tool-list">'
+        '<div class="wrapper"><div class="wrapper">'
+        '<div class="tool-item"><a href="/tool/example">Example</a>'
+        '<p>An example tool description that is long enough.</p></div>'
+        '</div></div>'
+        '</div></body></html>'
+    )
+    tools = ToolParser.parse_tool_cards(html, backend=backend, workers=1)
+    assert [tool['url'] for tool in tools] == ["https://www.toolify.aitool/example"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_saved_page_has_one_record_per_card(listing_page, expected_tools, backend):
+    # 保存页面的每个卡片外有1到3层包装div，原实现会为包装层生成重复URL的记录
+    tools = ToolParser.parse_tool_cards(listing_page, backend=backend, workers=1)
+    urls = [tool['url'] for tool in tools]
+    assert len(urls) == len(set(urls)) == len(expected_tools)
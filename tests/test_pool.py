@@ -0,0 +1,117 @@
+"""
+去重写入器和浏览器池测试
+"""
+import threading
+from types import SimpleNamespace
+
+from conftest import MemoryStorage
+from config import SCRAPER_CONFIG
+from scraper.pipeline import KnownRunTracker
+from scraper.pool import BrowserPool, DedupSink
+
+
+class BlockingEnricher:
+    """第一次补全时阻塞，直到测试放行"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def enrich(self, tools):
+        self.started.set()
+        assert self.release.wait(5)
+
+
+def _tools(*slugs):
+    return [{'url': f'https://example.com/tool/{slug}'} for slug in slugs]
+
+
+def test_sink_filters_seen_and_known_urls():
+    storage = MemoryStorage()
+    sink = DedupSink(storage, existing_urls={'https://example.com/tool/old'}, batch_size=10)
+    assert sink.add(_tools('a', 'old', 'b')) == 2
+    assert sink.add(_tools('a', 'c')) == 1
+    sink.flush()
+    assert storage.saved == ['https://example.com/tool/a', 'https://example.com/tool/b', 'https://example.com/tool/c']
+    assert sink.saved_count == 3 and sink.total_count == 4
+
+
+def test_enrichment_does_not_block_add():
+    storage = MemoryStorage()
+    enricher = BlockingEnricher()
+    sink = DedupSink(storage, batch_size=2, enricher=enricher)
+    writer = threading.Thread(target=sink.add, args=(_tools('a', 'b'),))
+    writer.start()
+    assert enricher.started.wait(5)
+
+    # 第一批仍在补全，其他线程加入工具不等待
+    added = []
+    adder = threading.Thread(target=lambda: added.append(sink.add(_tools('c'))))
+    adder.start()
+    adder.join(1)
+    assert not adder.is_alive() and added == [1]
+
+    # flush 等待已取出的批次写入完成
+    flusher = threading.Thread(target=sink.flush)
+    flusher.start()
+    flusher.join(0.2)
+    assert flusher.is_alive()
+    enricher.release.set()
+    flusher.join(5)
+    writer.join(5)
+    assert storage.saved == ['https://example.com/tool/a', 'https://example.com/tool/b', 'https://example.com/tool/c']
+    assert sink.saved_count == 3
+
+
+def test_worker_survives_non_webdriver_errors(monkeypatch):
+    monkeypatch.setitem(SCRAPER_CONFIG, "harvest_in_browser", False)
+    monkeypatch.setitem(SCRAPER_CONFIG, "target_tools", 1)
+    html = ('<html><body><div class="tool-item"><a href="/tool/a">A</a>'
+            '<p>A tool with a long enough description.</p></div></body></html>')
+    calls = []
+
+    def get_page(url):
+        calls.append(url)
+        # 第一次打开页面时抛出非 WebDriverException 的异常
+        if len(calls) == 1:
+            raise ValueError("unexpected page structure")
+
+    def browser_factory():
+        return SimpleNamespace(get_page=get_page, scroll_until_count=lambda target, **kwargs: True,
+                               driver=SimpleNamespace(page_source=html), quit=lambda: None)
+
+    storage = MemoryStorage()
+    sink = DedupSink(storage, batch_size=10)
+    stats = BrowserPool(sink, size=1, browser_factory=browser_factory).run(["https://example.com/"])
+    assert calls == ["https://example.com/", "https://example.com/"]
+    assert stats[0]["failures"] == 1 and stats[0]["pages"] == 1 and stats[0]["recycles"] == 0
+    assert storage.saved == ["https://www.toolify.aitool/a"]
+
+
+def _cards(*slugs):
+    return [{'link_text': slug, 'href': f'https://example.com/tool/{slug}',
+             'paragraphs': [f'{slug} is a tool with a long enough description.']} for slug in slugs]
+
+
+def test_known_run_ignores_urls_seen_in_this_run():
+    # 刷新页面后从顶部重新提取，本次已写入的工具不算作已保存
+    existing = {'https://example.com/tool/old'}
+    sink = DedupSink(MemoryStorage(), existing_urls=existing, batch_size=10)
+    tracker = KnownRunTracker(sink, stop_after=2)
+    tracker.observe(_cards('a', 'b'))
+    sink.add(_tools('a', 'b'))
+    # URL索引在写入时同步更新
+    existing.update(url for url in sink.seen_urls)
+    tracker.observe(_cards('a', 'b', 'old'))
+    assert tracker.known_run == 1 and not tracker.should_stop()
+
+
+def test_known_run_starts_after_resume_url():
+    existing = {f'https://example.com/tool/old-{i}' for i in range(4)}
+    sink = DedupSink(MemoryStorage(), existing_urls=existing, batch_size=10)
+    tracker = KnownRunTracker(sink, stop_after=2, resume_url='https://example.com/tool/old-1')
+    # 上次中断前保存的工具不计入
+    tracker.observe(_cards('new', 'old-0', 'old-1'))
+    assert tracker.known_run == 0
+    tracker.observe(_cards('old-2', 'old-3'))
+    assert tracker.should_stop()
@@ -0,0 +1,78 @@
+"""
+工具记录测试
+"""
+import pickle
+
+import pytest
+
+from scraper.records import TOOL_FIELDS, ToolRecord, tools_to_arrow, tools_to_dataframe
+
+TOOL = {
+    'tool_name': 'Writer',
+    'description': 'An AI writing assistant.',
+    'url': 'https://example.com/tool/writer',
+    'category': 'writing',
+    'added_date': '2024-05-01',
+}
+
+
+def test_record_equals_dict_with_same_fields():
+    record = ToolRecord.from_dict(TOOL)
+    assert record == TOOL and TOOL == record
+    assert record != {**TOOL, 'category': 'video'}
+    assert dict(record) == record.to_dict() == TOOL
+    assert record.get('url') == TOOL['url'] and record.get('missing') is None
+    with pytest.raises(KeyError):
+        record['missing']
+
+
+def test_from_dict_fills_missing_fields():
+    record = ToolRecord.from_dict({'url': 'https://example.com/tool/a', 'category': None})
+    assert record['tool_name'] == '' and record['category'] == ''
+    assert list(record) == list(TOOL_FIELDS)
+
+
+def test_setitem_interns_repeated_fields():
+    first = ToolRecord.from_dict(TOOL)
+    second = ToolRecord.from_dict({**TOOL, 'url': 'https://example.com/tool/other'})
+    # 运行时拼接的字符串不会自动驻留
+    category = ''.join(['im', 'age'])
+    first['category'] = category
+    second['category'] = ''.join(['ima', 'ge'])
+    assert first['category'] is second['category']
+    first['description'] = ''.join(['long ', 'text'])
+    second['description'] = ''.join(['long t', 'ext'])
+    assert first['description'] == second['description']
+    assert first['description'] is not second['description']
+    with pytest.raises(KeyError):
+        first['missing'] = 'x'
+
+
+def test_pickle_round_trip_reinterns_fields():
+    records = pickle.loads(pickle.dumps([ToolRecord.from_dict(TOOL), ToolRecord.from_dict(TOOL)]))
+    assert type(records[0]) is ToolRecord and records[0] == TOOL
+    restored = pickle.loads(pickle.dumps(ToolRecord.from_dict(TOOL)))
+    assert restored['category'] is records[0]['category'] is records[1]['category']
+
+
+def test_tools_to_dataframe_mixes_records_and_dicts():
+    tools = [ToolRecord.from_dict(TOOL), {'url': 'https://example.com/tool/b', 'category': None}]
+    df = tools_to_dataframe(tools, ['url', 'category'])
+    assert list(df.columns) == ['url', 'category']
+    assert df.to_dict('records') == [
+        {'url': TOOL['url'], 'category': 'writing'},
+        {'url': 'https://example.com/tool/b', 'category': ''},
+    ]
+
+
+def test_tools_to_arrow_fills_extra_and_null_columns():
+    pa = pytest.importorskip("pyarrow")
+    schema = pa.schema([('url', pa.string()), ('category', pa.string()), ('scraped_date', pa.string())])
+    tools = [ToolRecord.from_dict(TOOL), ToolRecord.from_dict({'url': 'https://example.com/tool/b'})]
+    table = tools_to_arrow(tools, schema, extra={'scraped_date': '2024-06-01'}, null_empty=['category'])
+    assert table.schema == schema
+    assert table.to_pylist() == [
+        {'url': TOOL['url'], 'category': 'writing', 'scraped_date': '2024-06-01'},
+        {'url': 'https://example.com/tool/b', 'category': None, 'scraped_date': '2024-06-01'},
+    ]
+    assert tools_to_arrow([], schema, extra={'scraped_date': '2024-06-01'}).num_rows == 0
@@ -0,0 +1,51 @@
+"""
+自适应滚动控制器测试
+"""
+from config import SCRAPER_CONFIG
+from scraper.scroll_control import ScrollController
+
+
+def _controller():
+    return ScrollController(dict(SCRAPER_CONFIG["adaptive_scroll"], enabled=True))
+
+
+def test_steady_loads_speed_up():
+    control = _controller()
+    for _ in range(10):
+        control.record(True, 0.3)
+    config = control.config
+    assert control.step == min(config["step_px"] + 10 * config["step_increase_px"], config["step_max_px"])
+    assert control.interval < config["interval_ms"]
+    assert control.pause == 0.0
+
+
+def test_empty_batches_slow_down_without_pausing():
+    # 没有新内容（如列表到底）只降低步长和间隔，不增加批次间停顿
+    control = _controller()
+    for _ in range(5):
+        control.record(False, 2.0)
+    assert control.step == control.config["step_min_px"]
+    assert control.interval == control.config["interval_max_ms"]
+    assert control.pause == 0.0
+
+
+def test_throttling_grows_pause():
+    control = _controller()
+    for _ in range(3):
+        control.record(True, 0.2)
+    control.record(True, 5.0)
+    assert control.pause == control.config["pause_decrease"]
+    control.record(True, 30.0)
+    assert control.pause == control.config["pause_decrease"] * 2
+
+
+def test_one_outcome_per_button_iteration_keeps_increasing():
+    # 按钮页每轮：点击加载到新内容、随后的滚动没有新内容，合并为一次成功
+    control = _controller()
+    for _ in range(20):
+        clicked_loaded, scrolled_loaded = True, False
+        control.record(clicked_loaded or scrolled_loaded, 0.3)
+    config = control.config
+    assert control.failure_rate == 0.0
+    assert control.step == min(config["step_px"] + 20 * config["step_increase_px"], config["step_max_px"])
+    assert control.pause == 0.0
@@ -0,0 +1,152 @@
+"""快照测试：只读取写入方记录的变化块、按存储后端恢复最新快照"""
+import os
+
+import pytest
+
+from conftest import make_tools
+from scraper import snapshot as snapshot_module
+from scraper import storage as storage_module
+from scraper.snapshot import ChangeLog, SnapshotStore
+from scraper.storage import DataStorage, SQLiteStorage
+
+CHUNK = 1024
+DESCRIPTION = "d" * 200
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    """记录被哈希的数据量；禁用reflink，使快照走切块路径"""
+    calls = []
+    sha256 = snapshot_module.hashlib.sha256
+
+    class CountingHashlib:
+        @staticmethod
+        def sha256(data=b""):
+            calls.append(len(data))
+            return sha256(data)
+
+    monkeypatch.setattr(snapshot_module, "hashlib", CountingHashlib)
+    monkeypatch.setattr(snapshot_module, "_reflink", lambda src, dst: False)
+    return calls
+
+
+def _store(tmp_path):
+    return SnapshotStore(root=tmp_path / "snapshots", keep=5, chunk_size=CHUNK)
+
+
+def test_untracked_in_place_edit_is_hashed_in_full(tmp_path, hashed):
+    store = _store(tmp_path)
+    path = tmp_path / "tools.csv"
+    data = bytearray(os.urandom(10 * CHUNK))
+    path.write_bytes(data)
+    store.create([path])
+
+    # 原地修改中间的块后追加：同一inode、文件变大、首尾块不变，没有变化记录时仍完整读取
+    with open(path, "r+b") as f:
+        f.seek(5 * CHUNK)
+        f.write(b"x" * CHUNK)
+        f.seek(0, os.SEEK_END)
+        f.write(b"tail")
+    expected = path.read_bytes()
+    hashed.clear()
+    store.create([path])
+    assert sum(hashed) == 10 * CHUNK + 4
+
+    os.remove(path)
+    assert store.restore() is not None
+    assert path.read_bytes() == expected
+
+
+def test_stale_change_log_is_ignored(tmp_path, hashed):
+    store = _store(tmp_path)
+    path = tmp_path / "tools.csv"
+    path.write_bytes(os.urandom(4 * CHUNK))
+    store.create([path])
+    changes = ChangeLog(path, chunk_size=CHUNK)
+    changes.reset()
+
+    # 变化记录之外的写入：记录的终点与当前文件状态不一致
+    with open(path, "r+b") as f:
+        f.write(b"x" * CHUNK)
+    hashed.clear()
+    store.create([path], changes={path: changes.changes()})
+    assert sum(hashed) == 4 * CHUNK
+
+
+def test_csv_storage_snapshot_reads_only_appended_chunks(tmp_path, monkeypatch, hashed):
+    csv_path = tmp_path / "tools.csv"
+    monkeypatch.setattr(storage_module, "TOOLS_CSV", csv_path)
+    monkeypatch.setattr(snapshot_module, "SNAPSHOT_DIR", tmp_path / "snapshots")
+    monkeypatch.setitem(storage_module.STORAGE_CONFIG, "snapshot_chunk_size", CHUNK)
+
+    storage = DataStorage()
+    storage.save_tools(make_tools(0, 100, description=DESCRIPTION))
+    assert storage.snapshot()
+    storage.close()
+
+    # 下次运行：追加新工具后快照
+    storage = DataStorage()
+    before = os.path.getsize(csv_path)
+    storage.save_tools(make_tools(100, 10, description=DESCRIPTION))
+    hashed.clear()
+    assert storage.snapshot()
+    storage.close()
+    assert sum(hashed) <= os.path.getsize(csv_path) - before + CHUNK
+
+    full = SnapshotStore(root=tmp_path / "full", chunk_size=CHUNK)
+    full.create([csv_path])
+    assert SnapshotStore().list()[-1]["files"][0]["chunks"] == full.list()[0]["files"][0]["chunks"]
+
+    # 重写文件（合并重复记录）后完整读取
+    storage = DataStorage()
+    storage.save_tools(make_tools(0, 5, description=DESCRIPTION))
+    storage.merge_duplicates()
+    hashed.clear()
+    assert storage.snapshot()
+    storage.close()
+    assert sum(hashed) == os.path.getsize(csv_path)
+
+
+def test_restore_latest_filters_by_backend(tmp_path):
+    store = _store(tmp_path)
+    csv_path, db_path = tmp_path / "tools.csv", tmp_path / "tools.sqlite3"
+    csv_path.write_text("csv")
+    db_path.write_text("db")
+    csv_id = store.create([csv_path], backend="csv")
+    store.create([db_path], backend="sqlite")
+
+    csv_path.write_text("changed")
+    assert store.restore(backend="csv") == csv_id
+    assert csv_path.read_text() == "csv"
+    assert store.restore(backend="parquet") is None
+
+
+def test_sqlite_snapshot_reads_only_changed_chunks(tmp_path, monkeypatch, hashed):
+    db_path = tmp_path / "tools.sqlite3"
+    monkeypatch.setattr(storage_module, "TOOLS_DB", db_path)
+    monkeypatch.setattr(storage_module, "TOOLS_CSV", tmp_path / "tools.csv")
+    monkeypatch.setattr(snapshot_module, "SNAPSHOT_DIR", tmp_path / "snapshots")
+    monkeypatch.setitem(storage_module.STORAGE_CONFIG, "snapshot_chunk_size", 64 * 1024)
+    monkeypatch.setitem(snapshot_module.STORAGE_CONFIG, "snapshot_chunk_size", 64 * 1024)
+
+    storage = SQLiteStorage()
+    storage.save_tools(make_tools(0, 5000, description=DESCRIPTION))
+    assert storage.snapshot()
+    storage.close()
+
+    # 下次运行：少量更新和新增，跨越一次关闭/重新打开
+    storage = SQLiteStorage()
+    storage.save_tools(make_tools(0, 10, description=DESCRIPTION) + make_tools(5000, 50, description=DESCRIPTION))
+    storage.close()
+    storage = SQLiteStorage()
+    hashed.clear()
+    assert storage.snapshot()
+    storage.close()
+    assert 0 < sum(hashed) < os.path.getsize(db_path) / 2
+
+    store = SnapshotStore()
+    latest = store.list()[-1]
+    full = SnapshotStore(root=tmp_path / "full")
+    full.create([db_path])
+    assert latest["backend"] == "sqlite"
+    assert latest["files"][0]["chunks"] == full.list()[0]["files"][0]["chunks"]
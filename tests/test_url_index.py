@@ -0,0 +1,65 @@
+"""
+URL索引和布隆过滤器测试
+"""
+from scraper.url_index import BloomFilter, UrlIndex
+
+
+def _urls(start, count):
+    return [f"https://example.com/tool/{i}" for i in range(start, start + count)]
+
+
+def test_reopen_keeps_urls_and_bloom(tmp_path):
+    index = UrlIndex(tmp_path / "urls.db", bloom_capacity=100)
+    assert index.add_many(_urls(0, 10) + _urls(0, 3)) == 10
+    assert index.add_many(_urls(5, 10)) == 5
+    index.close()
+
+    index = UrlIndex(tmp_path / "urls.db", bloom_capacity=100)
+    assert len(index) == 15 and index.bloom.count == 15
+    assert "https://example.com/tool/14" in index
+    assert "https://example.com/tool/15" not in index
+    index.close()
+
+
+def test_bloom_is_rebuilt_when_count_mismatches(tmp_path):
+    index = UrlIndex(tmp_path / "urls.db", bloom_capacity=100)
+    index.add_many(_urls(0, 10))
+    index.close()
+    # 模拟上次异常退出：索引已写入新的URL，但布隆过滤器没有保存
+    stale = BloomFilter.load(tmp_path / "urls.db.bloom")
+    unsaved = UrlIndex(tmp_path / "urls.db")
+    unsaved.add_many(_urls(10, 5))
+    unsaved.close()
+
+    index = UrlIndex(tmp_path / "urls.db", bloom_capacity=100)
+    assert index.bloom.count == 15
+    assert "https://example.com/tool/12" not in stale
+    assert "https://example.com/tool/12" in index.bloom
+    assert index.contains_many(_urls(8, 10)) == set(_urls(8, 7))
+    index.close()
+
+
+def test_bloom_false_positive_falls_through_to_index(tmp_path):
+    index = UrlIndex(tmp_path / "urls.db", bloom_capacity=100)
+    index.add_many(_urls(0, 3))
+    # 所有位都置1，布隆过滤器对任意URL都判断为可能存在
+    index.bloom.bits = bytearray(b"\xff" * len(index.bloom.bits))
+    assert "https://example.com/tool/missing" in index.bloom
+    assert "https://example.com/tool/missing" not in index
+    assert index.contains_many(["https://example.com/tool/missing", "https://example.com/tool/1"]) == {
+        "https://example.com/tool/1"
+    }
+    index.close()
+
+
+def test_contains_many_chunks_large_queries(tmp_path):
+    index = UrlIndex(tmp_path / "urls.db")
+    index.add_many(_urls(0, 1500))
+    statements = []
+    index._conn.set_trace_callback(statements.append)
+
+    # 超出SQLite参数数量限制的查询分块执行，重复URL只查询一次
+    found = index.contains_many(_urls(1000, 1200) + _urls(1000, 100))
+    assert found == set(_urls(1000, 500))
+    assert len([sql for sql in statements if sql.startswith("SELECT url FROM urls")]) == 3
+    index.close()